@@ -0,0 +1,140 @@
+"""
+Microbenchmark comparing the type/tag dispatch dictionaries in surrealdb.data.cbor with the
+if/elif chains they replaced.
+
+Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/cbor_dispatch.py
+"""
+import timeit
+
+import cbor2
+
+from surrealdb.data import cbor
+from surrealdb.data.types import constants
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.future import Future
+from surrealdb.data.types.geometry import (
+    GeometryPoint,
+    GeometryLine,
+    GeometryPolygon,
+    GeometryMultiLine,
+    GeometryMultiPoint,
+    GeometryMultiPolygon,
+    GeometryCollection,
+)
+from surrealdb.data.types.range import BoundIncluded, BoundExcluded, Range
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+ROWS = 20_000
+REPEAT = 5
+
+
+@cbor2.shareable_encoder
+def chain_encoder(encoder, obj):
+    if isinstance(obj, GeometryPoint):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_POINT, obj.get_coordinates())
+    elif isinstance(obj, GeometryLine):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_LINE, obj.get_coordinates())
+    elif isinstance(obj, GeometryPolygon):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_POLYGON, obj.get_coordinates())
+    elif isinstance(obj, GeometryMultiLine):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_MULTI_LINE, obj.get_coordinates())
+    elif isinstance(obj, GeometryMultiPoint):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_MULTI_POINT, obj.get_coordinates())
+    elif isinstance(obj, GeometryMultiPolygon):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_MULTI_POLYGON, obj.get_coordinates())
+    elif isinstance(obj, GeometryCollection):
+        tagged = cbor2.CBORTag(constants.TAG_GEOMETRY_COLLECTION, obj.geometries)
+    elif isinstance(obj, RecordID):
+        tagged = cbor2.CBORTag(constants.TAG_RECORD_ID, [obj.table_name, obj.id])
+    elif isinstance(obj, Table):
+        tagged = cbor2.CBORTag(constants.TAG_TABLE_NAME, obj.table_name)
+    elif isinstance(obj, BoundIncluded):
+        tagged = cbor2.CBORTag(constants.TAG_BOUND_INCLUDED, obj.value)
+    elif isinstance(obj, BoundExcluded):
+        tagged = cbor2.CBORTag(constants.TAG_BOUND_EXCLUDED, obj.value)
+    elif isinstance(obj, Range):
+        tagged = cbor2.CBORTag(constants.TAG_BOUND_EXCLUDED, [obj.begin, obj.end])
+    elif isinstance(obj, Future):
+        tagged = cbor2.CBORTag(constants.TAG_BOUND_EXCLUDED, obj.value)
+    elif isinstance(obj, Duration):
+        tagged = cbor2.CBORTag(constants.TAG_DURATION, obj.get_seconds_and_nano())
+    elif isinstance(obj, DateTimeCompact):
+        tagged = cbor2.CBORTag(constants.TAG_DATETIME_COMPACT, obj.get_seconds_and_nano())
+    else:
+        raise BufferError("no encoder for type ", type(obj))
+    encoder.encode(tagged)
+
+
+def chain_decoder(decoder, tag, shareable_index=None):
+    if tag.tag == constants.TAG_GEOMETRY_POINT:
+        return GeometryPoint.parse_coordinates(tag.value)
+    elif tag.tag == constants.TAG_GEOMETRY_LINE:
+        return GeometryLine.parse_coordinates(tag.value)
+    elif tag.tag == constants.TAG_GEOMETRY_POLYGON:
+        return GeometryPolygon.parse_coordinates(tag.value)
+    elif tag.tag == constants.TAG_GEOMETRY_MULTI_POINT:
+        return GeometryMultiPoint.parse_coordinates(tag.value)
+    elif tag.tag == constants.TAG_GEOMETRY_MULTI_LINE:
+        return GeometryMultiLine.parse_coordinates(tag.value)
+    elif tag.tag == constants.TAG_GEOMETRY_MULTI_POLYGON:
+        return GeometryMultiPolygon.parse_coordinates(tag.value)
+    elif tag.tag == constants.TAG_GEOMETRY_COLLECTION:
+        return GeometryCollection(*tag.value)
+    elif tag.tag == constants.TAG_NONE:
+        return None
+    elif tag.tag == constants.TAG_RECORD_ID:
+        return RecordID(tag.value[0], tag.value[1])
+    elif tag.tag == constants.TAG_TABLE_NAME:
+        return Table(tag.value)
+    elif tag.tag == constants.TAG_BOUND_INCLUDED:
+        return BoundIncluded(tag.value)
+    elif tag.tag == constants.TAG_BOUND_EXCLUDED:
+        return BoundExcluded(tag.value)
+    elif tag.tag == constants.TAG_RANGE:
+        return Range(tag.value[0], tag.value[1])
+    elif tag.tag == constants.TAG_DURATION:
+        return Duration.parse(tag.value[0], tag.value[1])
+    elif tag.tag == constants.TAG_DATETIME_COMPACT:
+        return DateTimeCompact.parse(tag.value[0], tag.value[1])
+    else:
+        raise BufferError("no decoder for tag", tag.tag)
+
+
+def build_rows():
+    return [
+        {
+            "id": RecordID("user", i),
+            "created": DateTimeCompact(1_700_000_000_000_000_000 + i),
+            "ttl": Duration(i * 1_000_000_000),
+        }
+        for i in range(ROWS)
+    ]
+
+
+def best_of(statement) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    rows = build_rows()
+    payload = cbor.encode(rows)
+    assert payload == cbor2.dumps(rows, default=chain_encoder)
+
+    chain_encode = best_of(lambda: cbor2.dumps(rows, default=chain_encoder))
+    dict_encode = best_of(lambda: cbor.encode(rows))
+    chain_decode = best_of(lambda: cbor2.loads(payload, tag_hook=chain_decoder))
+    dict_decode = best_of(lambda: cbor.decode(payload))
+
+    print(f"{ROWS} rows, 3 tagged values per row, best of {REPEAT}")
+    print(f"encode: if/elif chain {chain_encode * 1000:8.2f} ms  dispatch dict {dict_encode * 1000:8.2f} ms  "
+          f"speedup {chain_encode / dict_encode:.2f}x")
+    print(f"decode: if/elif chain {chain_decode * 1000:8.2f} ms  dispatch dict {dict_decode * 1000:8.2f} ms  "
+          f"speedup {chain_decode / dict_decode:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
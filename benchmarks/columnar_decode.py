@@ -0,0 +1,81 @@
+"""
+Benchmark of the peak memory and time taken to turn a large query result into NumPy columns and a pandas
+DataFrame, decoding the rows straight into columns against decoding the list of row dicts first.
+
+Needs numpy and pandas. Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/columnar_decode.py
+"""
+import gc
+import time
+import tracemalloc
+
+import pandas
+
+from surrealdb.connections.columns import read_columns
+from surrealdb.data import cbor
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.record_id import RecordID
+
+ROWS = 200_000
+
+
+def frame() -> bytes:
+    rows = [
+        {
+            "id": RecordID("person", index),
+            "age": index % 90,
+            "score": index / 7,
+            "active": index % 2 == 0,
+            "joined": DateTimeCompact(1_700_000_000_000_000_000 + index * 1_000_000_000),
+            "tenure": Duration(index * 1_000_000_000),
+            "team": RecordID("team", index % 50),
+            "name": f"person {index}",
+        }
+        for index in range(ROWS)
+    ]
+    return cbor.encode({"id": "1", "result": [{"result": rows, "status": "OK", "time": "1ms"}]})
+
+
+def measure(convert) -> tuple:
+    """
+    Returns the peak bytes allocated while converting, the bytes kept by the result and the seconds taken.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    converted = convert()
+    elapsed = time.perf_counter() - started
+    del converted
+    gc.collect()
+    tracemalloc.start()
+    converted = convert()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del converted
+    return peak, size, elapsed
+
+
+def main() -> None:
+    data = frame()
+    print(f"{ROWS} rows of 8 fields, {len(data) / 2 ** 20:.1f} MiB of CBOR")
+    results = [
+        ("dicts", lambda: cbor.decode(data)["result"][0]["result"]),
+        ("dicts to DataFrame", lambda: pandas.DataFrame(cbor.decode(data)["result"][0]["result"])),
+        ("columns", lambda: read_columns(data, "query", statement=0)),
+        ("columns to DataFrame", lambda: read_columns(data, "query", statement=0).to_dataframe()),
+        (
+            "columns to DataFrame, category IDs",
+            lambda: read_columns(data, "query", statement=0).to_dataframe(record_ids="category"),
+        ),
+    ]
+    for name, convert in results:
+        peak, size, elapsed = measure(convert)
+        print(
+            f"{name:35} peak {peak / 2 ** 20:7.1f} MiB  kept {size / 2 ** 20:7.1f} MiB  "
+            f"in {elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
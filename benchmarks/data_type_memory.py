@@ -0,0 +1,97 @@
+"""
+Benchmark of the memory taken by decoded rows full of record IDs, tables, durations and datetimes, with
+the slot based data types against the previous classes with a per-instance __dict__.
+
+Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/data_type_memory.py
+"""
+import gc
+import time
+import tracemalloc
+
+import cbor2
+
+from surrealdb.data import cbor
+from surrealdb.data.types import constants
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+ROWS = 200_000
+
+
+class DictRecordID:
+    def __init__(self, table_name, identifier):
+        self.table_name = table_name
+        self.id = identifier
+
+
+class DictTable:
+    def __init__(self, table_name):
+        self.table_name = table_name
+
+
+class DictDuration:
+    def __init__(self, elapsed=0):
+        self.elapsed = elapsed
+
+
+class DictDateTimeCompact:
+    def __init__(self, timestamp=0):
+        self.timestamp = timestamp
+
+
+DICT_DECODERS = {
+    constants.TAG_RECORD_ID: lambda value: DictRecordID(value[0], value[1]),
+    constants.TAG_TABLE_NAME: DictTable,
+    constants.TAG_DURATION: lambda value: DictDuration(value[1] + value[0] * 1_000_000_000),
+    constants.TAG_DATETIME_COMPACT: lambda value: DictDateTimeCompact(value[1] + value[0] * 1_000_000_000),
+}
+
+
+def dict_tag_decoder(decoder, tag, shareable_index=None):
+    return DICT_DECODERS[tag.tag](tag.value)
+
+
+def rows() -> bytes:
+    return cbor.encode([
+        {
+            "id": RecordID("person", index),
+            "manager": RecordID("person", index // 10),
+            "company": Table("company"),
+            "tenure": Duration(index * 1_000_000_000),
+            "joined": DateTimeCompact(1_700_000_000_000_000_000 + index),
+        }
+        for index in range(ROWS)
+    ])
+
+
+def measure(decode) -> tuple:
+    gc.collect()
+    started = time.perf_counter()
+    decoded = decode()
+    elapsed = time.perf_counter() - started
+    del decoded
+    gc.collect()
+    tracemalloc.start()
+    decoded = decode()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+    return size / ROWS, elapsed
+
+
+def main() -> None:
+    data = rows()
+    print(f"{ROWS} rows of 2 record IDs, a table, a duration and a datetime, {len(data) / ROWS:.0f} CBOR bytes per row")
+    before, before_time = measure(lambda: cbor2.loads(data, tag_hook=dict_tag_decoder))
+    after, after_time = measure(lambda: cbor.decode(data))
+    print(f"__dict__ types {before:7.0f} bytes per row  decoded in {before_time:.2f}s")
+    print(f"slot types     {after:7.0f} bytes per row  decoded in {after_time:.2f}s")
+    print(f"saved          {before - after:7.0f} bytes per row ({1 - after / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
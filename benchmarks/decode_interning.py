@@ -0,0 +1,63 @@
+"""
+Benchmark of the memory taken by a decoded result with and without an Interner sharing table names,
+tables, map keys and record IDs between rows.
+
+Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/decode_interning.py
+"""
+import gc
+import time
+import tracemalloc
+
+from surrealdb.data.cbor import Interner, decode, encode
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+ROWS = 200_000
+
+
+def rows() -> bytes:
+    return encode([
+        {
+            "id": RecordID("person", index),
+            "manager": RecordID("person", index % 1000),
+            "company": Table("company"),
+            "name": f"person {index}",
+            "active": index % 2 == 0,
+            "score": index * 0.5,
+        }
+        for index in range(ROWS)
+    ])
+
+
+def measure(decode_rows) -> tuple:
+    gc.collect()
+    started = time.perf_counter()
+    decoded = decode_rows()
+    elapsed = time.perf_counter() - started
+    del decoded
+    gc.collect()
+    tracemalloc.start()
+    decoded = decode_rows()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del decoded
+    return size / ROWS, elapsed
+
+
+def main() -> None:
+    data = rows()
+    print(f"{ROWS} rows of 6 fields with 2 record IDs and a table, {len(data) / ROWS:.0f} CBOR bytes per row")
+    results = {
+        "plain": measure(lambda: decode(data)),
+        "interned": measure(lambda: decode(data, Interner())),
+        "interned + record IDs": measure(lambda: decode(data, Interner(max_record_ids=10_000))),
+    }
+    plain = results["plain"][0]
+    for name, (size, elapsed) in results.items():
+        print(f"{name:<22} {size:6.0f} bytes per row ({size / plain:4.0%})  decoded in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of the memory kept by, and the time taken to decode and encode, a polygon with many points, kept as flat
+float64 coordinates against a GeometryPoint per point as before.
+
+Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/geometry_decode.py
+"""
+import gc
+import math
+import time
+import tracemalloc
+
+import cbor2
+
+from surrealdb.data import cbor
+from surrealdb.data.types.geometry import GeometryPoint, GeometryPolygon
+
+POINTS = 100_000
+RINGS = 4
+
+
+def polygon() -> GeometryPolygon:
+    rings = []
+    for ring in range(RINGS):
+        radius = 1 + ring
+        rings.append([
+            (radius * math.cos(2 * math.pi * index / POINTS), radius * math.sin(2 * math.pi * index / POINTS))
+            for index in range(POINTS // RINGS)
+        ])
+    return GeometryPolygon.parse_coordinates(rings)
+
+
+def points(coordinates: list) -> list:
+    """
+    Builds the rings as lists of GeometryPoints, the way polygons were kept before.
+    """
+    return [[GeometryPoint(longitude, latitude) for longitude, latitude in ring] for ring in coordinates]
+
+
+def measure(convert) -> tuple:
+    """
+    Returns the bytes kept by the result and the seconds taken.
+    """
+    gc.collect()
+    started = time.perf_counter()
+    converted = convert()
+    elapsed = time.perf_counter() - started
+    del converted
+    gc.collect()
+    tracemalloc.start()
+    converted = convert()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del converted
+    return size, elapsed
+
+
+def main() -> None:
+    geometry = polygon()
+    data = cbor.encode(geometry)
+    coordinates = geometry.get_coordinates()
+    print(f"polygon of {RINGS} rings and {POINTS} points, {len(data) / 2 ** 20:.1f} MiB of CBOR")
+    results = [
+        ("decode, GeometryPoint per point", lambda: points(cbor.decode(data).get_coordinates())),
+        ("decode, flat coordinates", lambda: cbor.decode(data)),
+        ("encode, GeometryPoint per point", lambda: cbor.encode(cbor2.CBORTag(90, [
+            [point.get_coordinates() for point in ring] for ring in points(coordinates)
+        ]))),
+        ("encode, flat coordinates", lambda: cbor.encode(geometry)),
+    ]
+    for name, convert in results:
+        size, elapsed = measure(convert)
+        print(f"{name:35} kept {size / 2 ** 20:7.2f} MiB  in {elapsed * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Microbenchmark comparing encoding small select/merge requests with cached envelope parts and pooled
+encoders against encoding the whole envelope with a fresh cbor2.dumps call, with the single id of a plain
+connection and with the new id per request of a multiplexed one.
+
+Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/request_frames.py
+"""
+import itertools
+import timeit
+
+import cbor2
+
+from surrealdb.data.cbor import default_encoder
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.request_message.descriptors.cbor_ws import encode_message
+
+CALLS = 50_000
+REPEAT = 5
+CONNECTION_ID = "a4ec7fb5-2f0c-4ff9-97c5-1f5e4e3f5a8b"
+
+MESSAGES = {
+    "select": {"id": CONNECTION_ID, "method": "select", "params": [RecordID("person", "tobie")]},
+    "merge": {"id": CONNECTION_ID, "method": "merge", "params": [RecordID("person", "tobie"), {"age": 30}]},
+}
+
+
+def best(func) -> float:
+    return min(timeit.repeat(func, number=CALLS, repeat=REPEAT)) / CALLS * 1e6
+
+
+def main() -> None:
+    print(f"{CALLS} calls per run, best of {REPEAT}")
+    for name, message in MESSAGES.items():
+        assert encode_message(message) == cbor2.dumps(message, default=default_encoder)
+        full = best(lambda: cbor2.dumps(message, default=default_encoder))
+        framed = best(lambda: encode_message(message))
+        print(f"{name:<18} full dumps {full:6.2f} us  cached frame {framed:6.2f} us  speedup {full / framed:.2f}x")
+        request_ids = itertools.count(1)
+
+        def multiplexed(encode) -> None:
+            encode({**message, "id": str(next(request_ids))})
+
+        full = best(lambda: multiplexed(lambda data: cbor2.dumps(data, default=default_encoder)))
+        framed = best(lambda: multiplexed(encode_message))
+        name = f"{name}, new ids"
+        print(f"{name:<18} full dumps {full:6.2f} us  cached frame {framed:6.2f} us  speedup {full / framed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
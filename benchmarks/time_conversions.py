@@ -0,0 +1,43 @@
+"""
+Benchmark of converting many DateTimeCompact values to seconds and nanoseconds, datetimes, ISO 8601 strings and a
+NumPy datetime64 array, one value at a time against the batch conversions.
+
+The NumPy rows need numpy. Run from the root of the repo with:
+
+    PYTHONPATH=src python benchmarks/time_conversions.py
+"""
+import time
+from datetime import datetime, timezone
+
+from surrealdb.data.types.datetime import DateTimeCompact
+
+VALUES = 1_000_000
+
+
+def measure(convert) -> float:
+    started = time.perf_counter()
+    convert()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    values = [DateTimeCompact(1_700_000_000_000_000_000 + index * 1_000_003) for index in range(VALUES)]
+    results = [
+        ("get_seconds_and_nano", lambda: [value.get_seconds_and_nano() for value in values]),
+        ("get_date_time", lambda: [value.get_date_time() for value in values]),
+        (
+            "datetime.fromtimestamp, float",
+            lambda: [datetime.fromtimestamp(value.timestamp / 1e9, timezone.utc) for value in values],
+        ),
+        ("to_datetimes", lambda: DateTimeCompact.to_datetimes(values)),
+        ("to_iso, one at a time", lambda: [value.to_iso() for value in values]),
+        ("to_iso_strings", lambda: DateTimeCompact.to_iso_strings(values)),
+        ("to_numpy", lambda: DateTimeCompact.to_numpy(values)),
+    ]
+    print(f"{VALUES} timestamps")
+    for name, convert in results:
+        print(f"{name:35} {measure(convert):6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
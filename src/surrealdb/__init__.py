@@ -1,10 +1,22 @@
 from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+from surrealdb.connections.async_pool import AsyncSurrealPool
 from surrealdb.connections.async_ws import AsyncWsSurrealConnection
 from surrealdb.connections.blocking_http import BlockingHttpSurrealConnection
+from surrealdb.connections.blocking_pool import BlockingSurrealPool
 from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+from surrealdb.connections.bulk_insert import BatchError, InsertManyError, InsertManyResult
+from surrealdb.connections.columns import Columns
+from surrealdb.connections.live import LiveQueueStats, OverflowPolicy
+from surrealdb.connections.pool_state import PoolStats
+from surrealdb.connections.query_cache import QueryCache, QueryCacheStats
+from surrealdb.connections.query_result import QueryResults, StatementError, StatementResult
+from surrealdb.connections.record_cache import RecordCache, RecordCacheStats
+from surrealdb.connections.select_batch import SelectBatchStats
+from surrealdb.connections.single_flight import SingleFlightStats
 from surrealdb.connections.url import Url, UrlScheme
 from typing import Union, Optional
 
+from surrealdb.data.cbor import Interner
 from surrealdb.data.types.table import Table
 from surrealdb.data.types.constants import *
 from surrealdb.data.types.datetime import DateTimeCompact
@@ -31,11 +43,12 @@ class AsyncSurrealDBMeta(type):
 
         # Extract `max_size` with a default if not explicitly provided
         max_size = kwargs.get("max_size", 2 ** 20)
+        multiplex = kwargs.get("multiplex", False)
 
         if constructed_url.scheme == UrlScheme.HTTP or constructed_url.scheme == UrlScheme.HTTPS:
             return AsyncHttpSurrealConnection(url=url)
         elif constructed_url.scheme == UrlScheme.WS or constructed_url.scheme == UrlScheme.WSS:
-            return AsyncWsSurrealConnection(url=url, max_size=max_size)
+            return AsyncWsSurrealConnection(url=url, max_size=max_size, multiplex=multiplex)
         else:
             raise ValueError(f"Unsupported protocol in URL: {url}. Use 'ws://' or 'http://'.")
 
@@ -57,29 +70,38 @@ class BlockingSurrealDBMeta(type):
 
         # Extract `max_size` with a default if not explicitly provided
         max_size = kwargs.get("max_size", 2 ** 20)
+        multiplex = kwargs.get("multiplex", False)
 
         if constructed_url.scheme == UrlScheme.HTTP or constructed_url.scheme == UrlScheme.HTTPS:
             return BlockingHttpSurrealConnection(url=url)
         elif constructed_url.scheme == UrlScheme.WS or constructed_url.scheme == UrlScheme.WSS:
-            return BlockingWsSurrealConnection(url=url, max_size=max_size)
+            return BlockingWsSurrealConnection(url=url, max_size=max_size, multiplex=multiplex)
         else:
             raise ValueError(f"Unsupported protocol in URL: {url}. Use 'ws://' or 'http://'.")
 
-def Surreal(url: Optional[str] = None, max_size: int = 2 ** 20) -> Union[BlockingWsSurrealConnection, BlockingHttpSurrealConnection]:
+def Surreal(
+        url: Optional[str] = None,
+        max_size: int = 2 ** 20,
+        multiplex: bool = False,
+) -> Union[BlockingWsSurrealConnection, BlockingHttpSurrealConnection]:
     constructed_url = Url(url)
     if constructed_url.scheme == UrlScheme.HTTP or constructed_url.scheme == UrlScheme.HTTPS:
         return BlockingHttpSurrealConnection(url=url)
     elif constructed_url.scheme == UrlScheme.WS or constructed_url.scheme == UrlScheme.WSS:
-        return BlockingWsSurrealConnection(url=url, max_size=max_size)
+        return BlockingWsSurrealConnection(url=url, max_size=max_size, multiplex=multiplex)
     else:
         raise ValueError(f"Unsupported protocol in URL: {url}. Use 'ws://' or 'http://'.")
 
 
-def AsyncSurreal(url: Optional[str] = None, max_size: int = 2 ** 20) -> Union[AsyncWsSurrealConnection, AsyncHttpSurrealConnection]:
+def AsyncSurreal(
+        url: Optional[str] = None,
+        max_size: int = 2 ** 20,
+        multiplex: bool = False,
+) -> Union[AsyncWsSurrealConnection, AsyncHttpSurrealConnection]:
     constructed_url = Url(url)
     if constructed_url.scheme == UrlScheme.HTTP or constructed_url.scheme == UrlScheme.HTTPS:
         return AsyncHttpSurrealConnection(url=url)
     elif constructed_url.scheme == UrlScheme.WS or constructed_url.scheme == UrlScheme.WSS:
-        return AsyncWsSurrealConnection(url=url, max_size=max_size)
+        return AsyncWsSurrealConnection(url=url, max_size=max_size, multiplex=multiplex)
     else:
         raise ValueError(f"Unsupported protocol in URL: {url}. Use 'ws://' or 'http://'.")
@@ -1,12 +1,30 @@
 import uuid
-from typing import Optional, Any, Dict, Union, List
+from typing import Optional, Any, Dict, Union, List, Iterable, Callable, Awaitable
 
 import aiohttp
 
 from surrealdb.connections.async_template import AsyncTemplate
+from surrealdb.connections.bulk_insert import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    InsertManyResult,
+    insert_batches_async,
+    iter_batches,
+)
+from surrealdb.connections.columns import Columns, read_columns
+from surrealdb.connections.query_cache import QueryCache, cached_query_async, query_cache_key
+from surrealdb.connections.query_result import QueryResults
+from surrealdb.connections.select_batch import (
+    DEFAULT_SELECT_BATCH_SIZE,
+    SELECT_BATCH_QUERY,
+    SELECT_BATCH_VARIABLE,
+    SelectBatcher,
+)
+from surrealdb.connections.single_flight import SingleFlight, single_flight_key
 from surrealdb.connections.url import Url
 from surrealdb.connections.utils_mixin import UtilsMixin
-from surrealdb.data.cbor import decode
+from surrealdb.data.cbor import Interner, decode
 from surrealdb.data.types.record_id import RecordID
 from surrealdb.data.types.table import Table
 from surrealdb.request_message.message import RequestMessage
@@ -18,24 +36,59 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
     A single async connection to a SurrealDB instance using HTTP. To be used once and discarded.
 
     # Notes
-    A new HTTP session is created for each query to send a request to the SurrealDB server.
+    The connection owns a long-lived HTTP session so requests reuse kept-alive TCP (and TLS) connections.
+    The session is opened on the first request and closed by `close()` or on exiting the context manager.
 
     Attributes:
         url: The URL of the database to process queries for.
         max_size: The maximum size of the connection payload.
         id: The ID of the connection.
+        connection_limit: The maximum number of simultaneous TCP connections, 0 for no limit.
+        connection_limit_per_host: The maximum number of simultaneous TCP connections to the same host, 0 for no limit.
+        keepalive_timeout: The seconds an idle TCP connection is kept alive for reuse.
+        dns_cache_ttl: The seconds resolved DNS entries are cached for, None caches forever.
+        request_timeout: The total seconds a single request is allowed to take.
+        query_cache: The cache query() reads results through when asked to, None to disable caching.
+        single_flight: The group sharing one request between identical concurrent reads.
+        select_batcher: The batcher selecting concurrent selects of single records with one query, None if disabled.
+        interner: The interner shared by every response decoded, None to decode every row on its own.
     """
 
     def __init__(
         self,
         url: str,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        dns_cache_ttl: Optional[int] = 10,
+        request_timeout: float = 30.0,
+        query_cache: Optional[QueryCache] = None,
+        single_flight: Iterable[str] = (),
+        select_batch_window: Optional[float] = None,
+        select_batch_size: int = DEFAULT_SELECT_BATCH_SIZE,
+        interner: Optional[Interner] = None,
     ) -> None:
         """
         Constructor for the AsyncHttpSurrealConnection class.
 
         :param url: (str) The URL of the database to process queries for.
+        :param connection_limit: (int) The maximum number of simultaneous TCP connections, 0 for no limit.
+        :param connection_limit_per_host: (int) The maximum number of simultaneous TCP connections to the same host.
+        :param keepalive_timeout: (float) The seconds an idle TCP connection is kept alive for reuse.
+        :param dns_cache_ttl: (Optional[int]) The seconds resolved DNS entries are cached for, None caches forever.
+        :param request_timeout: (float) The total seconds a single request is allowed to take.
+        :param query_cache: (Optional[QueryCache]) The cache query(cache=True) reads results through, invalidated
+            by tag and by the connection's own writes.
+        :param single_flight: (Iterable[str]) The methods, "query" and "select", whose identical concurrent calls
+            share one request unless a call passes single_flight=False.
+        :param select_batch_window: (Optional[float]) The seconds the selects of single RecordIDs are collected
+            for and selected with one query, for instance 0.0005 for 500µs. None selects every record on its own.
+        :param select_batch_size: (int) The maximum number of records selected by one batched query.
+        :param interner: (Optional[Interner]) The interner shared by every response decoded, to share recurring
+            table names, map keys and record IDs between rows. None decodes every row on its own.
         """
         self.url: Url = Url(url)
+        self.interner: Optional[Interner] = interner
         self.raw_url: str = self.url.raw_url
         self.host: str = self.url.hostname
         self.port: Optional[int] = self.url.port
@@ -44,6 +97,36 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         self.namespace: Optional[str] = None
         self.database: Optional[str] = None
         self.vars = dict()
+        self.connection_limit: int = connection_limit
+        self.connection_limit_per_host: int = connection_limit_per_host
+        self.keepalive_timeout: float = keepalive_timeout
+        self.dns_cache_ttl: Optional[int] = dns_cache_ttl
+        self.request_timeout: float = request_timeout
+        self.query_cache: Optional[QueryCache] = query_cache
+        self.single_flight: SingleFlight = SingleFlight(single_flight)
+        self.select_batcher: Optional[SelectBatcher] = None
+        if select_batch_window is not None:
+            self.select_batcher = SelectBatcher(self._select_batch, select_batch_window, select_batch_size)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the connection's HTTP session, opening it with a tuned connector if it is not open.
+
+        :return: (aiohttp.ClientSession) the session to send requests with.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._session
 
     async def _send(
         self,
@@ -54,12 +137,24 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         """
         Sends an HTTP request to the SurrealDB server.
 
-        :param endpoint: (str) The endpoint of the SurrealDB API to send the request to.
-        :param method: (str) The HTTP method (e.g., "POST", "GET", "PUT", "DELETE").
-        :param headers: (dict) Optional headers to include in the request.
-        :param payload: (dict) Optional JSON payload to include in the request body.
+        :param message: (RequestMessage) The message to send.
+        :param operation: (str) What the request is, for the error raised if it failed.
+        :param bypass: (bool) Whether to return a response holding an error instead of raising.
+
+        :return: (dict) The decoded CBOR response from the server.
+        """
+        data = decode(await self._send_raw(message), self.interner)
+        if bypass is False:
+            self.check_response_for_error(data, operation)
+        return data
+
+    async def _send_raw(self, message: RequestMessage) -> bytes:
+        """
+        Sends an HTTP request to the SurrealDB server and returns the CBOR response without decoding it.
+
+        :param message: (RequestMessage) The message to send.
 
-        :return: (dict) The decoded JSON response from the server.
+        :return: (bytes) The CBOR response from the server.
         """
         # json_body, method, endpoint = message.JSON_HTTP_DESCRIPTOR
         data = message.WS_CBOR_DESCRIPTOR
@@ -74,21 +169,16 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         if self.database:
             headers["Surreal-DB"] = self.database
 
-        async with aiohttp.ClientSession() as session:
-             async with session.request(
-                method="POST",
-                url=url,
-                headers=headers,
-                # json=json.dumps(json_body),
-                data=data,
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                response.raise_for_status()
-                raw_cbor = await response.read()
-                data = decode(raw_cbor)
-                if bypass is False:
-                    self.check_response_for_error(data, operation)
-                return data
+        session = self._get_session()
+        async with session.request(
+            method="POST",
+            url=url,
+            headers=headers,
+            # json=json.dumps(json_body),
+            data=data,
+        ) as response:
+            response.raise_for_status()
+            return await response.read()
 
     def set_token(self, token: str) -> None:
         """
@@ -127,7 +217,15 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         self.namespace = namespace
         self.database = database
 
-    async def query(self, query: str, params: Optional[dict] = None) -> dict:
+    async def query(
+            self,
+            query: str,
+            params: Optional[dict] = None,
+            cache: bool = False,
+            ttl: Optional[float] = None,
+            tags: Iterable[str] = (),
+            single_flight: Optional[bool] = None,
+    ) -> dict:
         if params is None:
             params = {}
         for key, value in self.vars.items():
@@ -138,10 +236,47 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
             query=query,
             params=params,
         )
-        response = await self._send(message, "query")
-        self.check_response_for_result(response, "query")
+
+        async def send() -> dict:
+            response = await self._send(message, "query")
+            self.check_response_for_result(response, "query")
+            return response
+
+        fetch = self._single_flight("query", single_flight, send, query, params)
+
+        if cache and self.query_cache is not None:
+            # the whole session state is sent with every request, so it keys the result with the params
+            return await cached_query_async(
+                self.query_cache,
+                query_cache_key(query, params, [self.namespace, self.database, self.token]),
+                fetch,
+                ttl,
+                tags,
+                background=True,
+            )
+        response = await fetch()
         return response["result"][0]["result"]
 
+    def _single_flight(
+            self, method: str, single_flight: Optional[bool], send: Callable[[], Awaitable[dict]], *args: Any
+    ) -> Callable[[], Awaitable[dict]]:
+        """
+        Returns send, or a coroutine function joining an identical request in flight if the call is coalesced.
+        """
+        if not self.single_flight.enabled(method, single_flight):
+            return send
+        key = single_flight_key(method, *args, [self.namespace, self.database, self.token])
+        return lambda: self.single_flight.do(key, send)
+
+    def _invalidate_caches(self, thing: Union[str, RecordID, Table]) -> None:
+        """
+        Drops the cached query results a write to thing may have changed, and stops reads in flight from
+        being joined.
+        """
+        self.single_flight.forget()
+        if self.query_cache is not None:
+            self.query_cache.invalidate_thing(thing)
+
     async def query_raw(self, query: str, params: Optional[dict] = None) -> dict:
         if params is None:
             params = {}
@@ -156,6 +291,37 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         response = await self._send(message, "query", bypass=True)
         return response
 
+    async def query_columns(self, query: str, params: Optional[dict] = None, statement: int = 0) -> Columns:
+        params = dict(params) if params else {}
+        for key, value in self.vars.items():
+            params[key] = value
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        return read_columns(await self._send_raw(message), "query", self.interner, statement)
+
+    async def query_many(
+            self, query: str, params: Optional[dict] = None, raise_on_error: bool = False
+    ) -> QueryResults:
+        params = dict(params) if params else {}
+        for key, value in self.vars.items():
+            params[key] = value
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        response = await self._send(message, "query")
+        self.check_response_for_result(response, "query")
+        results = QueryResults.from_response(response["result"])
+        if raise_on_error:
+            results.raise_for_errors()
+        return results
+
     async def create(
             self,
             thing: Union[str, RecordID, Table],
@@ -173,6 +339,7 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "create")
         self.check_response_for_result(response, "create")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def delete(
@@ -185,6 +352,7 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "delete")
         self.check_response_for_result(response, "delete")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def info(self) -> dict:
@@ -207,6 +375,7 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "insert")
         self.check_response_for_result(response, "insert")
+        self._invalidate_caches(table)
         return response["result"]
 
     async def insert_relation(
@@ -220,8 +389,25 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "insert_relation")
         self.check_response_for_result(response, "insert_relation")
+        self._invalidate_caches(table)
         return response["result"]
 
+    async def insert_many(
+            self,
+            table: Union[str, Table],
+            rows: Iterable[dict],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+            continue_on_error: bool = False,
+    ) -> InsertManyResult:
+        return await insert_batches_async(
+            lambda batch: self.insert(table, batch),
+            iter_batches(rows, batch_size, max_bytes),
+            max_in_flight,
+            continue_on_error,
+        )
+
     async def invalidate(self) -> None:
         message = RequestMessage(self.id, RequestMethod.INVALIDATE)
         await self._send(message, "invalidating")
@@ -244,6 +430,7 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "merge")
         self.check_response_for_result(response, "merge")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def patch(
@@ -257,18 +444,43 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "patch")
         self.check_response_for_result(response, "patch")
+        self._invalidate_caches(thing)
         return response["result"]
 
-    async def select(self, thing: str) -> Union[List[dict], dict]:
+    async def select_columns(self, thing: Union[str, RecordID, Table]) -> Columns:
+        message = RequestMessage(
+            self.id,
+            RequestMethod.SELECT,
+            params=[thing]
+        )
+        return read_columns(await self._send_raw(message), "select", self.interner)
+
+    async def select(self, thing: str, single_flight: Optional[bool] = None) -> Union[List[dict], dict]:
         message = RequestMessage(
             self.id,
             RequestMethod.SELECT,
             params=[thing]
         )
-        response = await self._send(message, "select")
-        self.check_response_for_result(response, "select")
+
+        async def send() -> dict:
+            response = await self._send(message, "select")
+            self.check_response_for_result(response, "select")
+            return response
+
+        if self.select_batcher is not None and isinstance(thing, RecordID):
+            return await self.select_batcher.select(thing)
+        response = await self._single_flight("select", single_flight, send, thing)()
         return response["result"]
 
+    async def _select_batch(self, record_ids: List[RecordID]) -> List[dict]:
+        """
+        Selects the records of a batch of the select batcher.
+        """
+        results = await self.query_many(
+            SELECT_BATCH_QUERY, {SELECT_BATCH_VARIABLE: record_ids}, raise_on_error=True
+        )
+        return results[0].result
+
     async def update(
             self,
             thing: Union[str, RecordID, Table],
@@ -282,6 +494,7 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "update")
         self.check_response_for_result(response, "update")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def version(self) -> str:
@@ -304,6 +517,7 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "upsert")
         self.check_response_for_result(response, "upsert")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def signup(self, vars: Dict) -> str:
@@ -317,12 +531,17 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         self.token = response["result"]
         return response["result"]
 
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     async def __aenter__(self) -> "AsyncHttpSurrealConnection":
         """
         Asynchronous context manager entry.
         Initializes an aiohttp session and returns the connection instance.
         """
-        self._session = aiohttp.ClientSession()
+        self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback) -> None:
@@ -330,5 +549,4 @@ class AsyncHttpSurrealConnection(AsyncTemplate, UtilsMixin):
         Asynchronous context manager exit.
         Closes the aiohttp session upon exiting the context.
         """
-        if hasattr(self, "_session"):
-            await self._session.close()
+        await self.close()
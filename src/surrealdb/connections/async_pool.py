@@ -0,0 +1,384 @@
+"""
+A bounded pool of async connections to a SurrealDB instance.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import aiohttp
+from websockets.exceptions import ConnectionClosed
+
+from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.connections.pool_state import PoolMember, PoolStats, SessionState
+from surrealdb.connections.url import Url, UrlScheme
+
+# errors raised inside an acquired block that mean the connection itself is broken
+BROKEN_CONNECTION_ERRORS = (
+    ConnectionError,
+    OSError,
+    asyncio.TimeoutError,
+    ConnectionClosed,
+    aiohttp.ClientError,
+)
+
+
+class AsyncSurrealPool:
+    """
+    A bounded pool of async connections to a SurrealDB instance.
+
+    # Notes
+    The pool records the `signin`, `use` and `let` calls made on it and replays them onto every connection
+    it opens, so checked out connections are already authenticated and pointed at the right database. State
+    changes made on the pool are replayed onto existing members the next time they are checked out. State
+    changed directly on a checked out connection is not tracked by the pool.
+
+    Attributes:
+        url: The URL of the database to open connections to.
+        min_connections: The number of connections kept open even when idle.
+        max_connections: The maximum number of connections the pool will open.
+        acquire_timeout: The default seconds to wait for a connection before raising a TimeoutError.
+        max_idle_time: The seconds a connection above min_connections can sit idle before it is closed.
+        health_check_interval: The seconds after which an idle connection is pinged before being handed out.
+        health_check_timeout: The seconds to wait for a health check before the connection is replaced.
+        reap_interval: The seconds between runs of the background task closing idle connections.
+        max_size: The maximum size of a websocket message for websocket connections.
+        multiplex: Whether websocket connections are created in multiplexed mode.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            min_connections: int = 1,
+            max_connections: int = 10,
+            acquire_timeout: Optional[float] = 30.0,
+            max_idle_time: float = 300.0,
+            health_check_interval: float = 30.0,
+            health_check_timeout: float = 5.0,
+            reap_interval: float = 30.0,
+            max_size: int = 2 ** 20,
+            multiplex: bool = False,
+    ) -> None:
+        """
+        The constructor for the AsyncSurrealPool class.
+
+        :param url: The URL of the database to open connections to.
+        :param min_connections: The number of connections kept open even when idle.
+        :param max_connections: The maximum number of connections the pool will open.
+        :param acquire_timeout: The default seconds to wait for a connection, None waits forever.
+        :param max_idle_time: The seconds a connection above min_connections can sit idle before it is closed.
+        :param health_check_interval: The seconds after which an idle connection is pinged before being handed out.
+        :param health_check_timeout: The seconds to wait for a health check before the connection is replaced.
+        :param reap_interval: The seconds between runs of the background task closing idle connections.
+        :param max_size: The maximum size of a websocket message for websocket connections.
+        :param multiplex: Whether websocket connections are created in multiplexed mode.
+        """
+        if min_connections < 0 or max_connections < 1 or min_connections > max_connections:
+            raise ValueError(
+                f"invalid pool size: min_connections={min_connections} max_connections={max_connections}"
+            )
+        self.url: Url = Url(url)
+        self.raw_url: str = url
+        self.min_connections: int = min_connections
+        self.max_connections: int = max_connections
+        self.acquire_timeout: Optional[float] = acquire_timeout
+        self.max_idle_time: float = max_idle_time
+        self.health_check_interval: float = health_check_interval
+        self.health_check_timeout: float = health_check_timeout
+        self.reap_interval: float = reap_interval
+        self.max_size: int = max_size
+        self.multiplex: bool = multiplex
+        self.state: SessionState = SessionState()
+        self._idle: List[PoolMember] = []
+        self._size: int = 0
+        self._in_use: int = 0
+        self._waiters: int = 0
+        self._acquired: int = 0
+        self._timeouts: int = 0
+        self._created: int = 0
+        self._discarded: int = 0
+        self._total_wait_time: float = 0.0
+        self._max_wait_time: float = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._closed: bool = False
+
+    @property
+    def _lock(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def open(self) -> None:
+        """
+        Opens min_connections connections and starts the background task closing idle connections.
+        """
+        self._closed = False
+        members = []
+        for _ in range(self.min_connections - self._size):
+            async with self._lock:
+                self._size += 1
+            try:
+                members.append(await self._create_member())
+            except BaseException:
+                async with self._lock:
+                    self._size -= 1
+                raise
+        async with self._lock:
+            self._idle.extend(members)
+            self._lock.notify(len(members))
+        if self._reaper_task is None and self.reap_interval > 0:
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+
+    async def close(self) -> None:
+        """
+        Closes every idle connection and stops the pool. Connections still checked out are closed when released.
+        """
+        self._closed = True
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            await asyncio.gather(self._reaper_task, return_exceptions=True)
+            self._reaper_task = None
+        async with self._lock:
+            members = self._idle
+            self._idle = []
+            self._size -= len(members)
+            self._lock.notify_all()
+        for member in members:
+            await self._close_member(member)
+
+    async def signin(self, vars: Dict[str, Any]) -> None:
+        """
+        Signs every connection in the pool in with the passed variables.
+
+        :param vars: The variables used to sign in, as passed to the connection's signin.
+        """
+        self.state.signin(vars)
+
+    async def use(self, namespace: str, database: str) -> None:
+        """
+        Switches every connection in the pool to a specific namespace and database.
+
+        :param namespace: The namespace to use.
+        :param database: The database to use.
+        """
+        self.state.use(namespace, database)
+
+    async def let(self, key: str, value: Any) -> None:
+        """
+        Assigns a variable on every connection in the pool.
+
+        :param key: The name of the variable.
+        :param value: The value of the variable.
+        """
+        self.state.let(key, value)
+
+    async def unset(self, key: str) -> None:
+        """
+        Removes a variable from every connection in the pool.
+
+        :param key: The name of the variable.
+        """
+        self.state.unset(key)
+
+    @asynccontextmanager
+    async def acquire(
+            self, timeout: Optional[float] = None
+    ) -> AsyncIterator[Union[AsyncWsSurrealConnection, AsyncHttpSurrealConnection]]:
+        """
+        Checks a connection out of the pool for the duration of the context.
+
+        If the block raises an error signalling a broken connection the connection is closed instead of
+        being returned to the pool.
+
+        :param timeout: The seconds to wait for a connection, defaults to the pool's acquire_timeout.
+
+        Example:
+            async with pool.acquire() as connection:
+                await connection.select("person")
+        """
+        member = await self._checkout(self.acquire_timeout if timeout is None else timeout)
+        discard = False
+        try:
+            yield member.connection
+        except BROKEN_CONNECTION_ERRORS:
+            discard = True
+            raise
+        finally:
+            await self._release(member, discard)
+
+    def stats(self) -> PoolStats:
+        """
+        Returns a snapshot of the pool's usage.
+        """
+        return PoolStats(
+            size=self._size,
+            in_use=self._in_use,
+            idle=len(self._idle),
+            waiters=self._waiters,
+            max_connections=self.max_connections,
+            acquired=self._acquired,
+            timeouts=self._timeouts,
+            created=self._created,
+            discarded=self._discarded,
+            total_wait_time=self._total_wait_time,
+            max_wait_time=self._max_wait_time,
+        )
+
+    async def _checkout(self, timeout: Optional[float]) -> PoolMember:
+        if self._closed:
+            raise ConnectionError("the pool is closed")
+        if self._reaper_task is None and self.reap_interval > 0:
+            self._reaper_task = asyncio.create_task(self._reap_loop())
+        started = time.monotonic()
+        member: Optional[PoolMember] = None
+        async with self._lock:
+            self._waiters += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("the pool is closed")
+                    if self._idle:
+                        member = self._idle.pop()
+                        break
+                    if self._size < self.max_connections:
+                        self._size += 1
+                        break
+                    remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                    if remaining is not None and remaining <= 0:
+                        self._timeouts += 1
+                        raise TimeoutError(f"timed out after {timeout}s waiting for a connection from the pool")
+                    try:
+                        await asyncio.wait_for(self._lock.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiters -= 1
+        try:
+            if member is None:
+                member = await self._create_member()
+            else:
+                member = await self._validate_member(member)
+        except BaseException:
+            async with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+        waited = time.monotonic() - started
+        self._acquired += 1
+        self._in_use += 1
+        self._total_wait_time += waited
+        self._max_wait_time = max(self._max_wait_time, waited)
+        return member
+
+    async def _release(self, member: PoolMember, discard: bool) -> None:
+        member.last_used = time.monotonic()
+        async with self._lock:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append(member)
+            self._lock.notify()
+        if discard or self._closed:
+            await self._close_member(member)
+
+    def _new_connection(self) -> Union[AsyncWsSurrealConnection, AsyncHttpSurrealConnection]:
+        if self.url.scheme == UrlScheme.HTTP or self.url.scheme == UrlScheme.HTTPS:
+            return AsyncHttpSurrealConnection(url=self.raw_url)
+        elif self.url.scheme == UrlScheme.WS or self.url.scheme == UrlScheme.WSS:
+            return AsyncWsSurrealConnection(url=self.raw_url, max_size=self.max_size, multiplex=self.multiplex)
+        raise ValueError(f"Unsupported protocol in URL: {self.raw_url}. Use 'ws://' or 'http://'.")
+
+    async def _create_member(self) -> PoolMember:
+        connection = self._new_connection()
+        member = PoolMember(connection)
+        try:
+            if isinstance(connection, AsyncWsSurrealConnection):
+                await connection.connect()
+            await self._replay_state(member)
+        except BaseException:
+            await self._close_member(member)
+            raise
+        self._created += 1
+        return member
+
+    async def _validate_member(self, member: PoolMember) -> PoolMember:
+        """
+        Health checks a member that has been idle for longer than health_check_interval and replays
+        the session state if it has changed, replacing the member with a new connection if either fails.
+        """
+        now = time.monotonic()
+        try:
+            if now - member.last_checked > self.health_check_interval:
+                await asyncio.wait_for(member.connection.version(), self.health_check_timeout)
+                member.last_checked = now
+            if member.state_version != self.state.version:
+                await self._replay_state(member)
+        except Exception:
+            await self._close_member(member)
+            return await self._create_member()
+        return member
+
+    async def _replay_state(self, member: PoolMember) -> None:
+        connection = member.connection
+        version = self.state.version
+        if self.state.signin_vars is not None:
+            await connection.signin(dict(self.state.signin_vars))
+        if self.state.namespace is not None:
+            await connection.use(self.state.namespace, self.state.database)
+        for key in member.applied_vars - set(self.state.vars):
+            await connection.unset(key)
+        for key, value in self.state.vars.items():
+            await connection.let(key, value)
+        member.applied_vars = set(self.state.vars)
+        member.state_version = version
+
+    async def _close_member(self, member: PoolMember) -> None:
+        self._discarded += 1
+        try:
+            await member.connection.close()
+        except Exception:
+            pass
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            await self.reap()
+
+    async def reap(self) -> int:
+        """
+        Closes connections above min_connections that have been idle for longer than max_idle_time.
+
+        :return: The number of connections closed.
+        """
+        now = time.monotonic()
+        reaped = []
+        async with self._lock:
+            for member in sorted(self._idle, key=lambda m: m.last_used):
+                if self._size - len(reaped) <= self.min_connections:
+                    break
+                if now - member.last_used > self.max_idle_time:
+                    reaped.append(member)
+            for member in reaped:
+                self._idle.remove(member)
+            self._size -= len(reaped)
+        for member in reaped:
+            await self._close_member(member)
+        return len(reaped)
+
+    async def __aenter__(self) -> "AsyncSurrealPool":
+        """
+        Asynchronous context manager entry.
+        Opens the minimum number of connections and returns the pool.
+        """
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Asynchronous context manager exit.
+        Closes every connection in the pool.
+        """
+        await self.close()
@@ -2,17 +2,62 @@
 A basic async connection to a SurrealDB instance.
 """
 import asyncio
+import itertools
 import uuid
-from asyncio import Queue
-from typing import Optional, Any, Dict, Union, List, AsyncGenerator
+from typing import Optional, Any, Dict, Union, List, AsyncGenerator, Iterable, Callable, Tuple, Awaitable, Set
 from uuid import UUID
 
 import websockets
 
 from surrealdb.connections.async_template import AsyncTemplate
+from surrealdb.connections.bulk_insert import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    InsertManyResult,
+    insert_batches_async,
+    iter_batches,
+)
+from surrealdb.connections.columns import Columns, frame_id, read_columns
+from surrealdb.connections.live import (
+    DEFAULT_LIVE_BATCH_SIZE,
+    DEFAULT_LIVE_BATCH_WINDOW,
+    DEFAULT_LIVE_QUEUE_SIZE,
+    AsyncLiveQueue,
+    LiveQueueStats,
+    LiveRegistry,
+    OverflowPolicy,
+    coalesce_notifications,
+    live_definition,
+    live_select_query,
+    live_select_uuid,
+    live_select_variables,
+    live_uuid,
+)
+from surrealdb.connections.pagination import (
+    DEFAULT_PAGE_SIZE,
+    LAST_VARIABLE,
+    check_page,
+    keyset_queries,
+    keyset_variables,
+)
+from surrealdb.connections.query_result import QueryResults
+from surrealdb.connections.query_cache import QueryCache, cached_query_async, query_cache_key
+from surrealdb.connections.record_cache import (
+    RecordCacheWatcher,
+    RecordCache,
+    record_cache_key,
+)
+from surrealdb.connections.select_batch import (
+    DEFAULT_SELECT_BATCH_SIZE,
+    SELECT_BATCH_QUERY,
+    SELECT_BATCH_VARIABLE,
+    SelectBatcher,
+)
+from surrealdb.connections.single_flight import SingleFlight, single_flight_key
 from surrealdb.connections.url import Url
 from surrealdb.connections.utils_mixin import UtilsMixin
-from surrealdb.data.cbor import decode
+from surrealdb.data.cbor import Interner, decode
 from surrealdb.data.types.record_id import RecordID
 from surrealdb.data.types.table import Table
 from surrealdb.request_message.message import RequestMessage
@@ -27,6 +72,17 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
     A new connection is created for each query. This is because the async websocket connection is
     dropped
 
+    If the connection is created with `multiplex=True` every request gets its own ID and a single
+    background task reads the socket, resolving a future per request ID. This means that any number
+    of coroutines can have requests in flight on the same socket at the same time.
+
+    Live queries always use the background reader, which is started by `live()` if needed. The reader
+    routes every notification to a bounded queue per live query, applying `live_overflow` when a
+    subscriber falls behind and the queue holds `live_queue_size` notifications. The reader never waits
+    for a subscriber, so a slow subscriber does not hold up the responses to other requests. Live queries started
+    with `shared=True` and the same definition share one live query on the database, each call getting
+    its own UUID and queue, and the live query is killed on the database with its last subscriber.
+
     Attributes:
         url: The URL of the database to process queries for.
         user: The username to login on.
@@ -35,19 +91,53 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         database: The database that the connection will stick to.
         max_size: The maximum size of the connection.
         id: The ID of the connection.
+        multiplex: Whether requests are multiplexed over the socket by a background reader.
+        live_queue_size: The default maximum number of notifications queued per live query.
+        live_overflow: The default policy applied to a notification for a live query whose queue is full.
+        record_cache: The cache select() reads single records through, None to disable caching.
+        query_cache: The cache query() reads results through when asked to, None to disable caching.
+        single_flight: The group sharing one request between identical concurrent reads.
+        select_batcher: The batcher selecting concurrent selects of single records with one query, None if disabled.
+        interner: The interner shared by every response decoded, None to decode every row on its own.
     """
     def __init__(
             self,
             url: str,
             max_size: int = 2 ** 20,
+            multiplex: bool = False,
+            live_queue_size: int = DEFAULT_LIVE_QUEUE_SIZE,
+            live_overflow: Union[str, OverflowPolicy] = OverflowPolicy.DROP_OLDEST,
+            record_cache: Optional[RecordCache] = None,
+            query_cache: Optional[QueryCache] = None,
+            single_flight: Iterable[str] = (),
+            select_batch_window: Optional[float] = None,
+            select_batch_size: int = DEFAULT_SELECT_BATCH_SIZE,
+            interner: Optional[Interner] = None,
     ) -> None:
         """
         The constructor for the AsyncSurrealConnection class.
 
         :param url: The URL of the database to process queries for.
         :param max_size: The maximum size of the connection.
+        :param multiplex: Whether to give every request a unique ID and route responses with a background reader.
+        :param live_queue_size: The default maximum number of notifications queued per live query.
+        :param live_overflow: The default policy for a full live query queue, "drop_oldest", "coalesce" or
+            "block", which keeps the notifications that do not fit in a growing backlog.
+        :param record_cache: The cache select() reads single records through, kept up to date by a live query
+            per cached table and by the connection's own writes.
+        :param query_cache: The cache query(cache=True) reads results through, invalidated by tag and by the
+            connection's own writes.
+        :param single_flight: The methods, "query" and "select", whose identical concurrent calls share one
+            request unless a call passes single_flight=False.
+        :param select_batch_window: The seconds the selects of single RecordIDs are collected for and selected
+            with one query, for instance 0.0005 for 500µs. None selects every record on its own. The first
+            batch starts the background reader, like live() does.
+        :param select_batch_size: The maximum number of records selected by one batched query.
+        :param interner: The interner shared by every response decoded, to share recurring table names,
+            map keys and record IDs between rows. None decodes every row on its own.
         """
         self.url: Url = Url(url)
+        self.interner: Optional[Interner] = interner
         self.raw_url: str = f"{self.url.raw_url}/rpc"
         self.host: str = self.url.hostname
         self.port: int = self.url.port
@@ -55,15 +145,141 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         self.id: str = str(uuid.uuid4())
         self.token: Optional[str] = None
         self.socket = None
+        self.multiplex: bool = multiplex
+        self._request_ids = itertools.count(1)
+        self.live_queue_size: int = live_queue_size
+        self.live_overflow: OverflowPolicy = OverflowPolicy.from_value(live_overflow)
+        self._pending: Dict[str, Tuple[asyncio.Future, Optional[Callable[[dict], None]]]] = {}
+        # the requests whose response frame is handed over undecoded, to be decoded into columns
+        self._raw_requests: Set[str] = set()
+        self._live = LiveRegistry()
+        self._background_tasks: Set[asyncio.Task] = set()
+        self.record_cache: Optional[RecordCache] = record_cache
+        self._cache_watches: Dict[str, UUID] = {}
+        self.query_cache: Optional[QueryCache] = query_cache
+        self.single_flight: SingleFlight = SingleFlight(single_flight)
+        self.select_batcher: Optional[SelectBatcher] = None
+        if select_batch_window is not None:
+            self.select_batcher = SelectBatcher(self._select_batch, select_batch_window, select_batch_size)
+        # the session state, variables included, lives on the server so cached results are keyed by session
+        self._query_scope: bytes = uuid.uuid4().bytes
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._live_lock: Optional[asyncio.Lock] = None
 
     async def _send(self, message: RequestMessage, process: str, bypass: bool = False) -> dict:
         await self.connect()
-        await self.socket.send(message.WS_CBOR_DESCRIPTOR)
-        response = decode(await self.socket.recv())
+        if self._reader_task is not None:
+            response = await self._send_multiplexed(message)
+        else:
+            await self.socket.send(message.WS_CBOR_DESCRIPTOR)
+            response = decode(await self.socket.recv(), self.interner)
         if bypass is False:
             self.check_response_for_error(response, process)
         return response
 
+    async def _send_raw(self, message: RequestMessage) -> bytes:
+        """
+        Sends a message and returns the response frame without decoding it.
+        """
+        await self.connect()
+        if self._reader_task is not None:
+            return await self._send_multiplexed(message, raw=True)
+        await self.socket.send(message.WS_CBOR_DESCRIPTOR)
+        return await self.socket.recv()
+
+    async def _send_multiplexed(
+            self, message: RequestMessage, on_response: Optional[Callable[[dict], None]] = None, raw: bool = False
+    ) -> Any:
+        """
+        Sends a message with a unique request ID and waits for the reader to route the response back.
+
+        :param message: The message to send.
+        :param on_response: Called by the reader with the response before it reads the next frame, even if
+            the caller stopped waiting for it.
+        :param raw: Whether the reader hands the response frame over without decoding it.
+        :return: The decoded response for the message, or the response frame if raw.
+        """
+        if self._reader_task.done():
+            raise ConnectionError("the websocket reader has stopped, the connection is closed")
+        request_id = str(next(self._request_ids))
+        message.id = request_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (future, on_response)
+        if raw:
+            self._raw_requests.add(request_id)
+        sent = False
+        try:
+            await self.socket.send(message.WS_CBOR_DESCRIPTOR)
+            sent = True
+            return await future
+        finally:
+            # a request with on_response stays pending after a cancellation so the reader still hands it the response
+            if on_response is None or not sent or not future.cancelled():
+                self._pending.pop(request_id, None)
+            self._raw_requests.discard(request_id)
+
+    def _start_reader(self) -> None:
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        """
+        Reads every frame from the socket, resolving the future of the request it answers or
+        putting it on the queue of the live query it belongs to.
+        """
+        error: Exception = ConnectionError("the websocket connection was closed")
+        try:
+            async for raw in self.socket:
+                if self._raw_requests and self._dispatch_raw(raw):
+                    continue
+                self._dispatch(decode(raw, self.interner))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = e
+        finally:
+            for future, _ in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+            self._live.close(error)
+
+    def _dispatch(self, response: dict) -> None:
+        pending = self._pending.pop(response.get("id"), None)
+        if pending is not None:
+            future, on_response = pending
+            if on_response is not None:
+                # called even if the caller was cancelled, so a live query it started is not lost
+                on_response(response)
+            if not future.done():
+                future.set_result(response)
+            return
+        result = response.get("result")
+        if isinstance(result, dict) and result.get("id") is not None:
+            # the queues never wait, so a slow subscriber does not hold up the responses to other requests
+            self._live.dispatch(self._live_key(result["id"]), result)
+
+    def _dispatch_raw(self, raw: bytes) -> bool:
+        """
+        Resolves the future of a request waiting for its response frame undecoded with the frame.
+
+        :return: Whether the frame answered such a request.
+        """
+        request_id = frame_id(raw)
+        if request_id not in self._raw_requests:
+            return False
+        future, _ = self._pending[request_id]
+        if not future.done():
+            future.set_result(raw)
+        return True
+
+    @staticmethod
+    def _live_key(query_uuid: Union[str, UUID]) -> UUID:
+        if isinstance(query_uuid, UUID):
+            return query_uuid
+        return UUID(str(query_uuid))
+
     async def connect(self, url: Optional[str] = None, max_size: Optional[int] = None) -> None:
         # overwrite params if passed in
         if url is not None:
@@ -73,12 +289,19 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
             self.port: int = self.url.port
         if max_size is not None:
             self.max_size = max_size
-        if self.socket is None:
-            self.socket = await websockets.connect(
-                self.raw_url,
-                max_size=self.max_size,
-                subprotocols=[websockets.Subprotocol("cbor")]
-            )
+        if self.socket is not None:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.socket is None:
+                self.socket = await websockets.connect(
+                    self.raw_url,
+                    max_size=self.max_size,
+                    subprotocols=[websockets.Subprotocol("cbor")]
+                )
+                if self.multiplex is True:
+                    self._start_reader()
 
     # async def signup(self, vars: Dict[str, Any]) -> str:
 
@@ -99,8 +322,17 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         if response.get("id") is None:
             raise Exception(f"no id signing in: {response}")
         self.id = response["id"]
+        await self._reset_caches()
 
-    async def query(self, query: str, params: Optional[dict] = None) -> dict:
+    async def query(
+            self,
+            query: str,
+            params: Optional[dict] = None,
+            cache: bool = False,
+            ttl: Optional[float] = None,
+            tags: Iterable[str] = (),
+            single_flight: Optional[bool] = None,
+    ) -> dict:
         if params is None:
             params = {}
         message = RequestMessage(
@@ -109,8 +341,25 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
             query=query,
             params=params,
         )
-        response = await self._send(message, "query")
-        self.check_response_for_result(response, "query")
+
+        async def send() -> dict:
+            response = await self._send(message, "query")
+            self.check_response_for_result(response, "query")
+            return response
+
+        fetch = self._single_flight("query", single_flight, send, query, params)
+
+        if cache and self.query_cache is not None:
+            # a stale result is only refreshed in the background when the reader can route the response
+            return await cached_query_async(
+                self.query_cache,
+                query_cache_key(query, params, self._query_scope),
+                fetch,
+                ttl,
+                tags,
+                background=self._reader_task is not None,
+            )
+        response = await fetch()
         return response["result"][0]["result"]
 
     async def query_raw(self, query: str, params: Optional[dict] = None) -> dict:
@@ -125,6 +374,34 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         response = await self._send(message, "query", bypass=True)
         return response
 
+    async def query_many(
+            self, query: str, params: Optional[dict] = None, raise_on_error: bool = False
+    ) -> QueryResults:
+        params = dict(params) if params else {}
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        response = await self._send(message, "query")
+        self.check_response_for_result(response, "query")
+        results = QueryResults.from_response(response["result"])
+        if raise_on_error:
+            results.raise_for_errors()
+        return results
+
+    async def query_columns(self, query: str, params: Optional[dict] = None, statement: int = 0) -> Columns:
+        if params is None:
+            params = {}
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        return read_columns(await self._send_raw(message), "query", self.interner, statement)
+
     async def use(self, namespace: str, database: str) -> None:
         message = RequestMessage(
             self.id,
@@ -133,6 +410,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
             database=database,
         )
         await self._send(message, "use")
+        await self._reset_caches()
 
     async def info(self) -> Optional[dict]:
         message = RequestMessage(
@@ -158,11 +436,14 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
             RequestMethod.AUTHENTICATE,
             token=token
         )
-        return await self._send(message, "authenticating")
+        response = await self._send(message, "authenticating")
+        await self._reset_caches()
+        return response
 
     async def invalidate(self) -> None:
         message = RequestMessage(self.id, RequestMethod.INVALIDATE)
         await self._send(message, "invalidating")
+        await self._reset_caches()
 
     async def let(self, key: str, value: Any) -> None:
         message = RequestMessage(
@@ -172,6 +453,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
             value=value
         )
         await self._send(message, "letting")
+        self._query_scope = uuid.uuid4().bytes
 
     async def unset(self, key: str) -> None:
         message = RequestMessage(
@@ -180,16 +462,164 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
             params=[key]
         )
         await self._send(message, "unsetting")
+        self._query_scope = uuid.uuid4().bytes
+
+    async def select(self, thing: str, single_flight: Optional[bool] = None) -> Union[List[dict], dict]:
+        key = record_cache_key(thing) if self.record_cache is not None else None
+        if key is not None:
+            cached, record = self.record_cache.get(key)
+            if cached:
+                return record
+            if not await self._watch_table(key[0]):
+                key = None
+            epoch = self.record_cache.epoch
+        message = RequestMessage(
+            self.id,
+            RequestMethod.SELECT,
+            params=[thing]
+        )
+
+        async def send() -> dict:
+            response = await self._send(message, "select")
+            self.check_response_for_result(response, "select")
+            return response
+
+        if self.select_batcher is not None and isinstance(thing, RecordID):
+            record = await self.select_batcher.select(thing)
+        else:
+            record = (await self._single_flight("select", single_flight, send, thing)())["result"]
+        if key is not None:
+            self.record_cache.put(key, record, epoch)
+        return record
 
-    async def select(self, thing: str) -> Union[List[dict], dict]:
+    async def select_columns(self, thing: Union[str, RecordID, Table]) -> Columns:
         message = RequestMessage(
             self.id,
             RequestMethod.SELECT,
             params=[thing]
         )
-        response = await self._send(message, "select")
-        self.check_response_for_result(response, "select")
-        return response["result"]
+        return read_columns(await self._send_raw(message), "select", self.interner)
+
+    async def _select_batch(self, record_ids: List[RecordID]) -> List[dict]:
+        """
+        Selects the records of a batch of the select batcher. Batches are sent by tasks of their own that may
+        run at the same time, so the reader is started to route their responses.
+        """
+        await self.connect()
+        self._start_reader()
+        results = await self.query_many(
+            SELECT_BATCH_QUERY, {SELECT_BATCH_VARIABLE: record_ids}, raise_on_error=True
+        )
+        return results[0].result
+
+    async def _watch_table(self, table: str) -> bool:
+        """
+        Starts the live query invalidating the cached records of a table if it is not running.
+
+        :param table: The name of the table.
+        :return: Whether changes to the table are watched, records are not cached otherwise.
+        """
+        if table in self._cache_watches:
+            return True
+        await self.connect()
+        self._start_reader()
+        if self._live_lock is None:
+            self._live_lock = asyncio.Lock()
+        async with self._live_lock:
+            if table in self._cache_watches:
+                return True
+            watcher = RecordCacheWatcher(
+                self.record_cache, table, lambda closed: self._cache_watches.pop(closed, None)
+            )
+
+            def register(response: dict) -> Optional[UUID]:
+                if live_uuid(response) is None:
+                    return None
+                key = self._live_key(live_uuid(response))
+                self._live.add(key, key, watcher)
+                return key
+
+            message = RequestMessage(self.id, RequestMethod.LIVE, table=table)
+            try:
+                self._cache_watches[table] = await self._start_live(message, live_uuid, register)
+            except Exception:
+                # without a live query, for instance without the permission, the table is not cached
+                return False
+        return True
+
+    def _single_flight(
+            self, method: str, single_flight: Optional[bool], send: Callable[[], Awaitable[dict]], *args: Any
+    ) -> Callable[[], Awaitable[dict]]:
+        """
+        Returns send, or a coroutine function joining an identical request in flight if the call is coalesced.
+        """
+        if not self.single_flight.enabled(method, single_flight):
+            return send
+        key = single_flight_key(method, *args, self._query_scope)
+        return lambda: self.single_flight.do(key, send)
+
+    def _invalidate_caches(self, thing: Union[str, RecordID, Table]) -> None:
+        """
+        Drops the cached records and query results a write to thing may have changed, and stops reads in
+        flight from being joined.
+        """
+        self.single_flight.forget()
+        if self.record_cache is not None:
+            self.record_cache.invalidate_thing(thing)
+        if self.query_cache is not None:
+            self.query_cache.invalidate_thing(thing)
+
+    async def _reset_caches(self) -> None:
+        """
+        Drops every cached record and the live queries watching the cached tables, after the namespace,
+        database or authentication of the connection changed. Cached query results of the
+        previous session are no longer looked up.
+        """
+        self._query_scope = uuid.uuid4().bytes
+        if self.record_cache is None:
+            return
+        self.record_cache.clear()
+        watches, self._cache_watches = self._cache_watches, {}
+        # the watches are dropped first, so the cache does not depend on the kills, which are only best
+        # effort as the live queries may not be found in the new session
+        query_uuids = [query_uuid for query_uuid in watches.values() if self._live.remove(query_uuid) is not None]
+        for query_uuid in query_uuids:
+            await self._kill_quietly(query_uuid)
+
+    async def select_iter(
+            self,
+            table: Union[str, Table],
+            page_size: int = DEFAULT_PAGE_SIZE,
+            fields: Optional[Union[str, List[str]]] = None,
+            where: Optional[str] = None,
+            params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncGenerator[dict, None]:
+        first, after = keyset_queries(fields, where, page_size)
+        variables = keyset_variables(table, params)
+        await self.connect()
+        # the next page can only be fetched while the caller uses the connection if a reader routes the responses
+        prefetch = self._reader_task is not None
+        pending = None
+        page = check_page(await self.query(first, variables))
+        try:
+            while True:
+                next_variables = None
+                if len(page) == page_size:
+                    next_variables = {**variables, LAST_VARIABLE: page[-1]["id"]}
+                    if prefetch:
+                        pending = asyncio.ensure_future(self.query(after, next_variables))
+                for row in page:
+                    yield row
+                if next_variables is None:
+                    return
+                if pending is not None:
+                    page, pending = check_page(await pending), None
+                else:
+                    page = check_page(await self.query(after, next_variables))
+        finally:
+            if pending is not None:
+                pending.cancel()
+                await asyncio.gather(pending, return_exceptions=True)
 
     async def create(
             self,
@@ -208,6 +638,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "create")
         self.check_response_for_result(response, "create")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def update(
@@ -223,6 +654,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "update")
         self.check_response_for_result(response, "update")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def merge(
@@ -236,6 +668,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "merge")
         self.check_response_for_result(response, "merge")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def patch(
@@ -249,6 +682,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "patch")
         self.check_response_for_result(response, "patch")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def delete(
@@ -261,6 +695,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "delete")
         self.check_response_for_result(response, "delete")
+        self._invalidate_caches(thing)
         return response["result"]
 
     async def insert(
@@ -274,6 +709,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "insert")
         self.check_response_for_result(response, "insert")
+        self._invalidate_caches(table)
         return response["result"]
 
     async def insert_relation(
@@ -287,43 +723,201 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "insert_relation")
         self.check_response_for_result(response, "insert_relation")
+        self._invalidate_caches(table)
         return response["result"]
 
-    async def live(self, table: Union[str, Table], diff: bool = False) -> UUID:
-        message = RequestMessage(
-            self.id,
-            RequestMethod.LIVE,
-            table=table,
+    async def insert_many(
+            self,
+            table: Union[str, Table],
+            rows: Iterable[dict],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+            continue_on_error: bool = False,
+    ) -> InsertManyResult:
+        await self.connect()
+        if self._reader_task is None:
+            # without the background reader only one request can be on the socket at a time
+            max_in_flight = 1
+        return await insert_batches_async(
+            lambda batch: self.insert(table, batch),
+            iter_batches(rows, batch_size, max_bytes),
+            max_in_flight,
+            continue_on_error,
+        )
+
+    async def live(
+            self,
+            table: Union[str, Table],
+            diff: bool = False,
+            fields: Optional[Union[str, List[str]]] = None,
+            where: Optional[str] = None,
+            params: Optional[Dict[str, Any]] = None,
+            queue_size: Optional[int] = None,
+            overflow: Optional[Union[str, OverflowPolicy]] = None,
+            shared: bool = False,
+    ) -> UUID:
+        queue = AsyncLiveQueue(
+            self.live_queue_size if queue_size is None else queue_size,
+            self.live_overflow if overflow is None else OverflowPolicy.from_value(overflow),
         )
-        response = await self._send(message, "live")
+
+        if fields is None and where is None:
+            message = RequestMessage(
+                self.id,
+                RequestMethod.LIVE,
+                table=table,
+                diff=diff,
+            )
+            query_uuid = live_uuid
+        else:
+            # a LIVE SELECT makes the server filter and project the records instead of sending every change
+            message = RequestMessage(
+                self.id,
+                RequestMethod.QUERY,
+                query=live_select_query(fields, where, diff),
+                params=live_select_variables(table, params),
+            )
+            query_uuid = live_select_uuid
+
+        definition = live_definition(table, diff, fields, where, params) if shared else None
+        subscriber_uuid: Optional[UUID] = uuid.uuid4() if shared else None
+
+        def register(response: dict) -> Optional[UUID]:
+            # registered before the reader reads the next frame, so no notification arrives without a queue
+            if query_uuid(response) is None:
+                return None
+            key = self._live_key(query_uuid(response))
+            self._live.add(key, subscriber_uuid or key, queue, definition)
+            return subscriber_uuid or key
+
+        await self.connect()
+        self._start_reader()
+        if not shared:
+            return await self._start_live(message, query_uuid, register)
+        if self._live_lock is None:
+            self._live_lock = asyncio.Lock()
+        # holding the lock while the live query starts stops concurrent calls from starting duplicates
+        async with self._live_lock:
+            if not self._live.join(definition, subscriber_uuid, queue):
+                await self._start_live(message, query_uuid, register)
+        return subscriber_uuid
+
+    async def _start_live(
+            self,
+            message: RequestMessage,
+            query_uuid: Callable[[dict], Optional[UUID]],
+            register: Callable[[dict], Optional[UUID]],
+    ) -> UUID:
+        """
+        Starts a live query, register adding the subscriber from the reader and returning its UUID. If the call
+        is cancelled after the request is sent, the live query started on the database is killed.
+        """
+        abandoned = False
+        registered: Optional[UUID] = None
+
+        def on_response(response: dict) -> None:
+            nonlocal registered
+            registered = register(response)
+            if abandoned and registered is not None:
+                self._kill_abandoned(registered)
+
+        try:
+            response = await self._send_multiplexed(message, on_response=on_response)
+        except asyncio.CancelledError:
+            abandoned = True
+            if registered is not None:
+                # the response came in before the cancellation reached the caller
+                self._kill_abandoned(registered)
+            raise
+        self.check_response_for_error(response, "live")
         self.check_response_for_result(response, "live")
-        return response["result"]
+        if query_uuid(response) is None:
+            raise Exception(f"error live: {response['result']}")
+        return query_uuid(response)
 
-    async def subscribe_live(self, query_uuid: Union[str, UUID]) -> AsyncGenerator[dict, None]:
-        result_queue = Queue()
+    def _kill_abandoned(self, subscriber_uuid: UUID) -> None:
+        """
+        Removes a subscriber whose caller was cancelled before getting its UUID, and kills the live query on the
+        database in the background if no other subscriber shares it.
+        """
+        query_uuid = self._live.remove(subscriber_uuid)
+        if query_uuid is not None:
+            task = asyncio.get_running_loop().create_task(self._kill_quietly(query_uuid))
+            # keeps a reference so the task is not garbage collected before it is done
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _kill_quietly(self, query_uuid: UUID) -> None:
+        """
+        Kills a live query on the database, ignoring errors as nothing waits for the outcome.
+        """
+        try:
+            await self._send(RequestMessage(self.id, RequestMethod.KILL, uuid=query_uuid), "kill")
+        except Exception:
+            pass
 
-        async def listen_live():
-            """
-            Listen for live updates from the WebSocket and put them into the queue.
-            """
-            try:
-                while True:
-                    response = decode(await self.socket.recv())
-                    if response.get("result", {}).get("id") == query_uuid:
-                        await result_queue.put(response["result"]["result"])
-            except Exception as e:
-                print("Error in live subscription:", e)
-                await result_queue.put({"error": str(e)})
+    async def _subscriber_queue(self, query_uuid: Union[str, UUID]) -> AsyncLiveQueue:
+        """
+        Returns the queue of a live query started with live(), raising a ValueError for a live query the
+        connection does not track, which no notification would ever reach.
+        """
+        queue = self._live.queue(self._live_key(query_uuid))
+        if queue is None:
+            raise ValueError(f"{query_uuid} is not a live query started on this connection or it was killed")
+        return queue
 
-        asyncio.create_task(listen_live())
+    async def subscribe_live(self, query_uuid: Union[str, UUID]) -> AsyncGenerator[dict, None]:
+        queue = await self._subscriber_queue(query_uuid)
+        while True:
+            notification = await queue.get()
+            if notification is None:
+                return
+            yield notification["result"]
 
+    async def subscribe_live_batches(
+            self,
+            query_uuid: Union[str, UUID],
+            max_size: int = DEFAULT_LIVE_BATCH_SIZE,
+            window: float = DEFAULT_LIVE_BATCH_WINDOW,
+    ) -> AsyncGenerator[List[dict], None]:
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        queue = await self._subscriber_queue(query_uuid)
+        loop = asyncio.get_running_loop()
         while True:
-            result = await result_queue.get()
-            if "error" in result:
-                raise Exception(f"Error in live subscription: {result['error']}")
-            yield result
+            notification = await queue.get()
+            if notification is None:
+                return
+            # the window starts with the first notification so an idle live query does not yield empty batches
+            notifications = [notification]
+            deadline = loop.time() + window
+            while len(notifications) < max_size:
+                if not await queue.wait(deadline - loop.time()):
+                    break
+                notification = await queue.get()
+                if notification is None:
+                    break
+                notifications.append(notification)
+            batch = coalesce_notifications(notifications)
+            if batch:
+                yield batch
+
+    def live_stats(self, query_uuid: Union[str, UUID]) -> Optional[LiveQueueStats]:
+        """
+        Returns a snapshot of the queue of a live query, None if the live query has no queue.
+
+        :param query_uuid: The UUID of the live query.
+        """
+        queue = self._live.queue(self._live_key(query_uuid))
+        return None if queue is None else queue.stats()
 
     async def kill(self, query_uuid: Union[str, UUID]) -> None:
+        # closing the queue first ends the subscription
+        query_uuid = self._live.remove(self._live_key(query_uuid))
+        if query_uuid is None:
+            # other subscribers still share the live query
+            return
         message = RequestMessage(
             self.id,
             RequestMethod.KILL,
@@ -339,6 +933,7 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "signup")
         self.check_response_for_result(response, "signup")
+        await self._reset_caches()
         return response["result"]
 
     async def upsert(
@@ -352,21 +947,22 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         )
         response = await self._send(message, "upsert")
         self.check_response_for_result(response, "upsert")
+        self._invalidate_caches(thing)
         return response["result"]
 
-    def close(self):
-        self.socket.close()
+    async def close(self):
+        if self.socket is not None:
+            await self.socket.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
 
     async def __aenter__(self) -> "AsyncWsSurrealConnection":
         """
         Asynchronous context manager entry.
         Initializes a websocket connection and returns the connection instance.
         """
-        self.socket = await websockets.connect(
-            self.raw_url,
-            max_size=self.max_size,
-            subprotocols=[websockets.Subprotocol("cbor")]
-        )
+        await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback) -> None:
@@ -374,5 +970,4 @@ class AsyncWsSurrealConnection(AsyncTemplate, UtilsMixin):
         Asynchronous context manager exit.
         Closes the websocket connection upon exiting the context.
         """
-        if self.socket is not None:
-            await self.socket.close()
+        await self.close()
@@ -1,12 +1,25 @@
 import uuid
-from typing import Optional, Any, Dict, Union, List
+from typing import Optional, Any, Dict, Union, List, Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from surrealdb.connections.bulk_insert import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    InsertManyResult,
+    insert_batches,
+    iter_batches,
+)
+from surrealdb.connections.columns import Columns, read_columns
+from surrealdb.connections.query_cache import QueryCache, cached_query, query_cache_key
+from surrealdb.connections.query_result import QueryResults
 from surrealdb.connections.sync_template import SyncTemplate
 from surrealdb.connections.url import Url
 from surrealdb.connections.utils_mixin import UtilsMixin
-from surrealdb.data.cbor import decode
+from surrealdb.data.cbor import Interner, decode
 from surrealdb.data.types.record_id import RecordID
 from surrealdb.data.types.table import Table
 from surrealdb.request_message.message import RequestMessage
@@ -14,9 +27,51 @@ from surrealdb.request_message.methods import RequestMethod
 
 
 class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
+    """
+    A blocking connection to a SurrealDB instance using HTTP.
 
-    def __init__(self, url: str) -> None:
+    # Notes
+    The connection holds a keep-alive `requests.Session` with a pooled `HTTPAdapter`, so it can be shared
+    between threads and every request reuses an open TCP (and TLS) connection. The request headers are
+    built once and only rebuilt when `use`, `signin`, `signup`, `authenticate` or `invalidate` change them.
+
+    Attributes:
+        url: The URL of the database to process queries for.
+        id: The ID of the connection.
+        pool_connections: The number of host connection pools the adapter caches.
+        pool_maxsize: The maximum number of connections kept open to the host.
+        max_retries: The retry policy of the adapter, either a count or a urllib3 Retry.
+        request_timeout: The seconds a single request is allowed to take.
+        query_cache: The cache query() reads results through when asked to, None to disable caching.
+        interner: The interner shared by every response decoded, None to decode every row on its own.
+    """
+
+    def __init__(
+            self,
+            url: str,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            max_retries: Union[int, Retry] = 0,
+            request_timeout: float = 30.0,
+            query_cache: Optional[QueryCache] = None,
+            interner: Optional[Interner] = None,
+    ) -> None:
+        """
+        The constructor for the BlockingHttpSurrealConnection class.
+
+        :param url: (str) the URL of the database to process queries for.
+        :param pool_connections: (int) the number of host connection pools the adapter caches.
+        :param pool_maxsize: (int) the maximum number of connections kept open to the host.
+        :param max_retries: (Union[int, Retry]) the retry policy of the adapter. RPCs are sent with POST
+            so a Retry must list POST in its allowed methods for requests to be retried after being sent.
+        :param request_timeout: (float) the seconds a single request is allowed to take.
+        :param query_cache: (Optional[QueryCache]) the cache query(cache=True) reads results through, invalidated
+            by tag and by the connection's own writes.
+        :param interner: (Optional[Interner]) the interner shared by every response decoded, to share recurring
+            table names, map keys and record IDs between rows. None decodes every row on its own.
+        """
         self.url: Url = Url(url)
+        self.interner: Optional[Interner] = interner
         self.raw_url: str = url.rstrip("/")
         self.host: str = self.url.hostname
         self.port: Optional[int] = self.url.port
@@ -25,10 +80,25 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         self.namespace: Optional[str] = None
         self.database: Optional[str] = None
         self.vars = dict()
+        self.rpc_url: str = f"{self.url.raw_url}/rpc"
+        self.request_timeout: float = request_timeout
+        self.query_cache: Optional[QueryCache] = query_cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._headers: Dict[str, str] = dict()
+        self._build_headers()
 
-    def _send(self, message: RequestMessage, operation: str, bypass: bool = False) -> Dict[str, Any]:
-        data = message.WS_CBOR_DESCRIPTOR
-        url = f"{self.url.raw_url}/rpc"
+    def _build_headers(self) -> None:
+        """
+        Rebuilds the headers sent with every request. A new dict is swapped in rather than mutating
+        the current one, so threads sending requests at the same time never see a half built dict.
+        """
         headers = {
             "Accept": "application/cbor",
             "Content-Type": "application/cbor",
@@ -39,17 +109,39 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
             headers["Surreal-NS"] = self.namespace
         if self.database:
             headers["Surreal-DB"] = self.database
+        self._headers = headers
 
-        response = requests.post(url, headers=headers, data=data, timeout=30)
-        response.raise_for_status()
-        raw_cbor = response.content
-        data = decode(raw_cbor)
+    def _send(
+            self, message: RequestMessage, operation: str, bypass: bool = False, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        data = decode(self._send_raw(message, timeout), self.interner)
         if bypass is False:
             self.check_response_for_error(data, operation)
         return data
 
+    def _send_raw(self, message: RequestMessage, timeout: Optional[float] = None) -> bytes:
+        response = self.session.post(
+            self.rpc_url,
+            headers=self._headers,
+            data=message.WS_CBOR_DESCRIPTOR,
+            timeout=self.request_timeout if timeout is None else timeout,
+        )
+        response.raise_for_status()
+        return response.content
+
     def set_token(self, token: str) -> None:
         self.token = token
+        self._build_headers()
+
+    def authenticate(self, token: str) -> dict:
+        message = RequestMessage(
+            self.id,
+            RequestMethod.AUTHENTICATE,
+            token=token
+        )
+        response = self._send(message, "authenticating")
+        self.set_token(token)
+        return response
 
     def signin(self, vars: dict) -> dict:
         message = RequestMessage(
@@ -65,6 +157,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         response = self._send(message, "signing in")
         self.check_response_for_result(response, "signing in")
         self.token = response["result"]
+        self._build_headers()
         package = dict()
         package["token"] = self.token
         return package
@@ -79,8 +172,16 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         data = self._send(message, "use")
         self.namespace = namespace
         self.database = database
+        self._build_headers()
 
-    def query(self, query: str, params: Optional[dict] = None) -> dict:
+    def query(
+            self,
+            query: str,
+            params: Optional[dict] = None,
+            cache: bool = False,
+            ttl: Optional[float] = None,
+            tags: Iterable[str] = (),
+    ) -> dict:
         if params is None:
             params = {}
         for key, value in self.vars.items():
@@ -91,10 +192,32 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
             query=query,
             params=params,
         )
-        response = self._send(message, "query")
-        self.check_response_for_result(response, "query")
+
+        def fetch() -> dict:
+            response = self._send(message, "query")
+            self.check_response_for_result(response, "query")
+            return response
+
+        if cache and self.query_cache is not None:
+            # the whole session state is sent with every request, so it keys the result with the params
+            return cached_query(
+                self.query_cache,
+                query_cache_key(query, params, [self.namespace, self.database, self.token]),
+                fetch,
+                ttl,
+                tags,
+                background=True,
+            )
+        response = fetch()
         return response["result"][0]["result"]
 
+    def _invalidate_caches(self, thing: Union[str, RecordID, Table]) -> None:
+        """
+        Drops the cached query results a write to thing may have changed.
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate_thing(thing)
+
     def query_raw(self, query: str, params: Optional[dict] = None) -> dict:
         if params is None:
             params = {}
@@ -109,6 +232,37 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         response = self._send(message, "query", bypass=True)
         return response
 
+    def query_columns(self, query: str, params: Optional[dict] = None, statement: int = 0) -> Columns:
+        params = dict(params) if params else {}
+        for key, value in self.vars.items():
+            params[key] = value
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        return read_columns(self._send_raw(message), "query", self.interner, statement)
+
+    def query_many(
+            self, query: str, params: Optional[dict] = None, raise_on_error: bool = False
+    ) -> QueryResults:
+        params = dict(params) if params else {}
+        for key, value in self.vars.items():
+            params[key] = value
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        response = self._send(message, "query")
+        self.check_response_for_result(response, "query")
+        results = QueryResults.from_response(response["result"])
+        if raise_on_error:
+            results.raise_for_errors()
+        return results
+
     def create(
             self,
             thing: Union[str, RecordID, Table],
@@ -126,6 +280,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "create")
         self.check_response_for_result(response, "create")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def delete(
@@ -138,6 +293,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "delete")
         self.check_response_for_result(response, "delete")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def info(self):
@@ -160,6 +316,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "insert")
         self.check_response_for_result(response, "insert")
+        self._invalidate_caches(table)
         return response["result"]
 
     def insert_relation(
@@ -173,12 +330,30 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "insert_relation")
         self.check_response_for_result(response, "insert_relation")
+        self._invalidate_caches(table)
         return response["result"]
 
+    def insert_many(
+            self,
+            table: Union[str, Table],
+            rows: Iterable[dict],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+            continue_on_error: bool = False,
+    ) -> InsertManyResult:
+        return insert_batches(
+            lambda batch: self.insert(table, batch),
+            iter_batches(rows, batch_size, max_bytes),
+            max_in_flight,
+            continue_on_error,
+        )
+
     def invalidate(self) -> None:
         message = RequestMessage(self.id, RequestMethod.INVALIDATE)
         self._send(message, "invalidating")
         self.token = None
+        self._build_headers()
 
     def let(self, key: str, value: Any) -> None:
         self.vars[key] = value
@@ -197,6 +372,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "merge")
         self.check_response_for_result(response, "merge")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def patch(
@@ -210,8 +386,17 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "patch")
         self.check_response_for_result(response, "patch")
+        self._invalidate_caches(thing)
         return response["result"]
 
+    def select_columns(self, thing: Union[str, RecordID, Table]) -> Columns:
+        message = RequestMessage(
+            self.id,
+            RequestMethod.SELECT,
+            params=[thing]
+        )
+        return read_columns(self._send_raw(message), "select", self.interner)
+
     def select(self, thing: str) -> Union[List[dict], dict]:
         message = RequestMessage(
             self.id,
@@ -235,6 +420,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "update")
         self.check_response_for_result(response, "update")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def version(self) -> str:
@@ -246,6 +432,16 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         self.check_response_for_result(response, "getting database version")
         return response["result"]
 
+    def _health_check(self, timeout: float) -> None:
+        """
+        Gets the database version, raising a requests Timeout if the response takes longer than timeout.
+
+        :param timeout: (float) the seconds to wait for the response.
+        """
+        message = RequestMessage(self.id, RequestMethod.VERSION)
+        response = self._send(message, "getting database version", timeout=timeout)
+        self.check_response_for_result(response, "getting database version")
+
     def upsert(
             self, thing: Union[str, RecordID, Table], data: Optional[Dict] = None
     ) -> Union[List[dict], dict]:
@@ -257,6 +453,7 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "upsert")
         self.check_response_for_result(response, "upsert")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def signup(self, vars: Dict) -> str:
@@ -268,14 +465,17 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         response = self._send(message, "signup")
         self.check_response_for_result(response, "signup")
         self.token = response["result"]
+        self._build_headers()
         return response["result"]
 
+    def close(self) -> None:
+        self.session.close()
+
     def __enter__(self) -> "BlockingHttpSurrealConnection":
         """
         Synchronous context manager entry.
-        Initializes a session for HTTP requests.
+        Returns the connection instance, the session for HTTP requests is opened on construction.
         """
-        self.session = requests.Session()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
@@ -283,5 +483,4 @@ class BlockingHttpSurrealConnection(SyncTemplate, UtilsMixin):
         Synchronous context manager exit.
         Closes the HTTP session upon exiting the context.
         """
-        if hasattr(self, "session"):
-            self.session.close()
+        self.close()
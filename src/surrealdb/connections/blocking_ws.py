@@ -1,17 +1,59 @@
 """
 A basic blocking connection to a SurrealDB instance.
 """
+import itertools
+import threading
+import time
 import uuid
-from typing import Optional, Any, Dict, Union, List, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Any, Dict, Union, List, Generator, Iterable, Callable, Tuple, Set
 from uuid import UUID
 
 import websockets
 import websockets.sync.client as ws_sync
 
+from surrealdb.connections.bulk_insert import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    InsertManyResult,
+    insert_batches,
+    iter_batches,
+)
+from surrealdb.connections.columns import Columns, frame_id, read_columns
+from surrealdb.connections.live import (
+    DEFAULT_LIVE_BATCH_SIZE,
+    DEFAULT_LIVE_BATCH_WINDOW,
+    DEFAULT_LIVE_QUEUE_SIZE,
+    BlockingLiveQueue,
+    LiveQueueStats,
+    LiveRegistry,
+    OverflowPolicy,
+    coalesce_notifications,
+    live_definition,
+    live_select_query,
+    live_select_uuid,
+    live_select_variables,
+    live_uuid,
+)
+from surrealdb.connections.pagination import (
+    DEFAULT_PAGE_SIZE,
+    LAST_VARIABLE,
+    check_page,
+    keyset_queries,
+    keyset_variables,
+)
+from surrealdb.connections.query_result import QueryResults
+from surrealdb.connections.query_cache import QueryCache, cached_query, query_cache_key
+from surrealdb.connections.record_cache import (
+    RecordCacheWatcher,
+    RecordCache,
+    record_cache_key,
+)
 from surrealdb.connections.sync_template import SyncTemplate
 from surrealdb.connections.url import Url
 from surrealdb.connections.utils_mixin import UtilsMixin
-from surrealdb.data.cbor import decode
+from surrealdb.data.cbor import Interner, decode
 from surrealdb.data.types.record_id import RecordID
 from surrealdb.data.types.table import Table
 from surrealdb.request_message.message import RequestMessage
@@ -26,6 +68,17 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
     A new connection is created for each query. This is because the WebSocket connection is
     dropped after the query is completed.
 
+    If the connection is created with `multiplex=True` every request gets its own ID and a single
+    reader thread routes responses back to the threads waiting on them. This makes the connection
+    safe to share between threads, with many requests in flight on the same socket.
+
+    Live queries always use the reader thread, which is started by `live()` if needed. The reader
+    routes every notification to a bounded queue per live query, applying `live_overflow` when a
+    subscriber falls behind and the queue holds `live_queue_size` notifications. The reader never waits
+    for a subscriber, so a slow subscriber does not hold up the responses to other requests. Live queries started
+    with `shared=True` and the same definition share one live query on the database, each call getting
+    its own UUID and queue, and the live query is killed on the database with its last subscriber.
+
     Attributes:
         url: The URL of the database to process queries for.
         user: The username to login on.
@@ -34,16 +87,44 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         database: The database that the connection will stick to.
         max_size: The maximum size of the connection.
         id: The ID of the connection.
+        multiplex: Whether requests are multiplexed over the socket by a reader thread.
+        live_queue_size: The default maximum number of notifications queued per live query.
+        live_overflow: The default policy applied to a notification for a live query whose queue is full.
+        record_cache: The cache select() reads single records through, None to disable caching.
+        query_cache: The cache query() reads results through when asked to, None to disable caching.
+        interner: The interner shared by every response decoded, None to decode every row on its own.
     """
 
-    def __init__(self, url: str, max_size: int = 2 ** 20) -> None:
+    def __init__(
+            self,
+            url: str,
+            max_size: int = 2 ** 20,
+            multiplex: bool = False,
+            live_queue_size: int = DEFAULT_LIVE_QUEUE_SIZE,
+            live_overflow: Union[str, OverflowPolicy] = OverflowPolicy.DROP_OLDEST,
+            record_cache: Optional[RecordCache] = None,
+            query_cache: Optional[QueryCache] = None,
+            interner: Optional[Interner] = None,
+    ) -> None:
         """
         The constructor for the BlockingWsSurrealConnection class.
 
         :param url: (str) the URL of the database to process queries for.
         :param max_size: (int) The maximum size of the connection.
+        :param multiplex: (bool) Whether to share the socket between threads using a reader thread.
+        :param live_queue_size: (int) The default maximum number of notifications queued per live query.
+        :param live_overflow: (Union[str, OverflowPolicy]) The default policy for a full live query queue,
+            "drop_oldest", "coalesce" or "block", which keeps the notifications that do not fit in a growing
+            backlog.
+        :param record_cache: (Optional[RecordCache]) The cache select() reads single records through, kept up to
+            date by a live query per cached table and by the connection's own writes.
+        :param query_cache: (Optional[QueryCache]) The cache query(cache=True) reads results through, invalidated
+            by tag and by the connection's own writes.
+        :param interner: (Optional[Interner]) the interner shared by every response decoded, to share recurring
+            table names, map keys and record IDs between rows. None decodes every row on its own.
         """
         self.url: Url = Url(url)
+        self.interner: Optional[Interner] = interner
         self.raw_url: str = f"{self.url.raw_url}/rpc"
         self.host: str = self.url.hostname
         self.port: int = self.url.port
@@ -51,20 +132,172 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         self.id: str = str(uuid.uuid4())
         self.token: Optional[str] = None
         self.socket = None
-
-    def _send(self, message: RequestMessage, process: str, bypass: bool = False) -> dict:
-        if self.socket is None:
-            self.socket = ws_sync.connect(
-                self.raw_url,
-                max_size=self.max_size,
-                subprotocols=[websockets.Subprotocol("cbor")],
-            )
-        self.socket.send(message.WS_CBOR_DESCRIPTOR)
-        response = decode(self.socket.recv())
+        self.multiplex: bool = multiplex
+        self._request_ids = itertools.count(1)
+        self.live_queue_size: int = live_queue_size
+        self.live_overflow: OverflowPolicy = OverflowPolicy.from_value(live_overflow)
+        self._pending: Dict[str, Tuple[Future, Optional[Callable[[dict], None]]]] = {}
+        # the requests whose response frame is handed over undecoded, to be decoded into columns
+        self._raw_requests: Set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._live_lock = threading.Lock()
+        self._live = LiveRegistry()
+        self.record_cache: Optional[RecordCache] = record_cache
+        self._cache_watches: Dict[str, UUID] = {}
+        self.query_cache: Optional[QueryCache] = query_cache
+        # the session state, variables included, lives on the server so cached results are keyed by session
+        self._query_scope: bytes = uuid.uuid4().bytes
+        self._reader_thread: Optional[threading.Thread] = None
+        self._reader_error: Optional[Exception] = None
+
+    def _connect(self) -> None:
+        if self.socket is not None:
+            return
+        with self._connect_lock:
+            if self.socket is None:
+                self.socket = ws_sync.connect(
+                    self.raw_url,
+                    max_size=self.max_size,
+                    subprotocols=[websockets.Subprotocol("cbor")],
+                )
+                if self.multiplex is True:
+                    self._start_reader()
+
+    def _send(
+            self, message: RequestMessage, process: str, bypass: bool = False, timeout: Optional[float] = None
+    ) -> dict:
+        self._connect()
+        if self._reader_thread is not None:
+            response = self._send_multiplexed(message, timeout=timeout)
+        else:
+            self.socket.send(message.WS_CBOR_DESCRIPTOR)
+            response = decode(self.socket.recv(timeout), self.interner)
         if bypass is False:
             self.check_response_for_error(response, process)
         return response
 
+    def _send_raw(self, message: RequestMessage) -> bytes:
+        """
+        Sends a message and returns the response frame without decoding it.
+        """
+        self._connect()
+        if self._reader_thread is not None:
+            return self._send_multiplexed(message, raw=True)
+        self.socket.send(message.WS_CBOR_DESCRIPTOR)
+        return self.socket.recv()
+
+    def _send_multiplexed(
+            self,
+            message: RequestMessage,
+            on_response: Optional[Callable[[dict], None]] = None,
+            raw: bool = False,
+            timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Sends a message with a unique request ID and blocks until the reader thread routes the response back.
+
+        :param message: (RequestMessage) the message to send.
+        :param on_response: (Optional[Callable[[dict], None]]) called by the reader thread with the response
+            before it reads the next frame, even if the caller stopped waiting for it.
+        :param raw: (bool) whether the reader thread hands the response frame over without decoding it, so it
+            is decoded by the calling thread.
+        :param timeout: (Optional[float]) the seconds to wait for the response before raising a TimeoutError,
+            None waits forever.
+        :return: (Any) the decoded response for the message, or the response frame if raw.
+        """
+        request_id = str(next(self._request_ids))
+        message.id = request_id
+        future = Future()
+        with self._pending_lock:
+            if self._reader_error is not None:
+                raise ConnectionError(f"the websocket reader has stopped: {self._reader_error}")
+            self._pending[request_id] = (future, on_response)
+            if raw:
+                self._raw_requests.add(request_id)
+        sent = False
+        try:
+            with self._send_lock:
+                self.socket.send(message.WS_CBOR_DESCRIPTOR)
+            sent = True
+            return future.result(timeout)
+        finally:
+            with self._pending_lock:
+                # a request with on_response stays pending if the caller stopped waiting, for instance on a
+                # KeyboardInterrupt, so the reader thread still hands it the response
+                if on_response is None or not sent or future.done():
+                    self._pending.pop(request_id, None)
+                self._raw_requests.discard(request_id)
+
+    def _start_reader(self) -> None:
+        if self._reader_thread is None:
+            self._reader_error = None
+            self._reader_thread = threading.Thread(
+                target=self._read_loop, name=f"surrealdb-reader-{self.id}", daemon=True
+            )
+            self._reader_thread.start()
+
+    def _read_loop(self) -> None:
+        """
+        Reads every frame from the socket, resolving the future of the request it answers or
+        putting it on the queue of the live query it belongs to.
+        """
+        error: Exception = ConnectionError("the websocket connection was closed")
+        try:
+            for raw in self.socket:
+                if self._raw_requests and self._dispatch_raw(raw):
+                    continue
+                self._dispatch(decode(raw, self.interner))
+        except Exception as e:
+            error = e
+        finally:
+            with self._pending_lock:
+                self._reader_error = error
+                for future, _ in self._pending.values():
+                    if not future.done():
+                        future.set_exception(error)
+                self._pending.clear()
+            self._live.close(error)
+
+    def _dispatch_raw(self, raw: bytes) -> bool:
+        """
+        Resolves the future of a request waiting for its response frame undecoded with the frame.
+
+        :param raw: (bytes) the response frame.
+        :return: (bool) whether the frame answered such a request.
+        """
+        request_id = frame_id(raw)
+        with self._pending_lock:
+            if request_id not in self._raw_requests:
+                return False
+            future, _ = self._pending[request_id]
+        if not future.done():
+            future.set_result(raw)
+        return True
+
+    def _dispatch(self, response: dict) -> None:
+        with self._pending_lock:
+            pending = self._pending.pop(response.get("id"), None)
+        if pending is not None:
+            future, on_response = pending
+            if on_response is not None:
+                # called even if the caller stopped waiting, so a live query it started is not lost
+                on_response(response)
+            if not future.done():
+                future.set_result(response)
+            return
+        result = response.get("result")
+        if isinstance(result, dict) and result.get("id") is not None:
+            # the queues never wait, so a slow subscriber does not hold up the responses to other requests
+            self._live.dispatch(self._live_key(result["id"]), result)
+
+    @staticmethod
+    def _live_key(query_uuid: Union[str, UUID]) -> UUID:
+        if isinstance(query_uuid, UUID):
+            return query_uuid
+        return UUID(str(query_uuid))
+
     def signin(self, vars: Dict[str, Any]) -> str:
         message = RequestMessage(
             self.id,
@@ -82,8 +315,16 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         if response.get("id") is None:
             raise Exception(f"No ID signing in: {response}")
         self.id = response["id"]
+        self._reset_caches()
 
-    def query(self, query: str, params: Optional[dict] = None) -> dict:
+    def query(
+            self,
+            query: str,
+            params: Optional[dict] = None,
+            cache: bool = False,
+            ttl: Optional[float] = None,
+            tags: Iterable[str] = (),
+    ) -> dict:
         if params is None:
             params = {}
         message = RequestMessage(
@@ -92,8 +333,23 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
             query=query,
             params=params,
         )
-        response = self._send(message, "query")
-        self.check_response_for_result(response, "query")
+
+        def fetch() -> dict:
+            response = self._send(message, "query")
+            self.check_response_for_result(response, "query")
+            return response
+
+        if cache and self.query_cache is not None:
+            # a stale result is only refreshed from another thread when the reader thread shares the socket
+            return cached_query(
+                self.query_cache,
+                query_cache_key(query, params, self._query_scope),
+                fetch,
+                ttl,
+                tags,
+                background=self._reader_thread is not None,
+            )
+        response = fetch()
         return response["result"][0]["result"]
 
     def query_raw(self, query: str, params: Optional[dict] = None) -> dict:
@@ -108,6 +364,34 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         response = self._send(message, "query", bypass=True)
         return response
 
+    def query_many(
+            self, query: str, params: Optional[dict] = None, raise_on_error: bool = False
+    ) -> QueryResults:
+        params = dict(params) if params else {}
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        response = self._send(message, "query")
+        self.check_response_for_result(response, "query")
+        results = QueryResults.from_response(response["result"])
+        if raise_on_error:
+            results.raise_for_errors()
+        return results
+
+    def query_columns(self, query: str, params: Optional[dict] = None, statement: int = 0) -> Columns:
+        if params is None:
+            params = {}
+        message = RequestMessage(
+            self.id,
+            RequestMethod.QUERY,
+            query=query,
+            params=params,
+        )
+        return read_columns(self._send_raw(message), "query", self.interner, statement)
+
     def use(self, namespace: str, database: str) -> None:
         message = RequestMessage(
             self.id,
@@ -116,6 +400,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
             database=database,
         )
         self._send(message, "use")
+        self._reset_caches()
 
     def info(self) -> dict:
         message = RequestMessage(
@@ -135,17 +420,31 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         self.check_response_for_result(response, "getting database version")
         return response["result"]
 
+    def _health_check(self, timeout: float) -> None:
+        """
+        Gets the database version, raising a TimeoutError if the response takes longer than timeout. The
+        connection should be closed after a timeout, as the late response would answer the next request.
+
+        :param timeout: (float) the seconds to wait for the response.
+        """
+        message = RequestMessage(self.id, RequestMethod.VERSION)
+        response = self._send(message, "getting database version", timeout=timeout)
+        self.check_response_for_result(response, "getting database version")
+
     def authenticate(self, token: str) -> dict:
         message = RequestMessage(
             self.id,
             RequestMethod.AUTHENTICATE,
             token=token
         )
-        return self._send(message, "authenticating")
+        response = self._send(message, "authenticating")
+        self._reset_caches()
+        return response
 
     def invalidate(self) -> None:
         message = RequestMessage(self.id, RequestMethod.INVALIDATE)
         self._send(message, "invalidating")
+        self._reset_caches()
 
     def let(self, key: str, value: Any) -> None:
         message = RequestMessage(
@@ -155,6 +454,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
             value=value
         )
         self._send(message, "letting")
+        self._query_scope = uuid.uuid4().bytes
 
     def unset(self, key: str) -> None:
         message = RequestMessage(
@@ -163,8 +463,17 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
             params=[key]
         )
         self._send(message, "unsetting")
+        self._query_scope = uuid.uuid4().bytes
 
     def select(self, thing: str) -> Union[List[dict], dict]:
+        key = record_cache_key(thing) if self.record_cache is not None else None
+        if key is not None:
+            cached, record = self.record_cache.get(key)
+            if cached:
+                return record
+            if not self._watch_table(key[0]):
+                key = None
+            epoch = self.record_cache.epoch
         message = RequestMessage(
             self.id,
             RequestMethod.SELECT,
@@ -172,8 +481,112 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "select")
         self.check_response_for_result(response, "select")
+        if key is not None:
+            self.record_cache.put(key, response["result"], epoch)
         return response["result"]
 
+    def select_columns(self, thing: Union[str, RecordID, Table]) -> Columns:
+        message = RequestMessage(
+            self.id,
+            RequestMethod.SELECT,
+            params=[thing]
+        )
+        return read_columns(self._send_raw(message), "select", self.interner)
+
+    def _watch_table(self, table: str) -> bool:
+        """
+        Starts the live query invalidating the cached records of a table if it is not running.
+
+        :param table: (str) the name of the table.
+        :return: (bool) whether changes to the table are watched, records are not cached otherwise.
+        """
+        if table in self._cache_watches:
+            return True
+        self._connect()
+        with self._connect_lock:
+            self._start_reader()
+        with self._live_lock:
+            if table in self._cache_watches:
+                return True
+            watcher = RecordCacheWatcher(
+                self.record_cache, table, lambda closed: self._cache_watches.pop(closed, None)
+            )
+
+            def register(response: dict) -> Optional[UUID]:
+                if live_uuid(response) is None:
+                    return None
+                key = self._live_key(live_uuid(response))
+                self._live.add(key, key, watcher)
+                return key
+
+            message = RequestMessage(self.id, RequestMethod.LIVE, table=table)
+            try:
+                self._cache_watches[table] = self._start_live(message, live_uuid, register)
+            except Exception:
+                # without a live query, for instance without the permission, the table is not cached
+                return False
+        return True
+
+    def _invalidate_caches(self, thing: Union[str, RecordID, Table]) -> None:
+        """
+        Drops the cached records and query results a write to thing may have changed.
+        """
+        if self.record_cache is not None:
+            self.record_cache.invalidate_thing(thing)
+        if self.query_cache is not None:
+            self.query_cache.invalidate_thing(thing)
+
+    def _reset_caches(self) -> None:
+        """
+        Drops every cached record and the live queries watching the cached tables, after the namespace,
+        database or authentication of the connection changed. Cached query results of the
+        previous session are no longer looked up.
+        """
+        self._query_scope = uuid.uuid4().bytes
+        if self.record_cache is None:
+            return
+        self.record_cache.clear()
+        watches, self._cache_watches = self._cache_watches, {}
+        # the watches are dropped first, so the cache does not depend on the kills, which are only best
+        # effort as the live queries may not be found in the new session
+        query_uuids = [query_uuid for query_uuid in watches.values() if self._live.remove(query_uuid) is not None]
+        for query_uuid in query_uuids:
+            self._kill_quietly(query_uuid)
+
+    def select_iter(
+            self,
+            table: Union[str, Table],
+            page_size: int = DEFAULT_PAGE_SIZE,
+            fields: Optional[Union[str, List[str]]] = None,
+            where: Optional[str] = None,
+            params: Optional[Dict[str, Any]] = None,
+    ) -> Generator[dict, None, None]:
+        first, after = keyset_queries(fields, where, page_size)
+        variables = keyset_variables(table, params)
+        self._connect()
+        # the next page can only be fetched while the caller uses the connection if a reader routes the responses
+        executor = ThreadPoolExecutor(max_workers=1) if self._reader_thread is not None else None
+        pending: Optional[Future] = None
+        page = check_page(self.query(first, variables))
+        try:
+            while True:
+                next_variables = None
+                if len(page) == page_size:
+                    next_variables = {**variables, LAST_VARIABLE: page[-1]["id"]}
+                    if executor is not None:
+                        pending = executor.submit(self.query, after, next_variables)
+                for row in page:
+                    yield row
+                if next_variables is None:
+                    return
+                if pending is not None:
+                    page, pending = check_page(pending.result()), None
+                else:
+                    page = check_page(self.query(after, next_variables))
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
     def create(
             self,
             thing: Union[str, RecordID, Table],
@@ -191,19 +604,141 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "create")
         self.check_response_for_result(response, "create")
+        self._invalidate_caches(thing)
         return response["result"]
 
-    def live(self, table: Union[str, Table], diff: bool = False) -> UUID:
-        message = RequestMessage(
-            self.id,
-            RequestMethod.LIVE,
-            table=table,
+    def live(
+            self,
+            table: Union[str, Table],
+            diff: bool = False,
+            fields: Optional[Union[str, List[str]]] = None,
+            where: Optional[str] = None,
+            params: Optional[Dict[str, Any]] = None,
+            queue_size: Optional[int] = None,
+            overflow: Optional[Union[str, OverflowPolicy]] = None,
+            shared: bool = False,
+    ) -> UUID:
+        live_queue = BlockingLiveQueue(
+            self.live_queue_size if queue_size is None else queue_size,
+            self.live_overflow if overflow is None else OverflowPolicy.from_value(overflow),
         )
-        response = self._send(message, "live")
+
+        if fields is None and where is None:
+            message = RequestMessage(
+                self.id,
+                RequestMethod.LIVE,
+                table=table,
+                diff=diff,
+            )
+            query_uuid = live_uuid
+        else:
+            # a LIVE SELECT makes the server filter and project the records instead of sending every change
+            message = RequestMessage(
+                self.id,
+                RequestMethod.QUERY,
+                query=live_select_query(fields, where, diff),
+                params=live_select_variables(table, params),
+            )
+            query_uuid = live_select_uuid
+
+        definition = live_definition(table, diff, fields, where, params) if shared else None
+        subscriber_uuid: Optional[UUID] = uuid.uuid4() if shared else None
+
+        def register(response: dict) -> Optional[UUID]:
+            # registered before the reader reads the next frame, so no notification arrives without a queue
+            if query_uuid(response) is None:
+                return None
+            key = self._live_key(query_uuid(response))
+            self._live.add(key, subscriber_uuid or key, live_queue, definition)
+            return subscriber_uuid or key
+
+        self._connect()
+        with self._connect_lock:
+            self._start_reader()
+        if not shared:
+            return self._start_live(message, query_uuid, register)
+        # holding the lock while the live query starts stops concurrent calls from starting duplicates
+        with self._live_lock:
+            if not self._live.join(definition, subscriber_uuid, live_queue):
+                self._start_live(message, query_uuid, register)
+        return subscriber_uuid
+
+    def _start_live(
+            self,
+            message: RequestMessage,
+            query_uuid: Callable[[dict], Optional[UUID]],
+            register: Callable[[dict], Optional[UUID]],
+    ) -> UUID:
+        """
+        Starts a live query, register adding the subscriber from the reader thread and returning its UUID. If
+        the caller stops waiting after the request is sent, the live query started on the database is killed.
+        """
+        lock = threading.Lock()
+        abandoned = False
+        registered: Optional[UUID] = None
+
+        def on_response(response: dict) -> None:
+            nonlocal registered
+            subscriber = register(response)
+            with lock:
+                registered = subscriber
+                kill = abandoned
+            if kill and subscriber is not None:
+                self._kill_abandoned(subscriber)
+
+        try:
+            response = self._send_multiplexed(message, on_response=on_response)
+        except BaseException:
+            with lock:
+                abandoned = True
+                subscriber = registered
+            if subscriber is not None:
+                # the response came in before the caller stopped waiting
+                self._kill_abandoned(subscriber)
+            raise
+        self.check_response_for_error(response, "live")
         self.check_response_for_result(response, "live")
-        return response["result"]
+        if query_uuid(response) is None:
+            raise Exception(f"error live: {response['result']}")
+        return query_uuid(response)
+
+    def _kill_abandoned(self, subscriber_uuid: UUID) -> None:
+        """
+        Removes a subscriber whose caller stopped waiting before getting its UUID, and kills the live query on
+        the database from another thread if no other subscriber shares it, as the reader thread can't wait.
+
+        :param subscriber_uuid: (UUID) the UUID of the subscriber.
+        """
+        query_uuid = self._live.remove(subscriber_uuid)
+        if query_uuid is not None:
+            threading.Thread(target=self._kill_quietly, args=(query_uuid,), daemon=True).start()
+
+    def _kill_quietly(self, query_uuid: UUID) -> None:
+        """
+        Kills a live query on the database, ignoring errors as nothing waits for the outcome.
+
+        :param query_uuid: (UUID) the UUID of the live query on the database.
+        """
+        try:
+            self._send(RequestMessage(self.id, RequestMethod.KILL, uuid=query_uuid), "kill")
+        except Exception:
+            pass
+
+    def live_stats(self, query_uuid: Union[str, UUID]) -> Optional[LiveQueueStats]:
+        """
+        Returns a snapshot of the queue of a live query, None if the live query has no queue.
+
+        :param query_uuid: (Union[str, UUID]) the UUID of the live query.
+        """
+        live_queue = self._live.queue(self._live_key(query_uuid))
+        return None if live_queue is None else live_queue.stats()
 
     def kill(self, query_uuid: Union[str, UUID]) -> None:
+        # closing the queue first ends the subscription
+        query_uuid = self._live.remove(self._live_key(query_uuid))
+        if query_uuid is None:
+            # other subscribers still share the live query
+            return
         message = RequestMessage(
             self.id,
             RequestMethod.KILL,
@@ -221,6 +756,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "delete")
         self.check_response_for_result(response, "delete")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def insert(
@@ -234,6 +770,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "insert")
         self.check_response_for_result(response, "insert")
+        self._invalidate_caches(table)
         return response["result"]
 
     def insert_relation(
@@ -247,8 +784,29 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "insert_relation")
         self.check_response_for_result(response, "insert_relation")
+        self._invalidate_caches(table)
         return response["result"]
 
+    def insert_many(
+            self,
+            table: Union[str, Table],
+            rows: Iterable[dict],
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_bytes: int = DEFAULT_MAX_BYTES,
+            max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+            continue_on_error: bool = False,
+    ) -> InsertManyResult:
+        self._connect()
+        if self._reader_thread is None:
+            # without the background reader only one request can be on the socket at a time
+            max_in_flight = 1
+        return insert_batches(
+            lambda batch: self.insert(table, batch),
+            iter_batches(rows, batch_size, max_bytes),
+            max_in_flight,
+            continue_on_error,
+        )
+
     def merge(
             self, thing: Union[str, RecordID, Table], data: Optional[Dict] = None
     ) -> Union[List[dict], dict]:
@@ -260,6 +818,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "merge")
         self.check_response_for_result(response, "merge")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def patch(
@@ -273,6 +832,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "patch")
         self.check_response_for_result(response, "patch")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def subscribe_live(self, query_uuid: Union[str, UUID]) -> Generator[dict, None, None]:
@@ -284,23 +844,57 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
 
         Yields:
             dict: The results of live updates.
+
+        Raises:
+            ValueError: If the UUID is not a live query started with live() on this connection, or it was killed.
         """
-        try:
-            while True:
-                try:
-                    # Receive a message from the WebSocket
-                    response = decode(self.socket.recv())
-
-                    # Check if the response matches the query UUID
-                    if response.get("result", {}).get("id") == query_uuid:
-                        yield response["result"]["result"]
-                except Exception as e:
-                    # Handle WebSocket or decoding errors
-                    print("Error in live subscription:", e)
-                    yield {"error": str(e)}
-        except GeneratorExit:
-            # Handle generator exit gracefully if needed
-            pass
+        live_queue = self._subscriber_queue(query_uuid)
+        while True:
+            notification = live_queue.get()
+            if notification is None:
+                return
+            yield notification["result"]
+
+    def subscribe_live_batches(
+            self,
+            query_uuid: Union[str, UUID],
+            max_size: int = DEFAULT_LIVE_BATCH_SIZE,
+            window: float = DEFAULT_LIVE_BATCH_WINDOW,
+    ) -> Generator[List[dict], None, None]:
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        live_queue = self._subscriber_queue(query_uuid)
+        while True:
+            notification = live_queue.get()
+            if notification is None:
+                return
+            # the window starts with the first notification so an idle live query does not yield empty batches
+            notifications = [notification]
+            deadline = time.monotonic() + window
+            while len(notifications) < max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                notification = live_queue.get(timeout=remaining)
+                if notification is None:
+                    break
+                notifications.append(notification)
+            batch = coalesce_notifications(notifications)
+            if batch:
+                yield batch
+
+    def _subscriber_queue(self, query_uuid: Union[str, UUID]) -> BlockingLiveQueue:
+        """
+        Returns the queue of a live query started with live(), raising a ValueError for a live query the
+        connection does not track, which no notification would ever reach.
+
+        :param query_uuid: (Union[str, UUID]) the UUID returned by live().
+        :return: (BlockingLiveQueue) the queue of the live query.
+        """
+        queue = self._live.queue(self._live_key(query_uuid))
+        if queue is None:
+            raise ValueError(f"{query_uuid} is not a live query started on this connection or it was killed")
+        return queue
 
     def update(
             self,
@@ -315,6 +909,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "update")
         self.check_response_for_result(response, "update")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def upsert(
@@ -330,6 +925,7 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "upsert")
         self.check_response_for_result(response, "upsert")
+        self._invalidate_caches(thing)
         return response["result"]
 
     def signup(self, vars: Dict) -> str:
@@ -340,21 +936,23 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         )
         response = self._send(message, "signup")
         self.check_response_for_result(response, "signup")
+        self._reset_caches()
         return response["result"]
 
     def close(self):
-        self.socket.close()
+        if self.socket is not None:
+            self.socket.close()
+        if self._reader_thread is not None:
+            if self._reader_thread is not threading.current_thread():
+                self._reader_thread.join()
+            self._reader_thread = None
 
     def __enter__(self) -> "BlockingWsSurrealConnection":
         """
         Synchronous context manager entry.
         Initializes a websocket connection and returns the connection instance.
         """
-        self.socket = ws_sync.connect(
-            self.raw_url,
-            max_size=self.max_size,
-            subprotocols=[websockets.Subprotocol("cbor")]
-        )
+        self._connect()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
@@ -362,6 +960,5 @@ class BlockingWsSurrealConnection(SyncTemplate, UtilsMixin):
         Synchronous context manager exit.
         Closes the websocket connection upon exiting the context.
         """
-        if self.socket is not None:
-            self.socket.close()
+        self.close()
 
@@ -0,0 +1,241 @@
+"""
+Splits rows into insert batches and pipelines them for the insert_many methods of the connections.
+"""
+import asyncio
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List
+
+from surrealdb.data.cbor import EncodedArray, encode
+
+DEFAULT_BATCH_SIZE: int = 1000
+
+# leaves room for the request envelope under the default websocket max_size of 2 ** 20
+DEFAULT_MAX_BYTES: int = 1_000_000
+
+DEFAULT_MAX_IN_FLIGHT: int = 4
+
+
+@dataclass
+class InsertBatch:
+    """
+    A batch of encoded rows to insert in one request.
+
+    Attributes:
+        index: The position of the batch in the stream of batches.
+        offset: The position of the first row of the batch in the stream of rows.
+        rows: The encoded rows.
+    """
+    index: int
+    offset: int
+    rows: EncodedArray
+
+
+@dataclass
+class BatchError:
+    """
+    A batch that failed to insert.
+
+    Attributes:
+        index: The position of the batch in the stream of batches.
+        offset: The position of the first row of the batch in the stream of rows.
+        rows: The number of rows in the batch.
+        error: The error raised when inserting the batch.
+    """
+    index: int
+    offset: int
+    rows: int
+    error: Exception
+
+
+@dataclass
+class InsertManyResult:
+    """
+    The outcome of an insert_many call.
+
+    Attributes:
+        inserted: The number of records the database reported as inserted.
+        batches: The number of batches sent.
+        failed_batches: The number of batches that failed to insert.
+        failed_rows: The number of rows in the batches that failed to insert.
+        errors: The batches that failed to insert, in batch order.
+    """
+    inserted: int = 0
+    batches: int = 0
+    failed_batches: int = 0
+    failed_rows: int = 0
+    errors: List[BatchError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether every batch was inserted.
+        """
+        return not self.errors
+
+    def add(self, batch: InsertBatch, outcome: Any) -> None:
+        self.batches += 1
+        self.inserted += len(outcome) if isinstance(outcome, list) else 1
+
+    def fail(self, batch: InsertBatch, error: Exception) -> None:
+        self.batches += 1
+        self.failed_batches += 1
+        self.failed_rows += batch.rows.length
+        self.errors.append(BatchError(batch.index, batch.offset, batch.rows.length, error))
+
+
+class InsertManyError(Exception):
+    """
+    Raised by insert_many when a batch fails and continue_on_error is not set.
+
+    Attributes:
+        result: The outcome of the batches sent before insert_many stopped.
+    """
+
+    def __init__(self, result: InsertManyResult) -> None:
+        error = result.errors[0]
+        super().__init__(
+            f"error inserting batch {error.index} (rows {error.offset} to "
+            f"{error.offset + error.rows - 1}): {error.error}"
+        )
+        self.result = result
+
+
+def iter_batches(rows: Iterable[dict], batch_size: int, max_bytes: int) -> Iterator[InsertBatch]:
+    """
+    Encodes rows one at a time and groups them into batches of at most batch_size rows and max_bytes
+    encoded bytes. A row that is bigger than max_bytes on its own is sent in a batch by itself.
+
+    :param rows: (Iterable[dict]) the rows to insert, consumed lazily.
+    :param batch_size: (int) the maximum number of rows in a batch.
+    :param max_bytes: (int) the maximum number of encoded bytes of the rows in a batch.
+    :return: (Iterator[InsertBatch]) the batches.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    if max_bytes < 1:
+        raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+    pending: List[bytes] = []
+    size = 0
+    offset = 0
+    index = 0
+    for row in rows:
+        encoded = encode(row)
+        if pending and (len(pending) >= batch_size or size + len(encoded) > max_bytes):
+            yield InsertBatch(index, offset, EncodedArray(len(pending), b"".join(pending)))
+            index += 1
+            offset += len(pending)
+            pending = []
+            size = 0
+        pending.append(encoded)
+        size += len(encoded)
+    if pending:
+        yield InsertBatch(index, offset, EncodedArray(len(pending), b"".join(pending)))
+
+
+async def insert_batches_async(
+        insert: Callable[[EncodedArray], Awaitable[Any]],
+        batches: Iterable[InsertBatch],
+        max_in_flight: int,
+        continue_on_error: bool,
+) -> InsertManyResult:
+    """
+    Sends batches with up to max_in_flight inserts awaiting a response at once.
+
+    :param insert: (Callable[[EncodedArray], Awaitable[Any]]) the coroutine function inserting a batch of encoded rows.
+    :param batches: (Iterable[InsertBatch]) the batches to insert.
+    :param max_in_flight: (int) the maximum number of batches awaiting a response at once.
+    :param continue_on_error: (bool) whether to keep sending batches after one fails.
+    :return: (InsertManyResult) the outcome of the inserts.
+    """
+    result = InsertManyResult()
+    in_flight: Dict[asyncio.Future, InsertBatch] = {}
+
+    async def collect(return_when: str) -> None:
+        done, _ = await asyncio.wait(in_flight, return_when=return_when)
+        for task in done:
+            batch = in_flight.pop(task)
+            try:
+                result.add(batch, task.result())
+            except Exception as e:
+                result.fail(batch, e)
+
+    try:
+        for batch in batches:
+            while len(in_flight) >= max(max_in_flight, 1):
+                await collect(asyncio.FIRST_COMPLETED)
+            if result.errors and not continue_on_error:
+                break
+            in_flight[asyncio.ensure_future(insert(batch.rows))] = batch
+        if in_flight:
+            await collect(asyncio.ALL_COMPLETED)
+    except BaseException:
+        for task in in_flight:
+            task.cancel()
+        await asyncio.gather(*in_flight, return_exceptions=True)
+        raise
+    result.errors.sort(key=lambda error: error.index)
+    if result.errors and not continue_on_error:
+        raise InsertManyError(result)
+    return result
+
+
+def insert_batches(
+        insert: Callable[[EncodedArray], Any],
+        batches: Iterable[InsertBatch],
+        max_in_flight: int,
+        continue_on_error: bool,
+) -> InsertManyResult:
+    """
+    Sends batches with up to max_in_flight inserts awaiting a response at once, using a thread per
+    insert in flight. Batches are sent one after the other from the calling thread if max_in_flight is 1.
+
+    :param insert: (Callable[[EncodedArray], Any]) the function inserting a batch of encoded rows.
+    :param batches: (Iterable[InsertBatch]) the batches to insert.
+    :param max_in_flight: (int) the maximum number of batches awaiting a response at once.
+    :param continue_on_error: (bool) whether to keep sending batches after one fails.
+    :return: (InsertManyResult) the outcome of the inserts.
+    """
+    result = InsertManyResult()
+    if max_in_flight <= 1:
+        for batch in batches:
+            try:
+                result.add(batch, insert(batch.rows))
+            except Exception as e:
+                result.fail(batch, e)
+                if not continue_on_error:
+                    break
+    else:
+        in_flight: Dict[Future, InsertBatch] = {}
+
+        def collect(return_when: str) -> None:
+            done, _ = wait(in_flight, return_when=return_when)
+            for future in done:
+                batch = in_flight.pop(future)
+                if future.cancelled():
+                    continue
+                try:
+                    result.add(batch, future.result())
+                except Exception as e:
+                    result.fail(batch, e)
+
+        with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="surrealdb-insert") as executor:
+            try:
+                for batch in batches:
+                    while len(in_flight) >= max_in_flight:
+                        collect(FIRST_COMPLETED)
+                    if result.errors and not continue_on_error:
+                        break
+                    in_flight[executor.submit(insert, batch.rows)] = batch
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+            finally:
+                # batches already sent are still counted, including when reading the rows failed
+                if in_flight:
+                    collect(ALL_COMPLETED)
+    result.errors.sort(key=lambda error: error.index)
+    if result.errors and not continue_on_error:
+        raise InsertManyError(result)
+    return result
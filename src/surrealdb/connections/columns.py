@@ -0,0 +1,524 @@
+"""
+Decodes the rows of query and select results straight into one column per field, for analytics on large results.
+
+The response frame is walked item by item and every row is decoded on its own and appended to typed buffers,
+so the list of row dicts is never built. Numbers, booleans, datetimes and durations are stored unboxed and
+become NumPy arrays without being copied. NumPy, and pandas for to_dataframe, are optional extras:
+
+    pip install surrealdb[numpy]
+    pip install surrealdb[pandas]
+"""
+import importlib
+from array import array
+from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import cbor2
+
+from surrealdb.connections.query_result import StatementError
+from surrealdb.data.cbor import Interner, tag_decoder
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.record_id import RecordID
+
+# the value stored for a missing datetime or duration, which NumPy reads as NaT
+NAT: int = -2 ** 63
+
+# the ways record ID columns are put in a DataFrame
+RECORD_ID_COLUMNS = ("string", "category")
+
+# the CBOR major types of arrays and maps
+_ARRAY = 4
+_MAP = 5
+
+# the byte ending an indefinite length array or map
+_BREAK = 0xFF
+
+# how a column stores its values: nothing but missing values yet, an array.array per unboxed type, the
+# codes of its distinct record IDs, or a list of objects
+_EMPTY, _BOOL, _INT, _FLOAT, _DATETIME, _DURATION, _RECORD_ID, _OBJECT = range(8)
+
+# the type, array.array type code and missing value of the unboxed kinds of column
+_UNBOXED: Dict[int, Tuple[type, str, Any]] = {
+    _BOOL: (bool, "b", False),
+    _INT: (int, "q", 0),
+    _FLOAT: (float, "d", float("nan")),
+    _DATETIME: (DateTimeCompact, "q", NAT),
+    _DURATION: (Duration, "q", NAT),
+    _RECORD_ID: (RecordID, "i", -1),
+}
+
+_KINDS: Dict[type, int] = {data_type: kind for kind, (data_type, _, _) in _UNBOXED.items()}
+
+
+def _require(module: str, extra: str) -> Any:
+    """
+    Imports an optional dependency.
+
+    :param module: (str) the name of the module.
+    :param extra: (str) the extra of the package installing it.
+    :return: (Any) the module.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as error:
+        raise ImportError(
+            f"{module} is needed to decode results into columns, install it with: pip install surrealdb[{extra}]"
+        ) from error
+
+
+class _Column:
+    """
+    The values of one field of the rows, stored unboxed while they all have the same type. A column holding a
+    value of another type is turned into a list of objects, except for integers in a float column.
+
+    Attributes:
+        kind: How the column stores its values.
+        data_type: The type of the values taking the fast path of append.
+        values: The array.array, or list, of the values.
+        missing: The positions of the rows without a value, which unboxed columns store a placeholder for.
+        record_ids: The code of each distinct record ID of a record ID column.
+        store: Appends a value of data_type to the values.
+    """
+
+    __slots__ = ("kind", "data_type", "values", "missing", "record_ids", "store")
+
+    def __init__(self, length: int) -> None:
+        self.kind: int = _EMPTY
+        self.data_type: type = type(None)
+        self.values: Any = [None] * length
+        self.missing: List[int] = []
+        self.record_ids: Dict[RecordID, int] = {}
+        self.store: Callable[[Any], None] = self.values.append
+
+    def append(self, value: Any) -> None:
+        if value.__class__ is self.data_type:
+            try:
+                self.store(value)
+            except (OverflowError, TypeError):
+                # an integer too big for int64 or a timestamp that is not an integer
+                self._to_objects()
+                self.values.append(value)
+        elif self.kind == _OBJECT:
+            self.values.append(value)
+        elif value is None:
+            self.missing.append(len(self.values))
+            self.values.append(_UNBOXED[self.kind][2])
+        elif self.kind == _EMPTY:
+            self._start(value)
+            self.append(value)
+        elif self.kind == _FLOAT and value.__class__ is int:
+            self.store(float(value))
+        elif self.kind == _INT and value.__class__ is float:
+            self._set_kind(_FLOAT, array("d", self.values))
+            for position in self.missing:
+                self.values[position] = _UNBOXED[_FLOAT][2]
+            self.store(value)
+        else:
+            self._to_objects()
+            self.values.append(value)
+
+    def _start(self, value: Any) -> None:
+        """
+        Picks how the column stores its values from its first value, the rows before it having none.
+        """
+        length = len(self.values)
+        self.missing = list(range(length))
+        kind = _KINDS.get(value.__class__, _OBJECT)
+        if kind == _OBJECT:
+            self._set_kind(_OBJECT, self.values)
+            self.data_type = value.__class__
+            return
+        _, type_code, missing = _UNBOXED[kind]
+        self._set_kind(kind, array(type_code, [missing]) * length)
+
+    def _set_kind(self, kind: int, values: Any) -> None:
+        self.kind = kind
+        self.values = values
+        if kind == _OBJECT:
+            self.data_type = type(None)
+            self.store = values.append
+            return
+        self.data_type = _UNBOXED[kind][0]
+        if kind == _DATETIME:
+            self.store = lambda value: values.append(value.timestamp)
+        elif kind == _DURATION:
+            self.store = lambda value: values.append(value.elapsed)
+        elif kind == _RECORD_ID:
+            self.store = _record_id_store(self.record_ids, values)
+        else:
+            self.store = values.append
+
+    def _to_objects(self) -> None:
+        """
+        Turns the values stored so far back into objects, once a value of another type shows up.
+        """
+        kind, values = self.kind, self.values
+        if kind == _BOOL:
+            objects = [bool(value) for value in values]
+        elif kind == _DATETIME:
+            objects = [DateTimeCompact(value) for value in values]
+        elif kind == _DURATION:
+            objects = [Duration(value) for value in values]
+        elif kind == _RECORD_ID:
+            record_ids = list(self.record_ids)
+            objects = [record_ids[code] for code in values]
+            self.record_ids = {}
+        else:
+            objects = list(values)
+        for position in self.missing:
+            objects[position] = None
+        self._set_kind(_OBJECT, objects)
+
+    def build(self, numpy: Any) -> Tuple[Any, Any]:
+        """
+        Turns the column into a NumPy array, sharing the memory of the unboxed values.
+
+        :param numpy: (Any) the numpy module.
+        :return: (Tuple[Any, Any]) the values, or the codes of a record ID column, and the strings of the
+            record IDs of a record ID column, None for the other columns.
+        """
+        kind, values = self.kind, self.values
+        if kind in (_EMPTY, _OBJECT):
+            return numpy.fromiter(values, dtype=object, count=len(values)), None
+        if kind == _RECORD_ID:
+            return _record_id_codes(numpy, numpy.frombuffer(values, dtype=numpy.intc), list(self.record_ids))
+        if kind == _FLOAT:
+            return numpy.frombuffer(values, dtype=numpy.float64), None
+        if kind == _DATETIME:
+            return numpy.frombuffer(values, dtype="datetime64[ns]"), None
+        if kind == _DURATION:
+            return numpy.frombuffer(values, dtype="timedelta64[ns]"), None
+        if kind == _BOOL:
+            column = numpy.frombuffer(values, dtype=numpy.bool_)
+            if self.missing:
+                column = column.astype(object)
+                column[self.missing] = None
+            return column, None
+        column = numpy.frombuffer(values, dtype=numpy.int64)
+        if self.missing:
+            column = column.astype(numpy.float64)
+            column[self.missing] = numpy.nan
+        return column, None
+
+
+def _record_id_store(record_ids: Dict[RecordID, int], codes: Any) -> Callable[[RecordID], None]:
+    """
+    Returns the function appending the code of a record ID to a record ID column, numbering new record IDs.
+    It does not refer to the column, so a built column is freed as soon as it is dropped.
+    """
+    def store(value: RecordID) -> None:
+        code = record_ids.get(value)
+        if code is None:
+            code = record_ids[value] = len(record_ids)
+        codes.append(code)
+    return store
+
+
+def _record_id_codes(numpy: Any, codes: Any, record_ids: List[RecordID]) -> Tuple[Any, Any]:
+    """
+    Returns the codes and the distinct strings of a record ID column. Record IDs written the same way, such
+    as user:1 and user:⟨1⟩, share a string and a code.
+    """
+    strings: Dict[str, int] = {}
+    renumbered = [strings.setdefault(str(record_id), len(strings)) for record_id in record_ids]
+    if len(strings) != len(record_ids):
+        # -1, a missing value, stays -1 as the last item of the mapping
+        codes = numpy.array(renumbered + [-1], dtype=numpy.intc)[codes]
+    return codes, numpy.fromiter(strings, dtype=object, count=len(strings))
+
+
+class ColumnBuilder:
+    """
+    Appends rows to one column per field. The rows missing a field get a missing value in its column: NaN
+    for numbers, NaT for datetimes and durations, and None otherwise.
+
+    Attributes:
+        length: The number of rows appended.
+    """
+
+    def __init__(self) -> None:
+        self.length: int = 0
+        self._columns: Dict[Any, _Column] = {}
+
+    def append(self, row: Any) -> None:
+        """
+        Appends a row to the columns.
+
+        :param row: (Any) the row, which must be a dict.
+        """
+        if row.__class__ is not dict:
+            raise TypeError(f"only objects can be decoded into columns, not {row.__class__.__name__}: {row!r}")
+        columns = self._columns
+        for name, value in row.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = _Column(self.length)
+            column.append(value)
+        self.length += 1
+        if len(row) != len(columns):
+            for column in columns.values():
+                if len(column.values) < self.length:
+                    column.append(None)
+
+    def build(self) -> "Columns":
+        """
+        Turns the appended rows into columns, emptying the builder.
+
+        :return: (Columns) the columns.
+        """
+        numpy = _require("numpy", "numpy")
+        arrays: Dict[Any, Any] = {}
+        record_ids: Dict[Any, Tuple[Any, Any]] = {}
+        names = list(self._columns)
+        for name in names:
+            # drops every column once it is built so its values are freed before the next one is built
+            values, strings = self._columns.pop(name).build(numpy)
+            if strings is None:
+                arrays[name] = values
+            else:
+                record_ids[name] = (values, strings)
+        length, self.length = self.length, 0
+        return Columns(names, arrays, record_ids, length)
+
+
+class Columns(Mapping):
+    """
+    The rows of a result as one NumPy array per field, in the order the fields first appear in the rows.
+
+    Integers are int64 arrays, or float64 if a row is missing one, floats are float64, booleans bool,
+    datetimes datetime64[ns] and durations timedelta64[ns] arrays. Record IDs are arrays of "table:id"
+    strings, stored as the codes of the distinct record IDs so they can become a pandas category cheaply.
+    Any other field, and any field holding values of several types, is an array of objects.
+
+    Attributes:
+        length: The number of rows.
+    """
+
+    def __init__(
+            self,
+            names: List[Any],
+            arrays: Dict[Any, Any],
+            record_ids: Dict[Any, Tuple[Any, Any]],
+            length: int,
+    ) -> None:
+        self.length: int = length
+        self._names: List[Any] = names
+        self._arrays: Dict[Any, Any] = arrays
+        self._record_ids: Dict[Any, Tuple[Any, Any]] = record_ids
+
+    def __getitem__(self, name: Any) -> Any:
+        column = self._arrays.get(name)
+        if column is None:
+            codes, strings = self._record_ids[name]
+            column = strings.take(codes)
+            missing = codes < 0
+            if missing.any():
+                column[missing] = None
+            self._arrays[name] = column
+        return column
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(length={self.length}, names={self._names!r})"
+
+    def record_id_codes(self, name: Any) -> Tuple[Any, Any]:
+        """
+        Returns a record ID column as the code of the record ID of every row and the strings of the codes.
+
+        :param name: (Any) the name of the record ID column.
+        :return: (Tuple[Any, Any]) the int32 codes, -1 for a missing record ID, and the array of strings.
+        """
+        return self._record_ids[name]
+
+    def to_dataframe(self, record_ids: str = "string") -> Any:
+        """
+        Puts the columns in a pandas DataFrame, without copying them.
+
+        :param record_ids: (str) "string" for record ID columns of "table:id" strings, "category" for
+            categorical columns.
+        :return: (pandas.DataFrame) the columns as a DataFrame.
+        """
+        if record_ids not in RECORD_ID_COLUMNS:
+            raise ValueError(f"record_ids must be one of {RECORD_ID_COLUMNS}, not {record_ids!r}")
+        pandas = _require("pandas", "pandas")
+        data = {}
+        for name in self._names:
+            if record_ids == "category" and name in self._record_ids:
+                codes, strings = self._record_ids[name]
+                data[name] = pandas.Categorical.from_codes(codes, categories=strings)
+            else:
+                data[name] = self[name]
+        return pandas.DataFrame(data, index=pandas.RangeIndex(self.length), copy=False)
+
+
+class _FrameReader:
+    """
+    Reads a CBOR response frame one item at a time, decoding only the items it is asked for.
+    """
+
+    def __init__(self, data: bytes, interner: Optional[Interner] = None) -> None:
+        self.data = data
+        self.fp = BytesIO(data)
+        if interner is None:
+            self.decoder = cbor2.CBORDecoder(self.fp, tag_hook=tag_decoder)
+        else:
+            self.decoder = cbor2.CBORDecoder(
+                self.fp, tag_hook=interner.tag_hook, object_hook=interner.object_hook
+            )
+
+    def peek(self) -> int:
+        """
+        Returns the major type of the next item without reading it.
+        """
+        return self.data[self.fp.tell()] >> 5
+
+    def head(self) -> Optional[int]:
+        """
+        Reads the head of an array or map, returning its number of items, None if it has an indefinite length.
+        """
+        info = self.fp.read(1)[0] & 0x1F
+        if info < 24:
+            return info
+        if info == 31:
+            return None
+        # 24 to 27 are followed by a 1, 2, 4 or 8 byte length
+        return int.from_bytes(self.fp.read(1 << (info - 24)), "big")
+
+    def items(self, length: Optional[int]) -> Iterator[int]:
+        """
+        Yields the position of every item of an array or map whose head was read, the caller reading the item.
+        """
+        if length is not None:
+            yield from range(length)
+            return
+        position = 0
+        while self.data[self.fp.tell()] != _BREAK:
+            yield position
+            position += 1
+        self.fp.read(1)
+
+    def keys(self) -> Iterator[Any]:
+        """
+        Yields the keys of the map at the current position, the caller reading the value of every key.
+        """
+        if self.peek() != _MAP:
+            raise ValueError("the response is not a CBOR map")
+        for _ in self.items(self.head()):
+            yield self.value()
+
+    def value(self) -> Any:
+        """
+        Decodes the next item.
+        """
+        return self.decoder.decode()
+
+
+def frame_id(data: bytes) -> Any:
+    """
+    Returns the ID of the request a response frame answers, without decoding the result if the ID comes first,
+    as it does in the frames of the database. A frame is known to be a live query notification, which has no
+    ID, without decoding its last value, so the reader decodes a notification only once to dispatch it. The
+    values before the ID are decoded to move past them, as the C decoder does that faster than any skipping
+    written in Python.
+
+    :param data: (bytes) the CBOR response frame.
+    :return: (Any) the ID of the request, None for a live query notification.
+    """
+    frame = _FrameReader(data)
+    if frame.peek() != _MAP:
+        raise ValueError("the response is not a CBOR map")
+    length = frame.head()
+    for position in frame.items(length):
+        if frame.value() == "id":
+            return frame.value()
+        if length is not None and position == length - 1:
+            return None
+        frame.value()
+    return None
+
+
+def read_columns(
+        data: bytes, process: str, interner: Optional[Interner] = None, statement: Optional[int] = None
+) -> Columns:
+    """
+    Decodes the rows of a response frame straight into columns.
+
+    :param data: (bytes) the CBOR response frame.
+    :param process: (str) what the request was, for the error raised if it failed.
+    :param interner: (Optional[Interner]) the interner to decode the rows with.
+    :param statement: (Optional[int]) the position of the statement whose rows are decoded for a query, None if
+        the result holds the rows, as it does for a select.
+    :return: (Columns) the rows as columns.
+    """
+    frame = _FrameReader(data, interner)
+    builder = ColumnBuilder()
+    found = False
+    for key in frame.keys():
+        if key == "result":
+            found = True
+            if statement is None:
+                _append_result(builder, _read_rows(frame, builder))
+            else:
+                _read_statements(frame, builder, statement)
+        elif key == "error":
+            raise Exception(f"error {process}: {frame.value()}")
+        else:
+            frame.value()
+    if not found:
+        raise Exception(f"no result {process}")
+    return builder.build()
+
+
+def _read_rows(frame: _FrameReader, builder: ColumnBuilder) -> Any:
+    """
+    Appends the rows of an array to the builder one at a time. A result that is not an array is returned as is.
+    """
+    if frame.peek() != _ARRAY:
+        return frame.value()
+    for _ in frame.items(frame.head()):
+        builder.append(frame.value())
+    return None
+
+
+def _append_result(builder: ColumnBuilder, result: Any) -> None:
+    """
+    Appends a result that is not an array, a single record such as the result of SELECT * FROM ONLY, or nothing.
+    """
+    if result is not None:
+        builder.append(result)
+
+
+def _read_statements(frame: _FrameReader, builder: ColumnBuilder, statement: int) -> None:
+    """
+    Appends the rows of one statement of a query result to the builder, skipping the other statements.
+    """
+    if frame.peek() != _ARRAY:
+        raise ValueError("the result of the query is not an array of statements")
+    length = frame.head()
+    if statement < 0 and length is not None:
+        statement += length
+    found = False
+    for index in frame.items(length):
+        if index != statement:
+            frame.value()
+            continue
+        found = True
+        result, status = None, None
+        for key in frame.keys():
+            if key == "result":
+                result = _read_rows(frame, builder)
+            elif key == "status":
+                status = frame.value()
+            else:
+                frame.value()
+        if status != "OK":
+            raise StatementError(index, result)
+        _append_result(builder, result)
+    if not found:
+        raise IndexError(f"the query has no statement {statement}")
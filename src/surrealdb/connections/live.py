@@ -0,0 +1,522 @@
+"""
+Bounded queues used by the websocket connections to hand live query notifications from the reader to subscribers.
+"""
+import asyncio
+import threading
+from copy import deepcopy
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, Hashable, List, Optional, Union
+from uuid import UUID
+
+from surrealdb.data.cbor import encode
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+DEFAULT_LIVE_QUEUE_SIZE: int = 1024
+
+DEFAULT_LIVE_BATCH_SIZE: int = 1000
+DEFAULT_LIVE_BATCH_WINDOW: float = 0.1
+
+# the name of the query variable holding the table of a LIVE SELECT, prefixed so it does not clash with the caller's params
+LIVE_TABLE_VARIABLE: str = "live_table"
+
+
+class OverflowPolicy(Enum):
+    """
+    What the reader does with a notification for a subscription whose queue is full. The reader never waits
+    for a subscriber, so a subscriber that falls behind does not hold up responses to other requests.
+
+    BLOCK: keep every notification. The ones arriving while the queue is full wait in a backlog of the
+        subscription and move to the queue as the subscriber takes notifications off it, so the backlog of a
+        subscriber that never catches up keeps growing.
+    DROP_OLDEST: drop the oldest queued notification to make room. The default.
+    COALESCE: replace the queued notification for the same record with the new one, keeping only the latest
+        state of each record. Falls back to dropping the oldest notification if no record can be replaced.
+    """
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+    @staticmethod
+    def from_value(value: Union[str, "OverflowPolicy"]) -> "OverflowPolicy":
+        if isinstance(value, OverflowPolicy):
+            return value
+        return OverflowPolicy(value.lower())
+
+
+@dataclass(frozen=True)
+class LiveQueueStats:
+    """
+    A snapshot of the queue of a live query subscription.
+
+    Attributes:
+        size: The number of notifications waiting to be consumed.
+        max_size: The maximum number of notifications the queue holds.
+        overflow: The policy applied when the queue is full.
+        received: The total number of notifications routed to the queue.
+        dropped: The number of notifications dropped because the queue was full.
+        coalesced: The number of notifications merged into a queued notification for the same record.
+        backlog: The number of notifications waiting for room in the queue, with the BLOCK policy.
+    """
+    size: int
+    max_size: int
+    overflow: OverflowPolicy
+    received: int
+    dropped: int
+    coalesced: int
+    backlog: int = 0
+
+
+def record_key(record_id: Any) -> Hashable:
+    """
+    Returns a hashable key for a record ID, keeping IDs of different types apart (user:1 and user:"1").
+    """
+    if isinstance(record_id, RecordID):
+        return record_id.table_name, repr(record_id.id)
+    return repr(record_id)
+
+
+def coalesce_notifications(notifications: List[dict]) -> List[dict]:
+    """
+    Collapses a batch of notifications to one notification per record with its latest state, in the order
+    the records first changed. A record created and deleted in the batch is left out, and a record that
+    existed before the batch and is deleted and created again is an UPDATE. Notifications without a record
+    ID, such as diffs, are kept as they are.
+
+    :param notifications: (List[dict]) the notifications in the order they were received.
+    :return: (List[dict]) the collapsed notifications.
+    """
+    changes: Dict[Hashable, List[Any]] = {}
+    for notification in notifications:
+        record = notification.get("result")
+        if not isinstance(record, dict) or record.get("id") is None:
+            changes[object()] = [None, notification]
+            continue
+        key = record_key(record["id"])
+        change = changes.get(key)
+        if change is None:
+            # the first action tells whether the record existed before the batch
+            changes[key] = [notification.get("action"), notification]
+        else:
+            change[1] = notification
+    batch = []
+    for first_action, notification in changes.values():
+        action = notification.get("action")
+        if first_action is None or first_action == action:
+            batch.append(notification)
+        elif first_action == "CREATE":
+            if action != "DELETE":
+                batch.append({**notification, "action": "CREATE"})
+        elif action == "CREATE":
+            batch.append({**notification, "action": "UPDATE"})
+        else:
+            batch.append(notification)
+    return batch
+
+
+def live_select_query(fields: Optional[Union[str, List[str]]], where: Optional[str], diff: bool) -> str:
+    """
+    Builds a LIVE SELECT statement on the table in $live_table so the server only sends the records and
+    fields the subscriber wants.
+
+    :param fields: (Optional[Union[str, List[str]]]) the fields to send, all fields if None.
+    :param where: (Optional[str]) a condition the changed records have to match.
+    :param diff: (bool) whether to send JSON Patch operations instead of records, can't be used with fields.
+    :return: (str) the LIVE SELECT statement.
+    """
+    if diff and fields is not None:
+        raise ValueError("a live query can either select fields or send diffs, not both")
+    if diff:
+        projection = "DIFF"
+    elif fields is None:
+        projection = "*"
+    elif isinstance(fields, str):
+        projection = fields
+    else:
+        if not fields:
+            raise ValueError("a live query needs at least one field")
+        projection = ", ".join(fields)
+    condition = f" WHERE {where}" if where else ""
+    return f"LIVE SELECT {projection} FROM ${LIVE_TABLE_VARIABLE}{condition};"
+
+
+def live_select_variables(table: Union[str, Table], params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Builds the variables of a LIVE SELECT statement built by live_select_query.
+
+    :param table: (Union[str, Table]) the table to watch.
+    :param params: (Optional[Dict[str, Any]]) the variables used in the caller's where condition.
+    :return: (Dict[str, Any]) the variables of the statement.
+    """
+    if isinstance(table, str):
+        if ":" in table:
+            raise ValueError(f"a live query needs a table name, got: {table}")
+        table = Table(table)
+    variables = dict(params) if params else dict()
+    variables[LIVE_TABLE_VARIABLE] = table
+    return variables
+
+
+def live_definition(
+        table: Union[str, Table],
+        diff: bool,
+        fields: Optional[Union[str, List[str]]],
+        where: Optional[str],
+        params: Optional[Dict[str, Any]],
+) -> Hashable:
+    """
+    Returns a key identifying a live query definition, equal for live queries the database would notify the same way.
+
+    :param table: (Union[str, Table]) the table to watch.
+    :param diff: (bool) whether the live query sends JSON Patch operations.
+    :param fields: (Optional[Union[str, List[str]]]) the fields sent, all fields if None.
+    :param where: (Optional[str]) the condition the changed records have to match.
+    :param params: (Optional[Dict[str, Any]]) the variables used in the where condition.
+    :return: (Hashable) the key of the definition.
+    """
+    if isinstance(table, Table):
+        table = table.table_name
+    if isinstance(fields, list):
+        fields = tuple(fields)
+    variables = encode(dict(sorted(params.items()))) if params else None
+    return table, bool(diff), fields, where, variables
+
+
+def live_uuid(response: dict) -> Optional[UUID]:
+    """
+    Returns the UUID of the live query started by a live RPC response, None if the request failed.
+    """
+    if response.get("error") is not None:
+        return None
+    return response.get("result")
+
+
+def live_select_uuid(response: dict) -> Optional[UUID]:
+    """
+    Returns the UUID of the live query started by a LIVE SELECT query response, None if the statement failed.
+    """
+    statements = response.get("result")
+    if response.get("error") is not None or not isinstance(statements, list) or not statements:
+        return None
+    if statements[0].get("status") != "OK":
+        return None
+    return statements[0].get("result")
+
+
+class LiveBuffer:
+    """
+    The bounded buffer of notifications behind a live query queue, applying the overflow policy.
+
+    Notifications are stored as [key, notification] entries so a coalesced notification keeps the position
+    of the notification it replaces. With the BLOCK policy the notifications that do not fit wait in a
+    backlog, and the oldest moves to the queue every time one is taken off it.
+    """
+
+    __slots__ = ("max_size", "overflow", "received", "dropped", "coalesced", "_entries", "_index", "_backlog")
+
+    def __init__(self, max_size: int, overflow: OverflowPolicy) -> None:
+        if max_size < 1:
+            raise ValueError(f"the live queue size must be at least 1, got {max_size}")
+        self.max_size: int = max_size
+        self.overflow: OverflowPolicy = overflow
+        self.received: int = 0
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self._entries: Deque[List[Any]] = deque()
+        self._index: Dict[Hashable, List[Any]] = {}
+        self._backlog: Deque[dict] = deque()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, notification: dict) -> None:
+        """
+        Adds a notification, applying the overflow policy if the queue is full. Never waits.
+        """
+        key = None
+        if self.overflow is OverflowPolicy.COALESCE:
+            record = notification.get("result")
+            if isinstance(record, dict) and record.get("id") is not None:
+                key = record_key(record["id"])
+                entry = self._index.get(key)
+                if entry is not None:
+                    entry[1] = notification
+                    self.received += 1
+                    self.coalesced += 1
+                    return
+        self.received += 1
+        if len(self._entries) >= self.max_size:
+            if self.overflow is OverflowPolicy.BLOCK:
+                self._backlog.append(notification)
+                return
+            self._pop_entry()
+            self.dropped += 1
+        entry = [key, notification]
+        self._entries.append(entry)
+        if key is not None:
+            self._index[key] = entry
+
+    def pop(self) -> dict:
+        notification = self._pop_entry()[1]
+        if self._backlog:
+            self._entries.append([None, self._backlog.popleft()])
+        return notification
+
+    def _pop_entry(self) -> List[Any]:
+        entry = self._entries.popleft()
+        if entry[0] is not None and self._index.get(entry[0]) is entry:
+            del self._index[entry[0]]
+        return entry
+
+    def stats(self) -> LiveQueueStats:
+        return LiveQueueStats(
+            size=len(self._entries),
+            max_size=self.max_size,
+            overflow=self.overflow,
+            received=self.received,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            backlog=len(self._backlog),
+        )
+
+
+class AsyncLiveQueue:
+    """
+    The queue of notifications of one live query for the async websocket connection.
+
+    The queue is closed by kill(), ending the subscription, or by the reader stopping, raising its error
+    in the subscription.
+    """
+
+    def __init__(
+            self, max_size: int = DEFAULT_LIVE_QUEUE_SIZE, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ) -> None:
+        self.buffer: LiveBuffer = LiveBuffer(max_size, overflow)
+        self.closed: bool = False
+        self.error: Optional[Exception] = None
+        self._not_empty = asyncio.Event()
+
+    def put(self, notification: dict) -> None:
+        """
+        Adds a notification without waiting, so the reader goes on routing the responses of other requests.
+        """
+        if self.closed:
+            return
+        self.buffer.push(notification)
+        self._not_empty.set()
+
+    async def get(self) -> Optional[dict]:
+        """
+        Returns the next notification, or None once the queue is closed and empty.
+        """
+        while not self.buffer and not self.closed:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        if self.buffer:
+            return self.buffer.pop()
+        if self.error is not None:
+            raise Exception(f"Error in live subscription: {self.error}")
+        return None
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Waits until a notification is queued or the queue is closed, returning False if the timeout passes first.
+        Nothing is taken off the queue, so the wait can be cancelled without losing a notification.
+        """
+        if not self.buffer and not self.closed:
+            self._not_empty.clear()
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        self.closed = True
+        self.error = error
+        self._not_empty.set()
+
+    def stats(self) -> LiveQueueStats:
+        return self.buffer.stats()
+
+
+class BlockingLiveQueue:
+    """
+    The queue of notifications of one live query for the blocking websocket connection, safe to use across threads.
+
+    The queue is closed by kill(), ending the subscription, or by the reader stopping, raising its error
+    in the subscription.
+    """
+
+    def __init__(
+            self, max_size: int = DEFAULT_LIVE_QUEUE_SIZE, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ) -> None:
+        self.buffer: LiveBuffer = LiveBuffer(max_size, overflow)
+        self.closed: bool = False
+        self.error: Optional[Exception] = None
+        self._condition = threading.Condition()
+
+    def put(self, notification: dict) -> None:
+        """
+        Adds a notification without waiting, so the reader goes on routing the responses of other requests.
+        """
+        with self._condition:
+            if self.closed:
+                return
+            self.buffer.push(notification)
+            self._condition.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        Returns the next notification, or None once the queue is closed and empty or the timeout passes.
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.buffer or self.closed, timeout):
+                return None
+            if self.buffer:
+                return self.buffer.pop()
+            if self.error is not None:
+                raise Exception(f"Error in live subscription: {self.error}")
+            return None
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        with self._condition:
+            self.closed = True
+            self.error = error
+            self._condition.notify_all()
+
+    def stats(self) -> LiveQueueStats:
+        with self._condition:
+            return self.buffer.stats()
+
+
+class LiveFanout:
+    """
+    The subscribers of one live query on the database.
+
+    Attributes:
+        query_uuid: The UUID of the live query on the database.
+        definition: The key of the live query definition if the live query is shared, None otherwise.
+        queues: The queue of every subscriber by subscriber UUID.
+    """
+
+    __slots__ = ("query_uuid", "definition", "queues")
+
+    def __init__(self, query_uuid: UUID, definition: Optional[Hashable] = None) -> None:
+        self.query_uuid: UUID = query_uuid
+        self.definition: Optional[Hashable] = definition
+        self.queues: Dict[UUID, Any] = {}
+
+
+class LiveRegistry:
+    """
+    Tracks the live queries of a websocket connection and the queues of their subscribers, safe to use from
+    the reader and the callers at the same time.
+
+    A live query that is not shared has a single subscriber with the UUID of the live query. A shared live
+    query has a subscriber per live() call, each with its own UUID and queue, and is only killed on the
+    database once every subscriber is killed. A notification is decoded once and every subscriber after the
+    first gets a deep copy, so a subscriber changing its notification does not change what the others get.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fanouts: Dict[UUID, LiveFanout] = {}
+        self._subscribers: Dict[UUID, LiveFanout] = {}
+        self._shared: Dict[Hashable, LiveFanout] = {}
+
+    def add(self, query_uuid: UUID, subscriber_uuid: UUID, queue: Any, definition: Optional[Hashable] = None) -> Any:
+        """
+        Adds a subscriber to a live query, returning the queue of the subscriber if it already has one.
+
+        :param query_uuid: (UUID) the UUID of the live query on the database.
+        :param subscriber_uuid: (UUID) the UUID the subscriber uses to read and kill the live query.
+        :param queue: (Any) the queue of the subscriber.
+        :param definition: (Optional[Hashable]) the key of the definition if the live query is shared.
+        :return: (Any) the queue of the subscriber.
+        """
+        with self._lock:
+            fanout = self._subscribers.get(subscriber_uuid)
+            if fanout is not None:
+                return fanout.queues[subscriber_uuid]
+            fanout = self._fanouts.get(query_uuid)
+            if fanout is None:
+                fanout = self._fanouts[query_uuid] = LiveFanout(query_uuid, definition)
+                if definition is not None:
+                    self._shared[definition] = fanout
+            fanout.queues[subscriber_uuid] = queue
+            self._subscribers[subscriber_uuid] = fanout
+            return queue
+
+    def join(self, definition: Hashable, subscriber_uuid: UUID, queue: Any) -> bool:
+        """
+        Adds a subscriber to the shared live query with the definition, returning False if there is none.
+        """
+        with self._lock:
+            fanout = self._shared.get(definition)
+            if fanout is None:
+                return False
+            fanout.queues[subscriber_uuid] = queue
+            self._subscribers[subscriber_uuid] = fanout
+            return True
+
+    def queue(self, subscriber_uuid: UUID) -> Any:
+        with self._lock:
+            fanout = self._subscribers.get(subscriber_uuid)
+            return None if fanout is None else fanout.queues[subscriber_uuid]
+
+    def queues(self, query_uuid: UUID) -> List[Any]:
+        """
+        Returns the queues a notification of the live query goes to.
+        """
+        with self._lock:
+            fanout = self._fanouts.get(query_uuid)
+            return [] if fanout is None else list(fanout.queues.values())
+
+    def dispatch(self, query_uuid: UUID, notification: dict) -> None:
+        """
+        Puts a notification on the queue of every subscriber of the live query. The queues never wait, and
+        each applies its own overflow policy, so a subscriber that falls behind does not hold up the others.
+
+        :param query_uuid: (UUID) the UUID of the live query on the database.
+        :param notification: (dict) the decoded notification, given as is to the first subscriber.
+        """
+        for index, queue in enumerate(self.queues(query_uuid)):
+            queue.put(notification if index == 0 else deepcopy(notification))
+
+    def remove(self, subscriber_uuid: UUID) -> Optional[UUID]:
+        """
+        Removes a subscriber and closes its queue.
+
+        :param subscriber_uuid: (UUID) the UUID of the subscriber.
+        :return: (Optional[UUID]) the UUID of the live query to kill on the database, None while other
+            subscribers share it. The UUID passed in if it is not a known subscriber.
+        """
+        with self._lock:
+            fanout = self._subscribers.pop(subscriber_uuid, None)
+            if fanout is None:
+                return subscriber_uuid
+            queue = fanout.queues.pop(subscriber_uuid)
+            query_uuid = None
+            if not fanout.queues:
+                del self._fanouts[fanout.query_uuid]
+                if fanout.definition is not None:
+                    self._shared.pop(fanout.definition, None)
+                query_uuid = fanout.query_uuid
+        queue.close()
+        return query_uuid
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        """
+        Closes the queue of every subscriber and forgets every live query.
+        """
+        with self._lock:
+            fanouts = list(self._fanouts.values())
+            self._fanouts.clear()
+            self._subscribers.clear()
+            self._shared.clear()
+        for fanout in fanouts:
+            for queue in fanout.queues.values():
+                queue.close(error)
@@ -0,0 +1,66 @@
+"""
+Builds the keyset pagination queries used by select_iter.
+"""
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from surrealdb.data.types.table import Table
+
+DEFAULT_PAGE_SIZE: int = 1000
+
+# the names of the query variables used by select_iter, prefixed so they do not clash with the caller's params
+TABLE_VARIABLE: str = "select_iter_table"
+LAST_VARIABLE: str = "select_iter_last"
+
+
+def keyset_queries(
+        fields: Optional[Union[str, List[str]]], where: Optional[str], page_size: int
+) -> Tuple[str, str]:
+    """
+    Builds the queries selecting the first page and every page after the record with the ID in $select_iter_last.
+
+    :param fields: (Optional[Union[str, List[str]]]) the fields to select, all fields if None. The id is always selected.
+    :param where: (Optional[str]) a condition the records have to match.
+    :param page_size: (int) the maximum number of records in a page.
+    :return: (Tuple[str, str]) the query for the first page and the query for the following pages.
+    """
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    if fields is None:
+        fields = ["*"]
+    elif isinstance(fields, str):
+        fields = [fields]
+    if "*" not in fields and "id" not in fields:
+        # the id of the last record of a page is the key of the next page
+        fields = ["id", *fields]
+    projection = ", ".join(fields)
+    condition = f" AND ({where})" if where else ""
+    first_condition = f" WHERE {where}" if where else ""
+    first = f"SELECT {projection} FROM type::table(${TABLE_VARIABLE}){first_condition} ORDER BY id LIMIT {page_size};"
+    after = (
+        f"SELECT {projection} FROM type::table(${TABLE_VARIABLE}) "
+        f"WHERE id > ${LAST_VARIABLE}{condition} ORDER BY id LIMIT {page_size};"
+    )
+    return first, after
+
+
+def keyset_variables(table: Union[str, Table], params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Builds the variables for the keyset pagination queries.
+
+    :param table: (Union[str, Table]) the table to select from.
+    :param params: (Optional[Dict[str, Any]]) the variables used in the caller's where condition.
+    :return: (Dict[str, Any]) the variables for the first page.
+    """
+    if isinstance(table, Table):
+        table = table.table_name
+    if not isinstance(table, str) or ":" in table:
+        raise ValueError(f"select_iter needs a table name, got: {table}")
+    variables = dict(params) if params else dict()
+    variables[TABLE_VARIABLE] = table
+    return variables
+
+
+def check_page(page: Any) -> List[dict]:
+    if not isinstance(page, list):
+        raise Exception(f"error selecting page: {page}")
+    return page
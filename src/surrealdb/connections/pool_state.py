@@ -0,0 +1,106 @@
+"""
+Defines the state shared by the async and blocking connection pools.
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """
+    A snapshot of the state of a connection pool, used to size the pool.
+
+    Attributes:
+        size: The number of connections currently owned by the pool (idle, in use, or being opened).
+        in_use: The number of connections currently checked out.
+        idle: The number of connections waiting in the pool to be checked out.
+        waiters: The number of callers currently waiting for a connection.
+        max_connections: The maximum number of connections the pool will open.
+        acquired: The total number of successful checkouts.
+        timeouts: The total number of checkouts that timed out.
+        created: The total number of connections opened by the pool.
+        discarded: The total number of connections closed by the pool (reaped, broken, or failed health checks).
+        total_wait_time: The total seconds spent by callers waiting to check out a connection.
+        max_wait_time: The longest time in seconds a caller waited to check out a connection.
+    """
+    size: int
+    in_use: int
+    idle: int
+    waiters: int
+    max_connections: int
+    acquired: int
+    timeouts: int
+    created: int
+    discarded: int
+    total_wait_time: float
+    max_wait_time: float
+
+    @property
+    def average_wait_time(self) -> float:
+        """
+        The average seconds a caller waited to check out a connection.
+        """
+        if self.acquired == 0:
+            return 0.0
+        return self.total_wait_time / self.acquired
+
+
+class SessionState:
+    """
+    The session state (signin, namespace/database, and variables) that the pool replays onto every member.
+
+    Attributes:
+        version: Incremented every time the state changes so stale members can be detected on checkout.
+        signin_vars: The variables passed to signin, if the pool has signed in.
+        namespace: The namespace to use.
+        database: The database to use.
+        vars: The variables assigned with let.
+    """
+
+    def __init__(self) -> None:
+        self.version: int = 0
+        self.signin_vars: Optional[Dict[str, Any]] = None
+        self.namespace: Optional[str] = None
+        self.database: Optional[str] = None
+        self.vars: Dict[str, Any] = dict()
+
+    def signin(self, vars: Dict[str, Any]) -> None:
+        self.signin_vars = dict(vars)
+        self.version += 1
+
+    def use(self, namespace: str, database: str) -> None:
+        self.namespace = namespace
+        self.database = database
+        self.version += 1
+
+    def let(self, key: str, value: Any) -> None:
+        self.vars[key] = value
+        self.version += 1
+
+    def unset(self, key: str) -> None:
+        self.vars.pop(key, None)
+        self.version += 1
+
+
+class PoolMember:
+    """
+    A connection owned by a pool along with the bookkeeping needed to reap and validate it.
+
+    Attributes:
+        connection: The connection to the database.
+        created_at: The monotonic time the connection was opened.
+        last_used: The monotonic time the connection was last returned to the pool.
+        last_checked: The monotonic time the connection last passed a health check.
+        state_version: The version of the pool's session state last replayed onto the connection.
+        applied_vars: The names of the variables last assigned on the connection by the pool.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at: float = now
+        self.last_used: float = now
+        self.last_checked: float = now
+        self.state_version: int = -1
+        self.applied_vars: Set[str] = set()
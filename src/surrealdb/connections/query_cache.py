@@ -0,0 +1,399 @@
+"""
+An opt-in cache of query results for the query methods of the connections.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+from surrealdb.data.cbor import decode, encode
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+DEFAULT_QUERY_CACHE_BYTES: int = 64 * 2 ** 20
+DEFAULT_QUERY_CACHE_TTL: float = 5.0
+
+# the bytes an entry costs on top of its encoded result, covering the key, the tags and the bookkeeping
+ENTRY_OVERHEAD: int = 200
+
+
+def canonical(value: Any) -> Any:
+    """
+    Sorts the keys of every dict in a value so equal params always encode to the same bytes.
+    """
+    if isinstance(value, dict):
+        return {key: canonical(value[key]) for key in sorted(value, key=repr)}
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    return value
+
+
+def query_cache_key(query: str, params: Optional[dict], scope: Any = None) -> bytes:
+    """
+    Returns the cache key of a query, a hash of the query text and of its canonically encoded params.
+
+    :param query: (str) the SurrealQL statements.
+    :param params: (Optional[dict]) the variables of the query.
+    :param scope: (Any) what else the result depends on, such as the namespace, database and token of the
+        session, encoded with the params.
+    :return: (bytes) the key of the query.
+    """
+    digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16)
+    digest.update(b"\x00")
+    digest.update(encode([scope, canonical(params or {})]))
+    return digest.digest()
+
+
+def thing_table(thing: Union[str, RecordID, Table]) -> Optional[str]:
+    """
+    Returns the name of the table a thing passed to a write method belongs to.
+    """
+    if isinstance(thing, RecordID):
+        return thing.table_name
+    if isinstance(thing, Table):
+        return thing.table_name
+    if isinstance(thing, str):
+        return thing.split(":", 1)[0]
+    return None
+
+
+@dataclass(frozen=True)
+class QueryCacheStats:
+    """
+    A snapshot of the counters of a query cache.
+
+    Attributes:
+        size: The number of cached results.
+        bytes: The bytes used by the cached results.
+        max_bytes: The maximum bytes used by the cached results.
+        hits: The number of queries served from a fresh result.
+        stale_hits: The number of queries served from a stale result while it was refreshed.
+        misses: The number of queries sent to the database because no result could be served.
+        refreshes: The number of stale results refreshed in the background.
+        evictions: The number of results evicted to stay within max_bytes.
+        expirations: The number of results dropped because they were too old to be served.
+        invalidations: The number of results dropped by invalidate_tag() or clear().
+    """
+    size: int
+    bytes: int
+    max_bytes: int
+    hits: int
+    stale_hits: int
+    misses: int
+    refreshes: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class QueryCacheEntry:
+    """
+    A cached query result.
+
+    Attributes:
+        data: The encoded result.
+        tags: The tags the result is invalidated by.
+        fresh_until: The monotonic time until which the result is served as it is.
+        stale_until: The monotonic time until which the result is served while it is refreshed.
+        refreshing: Whether a refresh of the result is running.
+    """
+
+    __slots__ = ("data", "tags", "fresh_until", "stale_until", "refreshing")
+
+    def __init__(self, data: bytes, tags: Tuple[str, ...], fresh_until: float, stale_until: float) -> None:
+        self.data = data
+        self.tags = tags
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.refreshing = False
+
+    @property
+    def size(self) -> int:
+        return len(self.data) + ENTRY_OVERHEAD
+
+
+class QueryCache:
+    """
+    A cache of query results bounded by the bytes of the encoded results, safe to use across threads.
+
+    Every result is cached for its TTL and is then stale for stale_ttl seconds: a stale result is still
+    returned while a single refresh runs in the background, so callers don't all wait for the database
+    when a popular result expires. Results are tagged, usually with the tables the query reads, and
+    invalidate_tag() drops every result with the tag after a write. A result is not cached if one of its
+    tags was invalidated while its query ran. Results are stored encoded so every hit returns a new copy.
+
+    Attributes:
+        max_bytes: The maximum bytes of the cached results, the least recently used result is evicted first.
+        ttl: The default seconds a result is fresh for.
+        stale_ttl: The seconds a result is served after its TTL while it is refreshed, 0 to disable.
+    """
+
+    def __init__(
+            self,
+            max_bytes: int = DEFAULT_QUERY_CACHE_BYTES,
+            ttl: float = DEFAULT_QUERY_CACHE_TTL,
+            stale_ttl: float = 0.0,
+    ) -> None:
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+        self.max_bytes: int = max_bytes
+        self.ttl: float = ttl
+        self.stale_ttl: float = stale_ttl
+        self.hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self.refreshes: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, QueryCacheEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[bytes]] = {}
+        self._bytes: int = 0
+        self._epoch: int = 0
+        # the epoch of the last invalidation of each tag, and of the last clear()
+        self._tag_epochs: Dict[str, int] = {}
+        self._cleared_epoch: int = 0
+        self._tasks: Set[asyncio.Future] = set()
+
+    @property
+    def epoch(self) -> int:
+        """
+        Changes every time results are invalidated, read it before running a query and pass it to put().
+        """
+        return self._epoch
+
+    def lookup(self, key: bytes, background: bool = True) -> Tuple[Optional[bytes], bool]:
+        """
+        Looks a result up.
+
+        :param key: (bytes) the key of the query.
+        :param background: (bool) whether the caller can refresh a stale result in the background, a stale
+            result is a miss otherwise.
+        :return: (Tuple[Optional[bytes], bool]) the encoded result, None if there is none that can be served,
+            and whether the caller has to refresh the result in the background.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stale_until <= now:
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None or (not background and entry.fresh_until <= now):
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if entry.fresh_until > now:
+                self.hits += 1
+                return entry.data, False
+            self.stale_hits += 1
+            refresh = not entry.refreshing
+            entry.refreshing = True
+            if refresh:
+                self.refreshes += 1
+            return entry.data, refresh
+
+    def put(
+            self, key: bytes, result: Any, epoch: int, ttl: Optional[float] = None, tags: Iterable[str] = ()
+    ) -> None:
+        """
+        Caches a result unless one of its tags was invalidated, or the cache cleared, since the epoch was read.
+        """
+        data = encode(result)
+        now = time.monotonic()
+        fresh_until = now + (self.ttl if ttl is None else ttl)
+        entry = QueryCacheEntry(data, tuple(tags), fresh_until, fresh_until + self.stale_ttl)
+        with self._lock:
+            if entry.size > self.max_bytes or self._invalidated_since(entry.tags, epoch):
+                return
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def refresh_failed(self, key: bytes) -> None:
+        """
+        Lets the next stale hit retry the refresh of a result.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def invalidate_tag(self, tag: str) -> None:
+        """
+        Drops every result tagged with the tag, usually after writing to the table the tag is named after.
+        """
+        with self._lock:
+            self._epoch += 1
+            self._tag_epochs[tag] = self._epoch
+            for key in list(self._tags.get(tag, ())):
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_thing(self, thing: Union[str, RecordID, Table]) -> None:
+        """
+        Drops every result tagged with the table of a thing after the connection writes to it.
+        """
+        table = thing_table(thing)
+        if table is None:
+            self.clear()
+        else:
+            self.invalidate_tag(table)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            # every tag is invalidated at once, so their own epochs are no longer needed
+            self._cleared_epoch = self._epoch
+            self._tag_epochs.clear()
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> QueryCacheStats:
+        with self._lock:
+            return QueryCacheStats(
+                size=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                stale_hits=self.stale_hits,
+                misses=self.misses,
+                refreshes=self.refreshes,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                invalidations=self.invalidations,
+            )
+
+    def _invalidated_since(self, tags: Tuple[str, ...], epoch: int) -> bool:
+        if self._cleared_epoch > epoch:
+            return True
+        return any(self._tag_epochs.get(tag, 0) > epoch for tag in tags)
+
+    def _discard(self, key: bytes) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def cacheable(response: dict) -> bool:
+    """
+    Whether a query response can be cached, which is only the case if every statement succeeded.
+    """
+    return all(statement.get("status") == "OK" for statement in response["result"])
+
+
+async def cached_query_async(
+        cache: QueryCache,
+        key: bytes,
+        fetch: Callable[[], Awaitable[dict]],
+        ttl: Optional[float],
+        tags: Iterable[str],
+        background: bool,
+) -> Any:
+    """
+    Returns the result of the first statement of a query from the cache, running the query on a miss.
+
+    :param cache: (QueryCache) the cache.
+    :param key: (bytes) the key of the query.
+    :param fetch: (Callable[[], Awaitable[dict]]) the coroutine function running the query and returning the response.
+    :param ttl: (Optional[float]) the seconds the result is fresh for, the cache's TTL if None.
+    :param tags: (Iterable[str]) the tags the result is invalidated by.
+    :param background: (bool) whether the query can run in the background to refresh a stale result.
+    :return: (Any) the result of the first statement.
+    """
+    tags = tuple(tags)
+    data, refresh = cache.lookup(key, background)
+    if data is not None:
+        if refresh:
+            task = asyncio.ensure_future(_refresh_async(cache, key, fetch, ttl, tags))
+            cache._tasks.add(task)
+            task.add_done_callback(cache._tasks.discard)
+        return decode(data)
+    epoch = cache.epoch
+    response = await fetch()
+    if cacheable(response):
+        cache.put(key, response["result"][0]["result"], epoch, ttl, tags)
+    return response["result"][0]["result"]
+
+
+async def _refresh_async(
+        cache: QueryCache, key: bytes, fetch: Callable[[], Awaitable[dict]], ttl: Optional[float], tags: Tuple[str, ...]
+) -> None:
+    epoch = cache.epoch
+    try:
+        response = await fetch()
+    except Exception:
+        cache.refresh_failed(key)
+        return
+    if cacheable(response):
+        cache.put(key, response["result"][0]["result"], epoch, ttl, tags)
+    else:
+        cache.refresh_failed(key)
+
+
+def cached_query(
+        cache: QueryCache,
+        key: bytes,
+        fetch: Callable[[], dict],
+        ttl: Optional[float],
+        tags: Iterable[str],
+        background: bool,
+) -> Any:
+    """
+    Returns the result of the first statement of a query from the cache, running the query on a miss.
+    A stale result is refreshed by a background thread.
+
+    :param cache: (QueryCache) the cache.
+    :param key: (bytes) the key of the query.
+    :param fetch: (Callable[[], dict]) the function running the query and returning the response.
+    :param ttl: (Optional[float]) the seconds the result is fresh for, the cache's TTL if None.
+    :param tags: (Iterable[str]) the tags the result is invalidated by.
+    :param background: (bool) whether the query can run in another thread to refresh a stale result.
+    :return: (Any) the result of the first statement.
+    """
+    tags = tuple(tags)
+    data, refresh = cache.lookup(key, background)
+    if data is not None:
+        if refresh:
+            threading.Thread(
+                target=_refresh, args=(cache, key, fetch, ttl, tags), name="surrealdb-query-cache", daemon=True
+            ).start()
+        return decode(data)
+    epoch = cache.epoch
+    response = fetch()
+    if cacheable(response):
+        cache.put(key, response["result"][0]["result"], epoch, ttl, tags)
+    return response["result"][0]["result"]
+
+
+def _refresh(
+        cache: QueryCache, key: bytes, fetch: Callable[[], dict], ttl: Optional[float], tags: Tuple[str, ...]
+) -> None:
+    epoch = cache.epoch
+    try:
+        response = fetch()
+    except Exception:
+        cache.refresh_failed(key)
+        return
+    if cacheable(response):
+        cache.put(key, response["result"][0]["result"], epoch, ttl, tags)
+    else:
+        cache.refresh_failed(key)
+
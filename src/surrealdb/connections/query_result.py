@@ -0,0 +1,146 @@
+"""
+Defines the per-statement results returned by query_many.
+"""
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, List, Optional
+
+from surrealdb.data.types.duration import Duration, UNITS
+
+# matches one part of a server time such as "1.5ms" or "12.3µs"
+TIME_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ns|µs|us|ms|s|m|h|d|w)")
+
+
+def parse_server_time(value: Optional[str]) -> Optional[Duration]:
+    """
+    Parses the time a statement took as reported by the server, for instance "1.020958ms".
+
+    :param value: (Optional[str]) the time reported by the server.
+    :return: (Optional[Duration]) the time as a duration, None if the server did not report one.
+    """
+    if not value:
+        return None
+    parts = TIME_PART_PATTERN.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        raise ValueError(f"unable to parse server time: {value}")
+    elapsed = 0
+    for number, unit in parts:
+        elapsed += int(Decimal(number) * UNITS["us" if unit == "µs" else unit])
+    return Duration(elapsed)
+
+
+class StatementError(Exception):
+    """
+    Raised when the result of a statement that failed is used.
+
+    Attributes:
+        index: The position of the statement in the query.
+        message: The error returned by the server for the statement.
+    """
+
+    def __init__(self, index: int, message: Any) -> None:
+        super().__init__(f"error in statement {index}: {message}")
+        self.index = index
+        self.message = message
+
+
+@dataclass(frozen=True)
+class StatementResult:
+    """
+    The outcome of one statement of a query.
+
+    Attributes:
+        index: The position of the statement in the query.
+        result: The result of the statement, or the error message if the statement failed.
+        status: The status reported by the server, "OK" or "ERR".
+        time: The time the statement took as reported by the server, for instance "1.020958ms".
+    """
+    index: int
+    result: Any
+    status: str
+    time: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether the statement succeeded.
+        """
+        return self.status == "OK"
+
+    @property
+    def error(self) -> Optional[str]:
+        """
+        The error message of the statement if it failed.
+        """
+        return None if self.ok else self.result
+
+    @property
+    def duration(self) -> Optional[Duration]:
+        """
+        The time the statement took as a Duration.
+        """
+        return parse_server_time(self.time)
+
+    def unwrap(self) -> Any:
+        """
+        Returns the result of the statement, raising a StatementError if it failed.
+        """
+        if not self.ok:
+            raise StatementError(self.index, self.result)
+        return self.result
+
+
+class QueryResults(List[StatementResult]):
+    """
+    The results of every statement of a query, in the order of the statements.
+
+    Errors are only raised when asked for, with `raise_for_errors()`, `values()` or `StatementResult.unwrap()`.
+    """
+
+    @staticmethod
+    def from_response(statements: List[dict]) -> "QueryResults":
+        return QueryResults(
+            StatementResult(index, statement.get("result"), statement.get("status"), statement.get("time"))
+            for index, statement in enumerate(statements)
+        )
+
+    @property
+    def ok(self) -> bool:
+        """
+        Whether every statement succeeded.
+        """
+        return all(statement.ok for statement in self)
+
+    @property
+    def errors(self) -> List[StatementResult]:
+        """
+        The statements that failed.
+        """
+        return [statement for statement in self if not statement.ok]
+
+    @property
+    def total_time(self) -> Duration:
+        """
+        The sum of the times of the statements as reported by the server.
+        """
+        elapsed = 0
+        for statement in self:
+            duration = statement.duration
+            if duration is not None:
+                elapsed += duration.elapsed
+        return Duration(elapsed)
+
+    def raise_for_errors(self) -> "QueryResults":
+        """
+        Raises a StatementError for the first statement that failed, returns the results otherwise.
+        """
+        for statement in self:
+            statement.unwrap()
+        return self
+
+    def values(self) -> List[Any]:
+        """
+        Returns the result of every statement, raising a StatementError if any statement failed.
+        """
+        return [statement.unwrap() for statement in self]
@@ -0,0 +1,236 @@
+"""
+A read-through cache of records for the select methods of the websocket connections.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
+
+from surrealdb.data.cbor import decode, encode
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+DEFAULT_RECORD_CACHE_SIZE: int = 10_000
+
+# the IDs of "table:id" strings that are cached, parsed the way the database parses them
+INTEGER_ID_PATTERN = re.compile(r"-?\d+")
+STRING_ID_PATTERN = re.compile(r"\w+")
+
+RecordKey = Tuple[str, Union[int, str]]
+
+
+def record_cache_key(thing: Any) -> Optional[RecordKey]:
+    """
+    Returns the cache key of a single record, None if thing is not a record that can be cached.
+
+    "user:123" is the record with the integer ID 123, like RecordID("user", 123), and is not the same record
+    as RecordID("user", "123"). Records with array, object or escaped IDs are not cached.
+
+    :param thing: (Any) the thing passed to select.
+    :return: (Optional[RecordKey]) the table name and the ID of the record.
+    """
+    if isinstance(thing, RecordID):
+        if isinstance(thing.id, bool) or not isinstance(thing.id, (int, str)):
+            return None
+        return thing.table_name, thing.id
+    if isinstance(thing, str) and ":" in thing:
+        table, identifier = thing.split(":", 1)
+        if INTEGER_ID_PATTERN.fullmatch(identifier):
+            return table, int(identifier)
+        if STRING_ID_PATTERN.fullmatch(identifier):
+            return table, identifier
+    return None
+
+
+@dataclass(frozen=True)
+class RecordCacheStats:
+    """
+    A snapshot of the counters of a record cache.
+
+    Attributes:
+        size: The number of cached records.
+        max_size: The maximum number of cached records.
+        hits: The number of selects served from the cache.
+        misses: The number of selects sent to the database, including expired records.
+        evictions: The number of records evicted to stay within max_size.
+        expirations: The number of records dropped because their TTL passed.
+        invalidations: The number of records dropped because they changed.
+    """
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class RecordCache:
+    """
+    A size-bounded LRU cache of records with an optional TTL, safe to use across threads.
+
+    Records are stored encoded so every hit returns a new copy the caller is free to modify. A record is
+    only stored if nothing in its table was invalidated while it was being selected, so a change notified
+    during the select can't leave a stale record behind, while changes to other tables don't keep it out.
+
+    Attributes:
+        max_size: The maximum number of cached records, the least recently used record is evicted first.
+        ttl: The seconds a record is cached for, None caches records until they change or are evicted.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_RECORD_CACHE_SIZE, ttl: Optional[float] = None) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[RecordKey, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._tables: Dict[str, Set[RecordKey]] = {}
+        self._epoch: int = 0
+        # the epoch of the last invalidation in each table, and of the last clear()
+        self._table_epochs: Dict[str, int] = {}
+        self._cleared_epoch: int = 0
+
+    @property
+    def epoch(self) -> int:
+        """
+        Changes every time a record is invalidated, read it before selecting a record and pass it to put().
+        """
+        return self._epoch
+
+    def _invalidated_since(self, table: str, epoch: int) -> bool:
+        return self._cleared_epoch > epoch or self._table_epochs.get(table, 0) > epoch
+
+    def get(self, key: RecordKey) -> Tuple[bool, Any]:
+        """
+        Returns whether the record is cached and a copy of the record, which is None for a missing record.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, decode(entry[1])
+
+    def put(self, key: RecordKey, record: Any, epoch: int) -> None:
+        """
+        Caches a record unless a record of its table was invalidated since the epoch was read.
+        """
+        encoded = encode(record)
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if self._invalidated_since(key[0], epoch):
+                return
+            self._entries[key] = (expires, encoded)
+            self._entries.move_to_end(key)
+            self._tables.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: RecordKey) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._table_epochs[key[0]] = self._epoch
+            if key in self._entries:
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_table(self, table: str) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._table_epochs[table] = self._epoch
+            for key in list(self._tables.get(table, ())):
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_thing(self, thing: Union[str, RecordID, Table]) -> None:
+        """
+        Drops a record, or every record of a table, after the connection writes to it.
+        """
+        key = record_cache_key(thing)
+        if key is not None:
+            self.invalidate(key)
+        elif isinstance(thing, RecordID):
+            self.invalidate_table(thing.table_name)
+        elif isinstance(thing, Table):
+            self.invalidate_table(thing.table_name)
+        elif isinstance(thing, str):
+            self.invalidate_table(thing.split(":", 1)[0])
+        else:
+            self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            # every table is invalidated at once, so their own epochs are no longer needed
+            self._cleared_epoch = self._epoch
+            self._table_epochs.clear()
+            self._entries.clear()
+            self._tables.clear()
+
+    def stats(self) -> RecordCacheStats:
+        with self._lock:
+            return RecordCacheStats(
+                size=len(self._entries),
+                max_size=self.max_size,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                invalidations=self.invalidations,
+            )
+
+    def _discard(self, key: RecordKey) -> None:
+        del self._entries[key]
+        keys = self._tables.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tables[key[0]]
+
+
+class RecordCacheWatcher:
+    """
+    Takes the place of the queue of a live query on a cached table, invalidating records as the database
+    notifies changes to them. Closing the watcher, when the live query is killed or the connection drops,
+    invalidates the whole table since changes can no longer be seen.
+
+    Attributes:
+        cache: The cache to invalidate.
+        table: The name of the watched table.
+    """
+
+    def __init__(self, cache: RecordCache, table: str, on_close: Callable[[str], None]) -> None:
+        self.cache: RecordCache = cache
+        self.table: str = table
+        self._on_close = on_close
+
+    def put(self, notification: dict) -> None:
+        record = notification.get("result")
+        key = record_cache_key(record.get("id")) if isinstance(record, dict) else None
+        if key is not None:
+            self.cache.invalidate(key)
+        else:
+            self.cache.invalidate_table(self.table)
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        self.cache.invalidate_table(self.table)
+        self._on_close(self.table)
+
+    def stats(self) -> None:
+        return None
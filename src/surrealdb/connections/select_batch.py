@@ -0,0 +1,138 @@
+"""
+Batches the concurrent single record selects of an async connection into one query, like a DataLoader.
+"""
+import asyncio
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from surrealdb.connections.live import record_key
+from surrealdb.data.types.record_id import RecordID
+
+DEFAULT_SELECT_BATCH_SIZE: int = 1000
+
+# the name of the query variable holding the IDs of a batch, prefixed so it does not clash with the session's variables
+SELECT_BATCH_VARIABLE: str = "select_batch_ids"
+
+SELECT_BATCH_QUERY: str = f"SELECT * FROM ${SELECT_BATCH_VARIABLE};"
+
+
+@dataclass(frozen=True)
+class SelectBatchStats:
+    """
+    A snapshot of the counters of a select batcher.
+
+    Attributes:
+        requests: The number of selects made through the batcher.
+        batches: The number of queries sent for the selects.
+        records: The number of distinct records selected, a record selected twice in a batch is selected once.
+        pending: The number of records waiting for the next batch.
+    """
+    requests: int
+    batches: int
+    records: int
+    pending: int
+
+
+class SelectBatcher:
+    """
+    Collects the records selected during a window and selects them with one `SELECT * FROM $ids` query,
+    resolving every caller with its record, or None if the record does not exist.
+
+    The window opens with the first select and a batch is sent early once it holds max_size records. A
+    failed query fails every select of its batch. A record selected more than once in a batch is only
+    selected once, and every caller after the first gets a deep copy of it to modify freely.
+
+    Attributes:
+        window: The seconds selects are collected for before the batch is sent, 0 for the current loop iteration.
+        max_size: The maximum number of records selected by one query.
+    """
+
+    def __init__(
+            self,
+            load: Callable[[List[RecordID]], Awaitable[List[dict]]],
+            window: float,
+            max_size: int = DEFAULT_SELECT_BATCH_SIZE,
+    ) -> None:
+        """
+        The constructor for the SelectBatcher class.
+
+        :param load: (Callable[[List[RecordID]], Awaitable[List[dict]]]) selects the records of a batch.
+        :param window: (float) the seconds selects are collected for before the batch is sent.
+        :param max_size: (int) the maximum number of records selected by one query.
+        """
+        if window < 0:
+            raise ValueError(f"window can't be negative, got {window}")
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+        self.window: float = window
+        self.max_size: int = max_size
+        self.requests: int = 0
+        self.batches: int = 0
+        self.records: int = 0
+        self._load = load
+        # the futures of every caller waiting for a record, by record
+        self._pending: Dict[Hashable, Tuple[RecordID, List[asyncio.Future]]] = {}
+        self._timer: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Future] = set()
+
+    async def select(self, record_id: RecordID) -> Optional[dict]:
+        """
+        Selects a record with the next batch.
+
+        :param record_id: (RecordID) the ID of the record.
+        :return: (Optional[dict]) the record, None if it does not exist.
+        """
+        self.requests += 1
+        key = record_key(record_id)
+        # every caller has its own future, so a cancelled caller does not cancel the record for the others
+        future = asyncio.get_running_loop().create_future()
+        entry = self._pending.get(key)
+        if entry is not None:
+            entry[1].append(future)
+        else:
+            self._pending[key] = (record_id, [future])
+            if len(self._pending) >= self.max_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def stats(self) -> SelectBatchStats:
+        return SelectBatchStats(
+            requests=self.requests, batches=self.batches, records=self.records, pending=len(self._pending)
+        )
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self.batches += 1
+        self.records += len(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: Dict[Hashable, Tuple[RecordID, List[asyncio.Future]]]) -> None:
+        try:
+            records = await self._load([record_id for record_id, _ in batch.values()])
+        except Exception as error:
+            for _, futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+        found: Dict[Hashable, Any] = {}
+        for record in records or []:
+            if isinstance(record, dict):
+                found[record_key(record.get("id"))] = record
+        for key, (_, futures) in batch.items():
+            record = found.get(key)
+            for future in futures:
+                if not future.done():
+                    future.set_result(record)
+                    # the callers after the first get their own copy, so changing one record changes no other
+                    record = deepcopy(record)
@@ -0,0 +1,130 @@
+"""
+Shares one request between identical reads that are in flight at the same time on an async connection.
+"""
+import asyncio
+import hashlib
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from surrealdb.connections.query_cache import canonical
+from surrealdb.data.cbor import encode
+
+# the methods that can be coalesced
+SINGLE_FLIGHT_METHODS = frozenset({"query", "select"})
+
+
+def single_flight_key(method: str, *args: Any) -> bytes:
+    """
+    Returns the key identical requests share, a hash of the method and of its canonically encoded arguments.
+
+    :param method: (str) the name of the method.
+    :param args: (Any) the arguments of the request, including the session state the result depends on.
+    :return: (bytes) the key of the request.
+    """
+    digest = hashlib.blake2b(method.encode("utf-8"), digest_size=16)
+    digest.update(b"\x00")
+    digest.update(encode(canonical(list(args))))
+    return digest.digest()
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """
+    A snapshot of the counters of a single-flight group.
+
+    Attributes:
+        requests: The number of requests made through the group.
+        shared: The number of requests that joined an identical request in flight instead of being sent.
+        in_flight: The number of requests currently in flight.
+    """
+    requests: int
+    shared: int
+    in_flight: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of requests that were not sent, 0.0 before the first request.
+        """
+        return self.shared / self.requests if self.requests else 0.0
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent requests: the first caller sends the request and every identical call
+    made before its response arrives awaits the same response. The caller that sent the request gets the
+    decoded result and every caller that joined it gets a deep copy, so callers are free to modify results.
+
+    The request runs in its own task and every caller waits on its own future, so cancelling a caller,
+    including the one that sent the request, doesn't cancel it for the others.
+
+    Attributes:
+        methods: The names of the methods coalesced unless a call asks otherwise.
+    """
+
+    def __init__(self, methods: Iterable[str] = ()) -> None:
+        methods = frozenset(methods)
+        unknown = methods - SINGLE_FLIGHT_METHODS
+        if unknown:
+            raise ValueError(f"methods can't be coalesced: {', '.join(sorted(unknown))}")
+        self.methods: frozenset = methods
+        self.requests: int = 0
+        self.shared: int = 0
+        # the task of every request in flight and the futures of the callers waiting for it
+        self._calls: Dict[bytes, Tuple[asyncio.Future, List[asyncio.Future]]] = {}
+
+    def enabled(self, method: str, single_flight: Any) -> bool:
+        """
+        Whether a call is coalesced, the per-call flag wins over the methods of the group.
+        """
+        return method in self.methods if single_flight is None else bool(single_flight)
+
+    async def do(self, key: bytes, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the result of the request in flight for the key, sending it with fetch if there is none.
+
+        :param key: (bytes) the key of the request, see single_flight_key.
+        :param fetch: (Callable[[], Awaitable[Any]]) the coroutine function sending the request.
+        :return: (Any) the result of the request, a deep copy of it for a caller that joined the request.
+        """
+        self.requests += 1
+        future = asyncio.get_running_loop().create_future()
+        call = self._calls.get(key)
+        if call is None:
+            call = (asyncio.ensure_future(fetch()), [future])
+            self._calls[key] = call
+            call[0].add_done_callback(lambda done: self._done(key, call))
+        else:
+            self.shared += 1
+            call[1].append(future)
+        return await future
+
+    def forget(self) -> None:
+        """
+        Stops requests in flight from being joined, so a read made after a write is sent after it.
+        """
+        self._calls.clear()
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(requests=self.requests, shared=self.shared, in_flight=len(self._calls))
+
+    def _done(self, key: bytes, call: Tuple[asyncio.Future, List[asyncio.Future]]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        task, futures = call
+        futures = [future for future in futures if not future.done()]
+        if task.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+        # copied before any caller resumes, so no caller can see another caller's changes
+        result = task.result()
+        for future in futures:
+            future.set_result(result)
+            result = deepcopy(result)
@@ -1,8 +1,18 @@
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterable, Generator
 from uuid import UUID
 from asyncio import Queue
 from surrealdb.data.types.record_id import RecordID
 from surrealdb.data.types.table import Table
+from surrealdb.connections.live import DEFAULT_LIVE_BATCH_SIZE, DEFAULT_LIVE_BATCH_WINDOW
+from surrealdb.connections.pagination import DEFAULT_PAGE_SIZE
+from surrealdb.connections.columns import Columns
+from surrealdb.connections.query_result import QueryResults
+from surrealdb.connections.bulk_insert import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_IN_FLIGHT,
+    InsertManyResult,
+)
 
 
 class SyncTemplate:
@@ -133,22 +143,89 @@ class SyncTemplate:
         raise NotImplementedError(f"let not implemented for: {self}")
 
     def query(
-        self, query: str, vars: Optional[Dict] = None
+        self,
+        query: str,
+        vars: Optional[Dict] = None,
+        cache: bool = False,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
     ) -> Union[List[dict], dict]:
         """Run a set of SurrealQL statements against the database.
 
         Args:
             query: Specifies the SurrealQL statements.
             vars: Assigns variables which can be used in the query.
+            cache: Reads the result through the query cache of the connection, if it has one. Only results
+                of queries whose every statement succeeded are cached.
+            ttl: The seconds the result is fresh for, the TTL of the cache if None.
+            tags: The tags the result is dropped by, see `QueryCache.invalidate_tag`. The connection's own
+                writes drop the results tagged with the table written to.
 
         Example:
             db.query(
                 'CREATE person SET name = "John"; SELECT * FROM type::table($tb);',
                 { tb: 'person' }
             )
+            db.query('SELECT * FROM person;', cache=True, ttl=30, tags=['person'])
         """
         raise NotImplementedError(f"query not implemented for: {self}")
 
+    def query_many(
+        self, query: str, params: Optional[Dict] = None, raise_on_error: bool = False
+    ) -> QueryResults:
+        """Run several SurrealQL statements in one round trip and return the outcome of every statement.
+
+        Unlike `query`, which only returns the result of the first statement, this returns one StatementResult
+        per statement with its result, status and the time the server took to run it. A failed statement does
+        not raise until its result is unwrapped, unless raise_on_error is set.
+
+        Args:
+            query: Specifies the SurrealQL statements.
+            params: Assigns variables which can be used in the query.
+            raise_on_error: Raise a StatementError for the first statement that failed.
+
+        Example:
+            results = db.query_many(
+                'CREATE person SET name = "John"; SELECT * FROM type::table($tb);',
+                { 'tb': 'person' }
+            )
+            created, people = results.values()
+            print(results[1].duration)
+        """
+        raise NotImplementedError(f"query_many not implemented for: {self}")
+
+    def query_columns(self, query: str, params: Optional[Dict] = None, statement: int = 0) -> Columns:
+        """Run a set of SurrealQL statements and decode the rows of one statement straight into columns.
+
+        Every row is decoded on its own into one NumPy array per field, so the list of row dicts is never
+        built: numbers become int64 or float64 arrays, datetimes datetime64[ns], durations timedelta64[ns]
+        and record IDs "table:id" strings. Needs NumPy, and pandas for to_dataframe.
+
+        Args:
+            query: Specifies the SurrealQL statements.
+            params: Assigns variables which can be used in the query.
+            statement: The position of the statement whose rows are decoded, -1 for the last one.
+
+        Example:
+            columns = db.query_columns('SELECT name, age, created FROM person')
+            print(columns['age'].mean())
+            people = columns.to_dataframe(record_ids='category')
+        """
+        raise NotImplementedError(f"query_columns not implemented for: {self}")
+
+    def select_columns(self, thing: Union[str, RecordID, Table]) -> Columns:
+        """Select all records in a table (or other entity), or a specific record, straight into columns.
+
+        Like `select`, with the records decoded into one NumPy array per field as `query_columns` does.
+
+        Args:
+            thing: The table or record ID to select.
+
+        Example:
+            people = db.select_columns('person').to_dataframe()
+        """
+        raise NotImplementedError(f"select_columns not implemented for: {self}")
+
     def select(self, thing: Union[str, RecordID, Table]) -> Union[List[dict], dict]:
         """Select all records in a table (or other entity),
         or a specific record, in the database.
@@ -164,6 +241,34 @@ class SyncTemplate:
         """
         raise NotImplementedError(f"select not implemented for: {self}")
 
+    def select_iter(
+        self,
+        table: Union[str, Table],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Union[str, List[str]]] = None,
+        where: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Generator[dict, None, None]:
+        """
+        Streams the records of a table page by page instead of selecting the whole table at once.
+
+        Pages are selected with keyset pagination on the record ID (`WHERE id > $last ORDER BY id LIMIT n`), so
+        no page is slower than the first and at most two pages are held in memory. When the connection can carry
+        concurrent requests the next page is fetched while the caller consumes the current one.
+
+        Args:
+            table: The table name to select records from
+            page_size: The maximum number of records selected per page
+            fields: The fields to select, all fields if not set. The id is always selected
+            where: A condition the records have to match, such as `age > $min_age`
+            params: The variables used in the where condition
+
+        Example:
+            for row in db.select_iter('person', page_size=500, where='age > $age', params={'age': 18}):
+                print(row)
+        """
+        raise NotImplementedError(f"select_iter not implemented for: {self}")
+
     def create(
         self,
         thing: Union[str, RecordID, Table],
@@ -368,20 +473,64 @@ class SyncTemplate:
         """
         raise NotImplementedError(f"insert_relation not implemented for: {self}")
 
-    def live(self, table: Union[str, Table], diff: bool = False) -> UUID:
+    def insert_many(
+        self,
+        table: Union[str, Table],
+        rows: Iterable[dict],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        continue_on_error: bool = False,
+    ) -> InsertManyResult:
+        """
+        Inserts records from any iterable in batches cut by row count and by encoded size.
+
+        Rows are encoded once as they are read, so the iterable can be a generator over more rows than fit
+        in memory. Batches are pipelined with up to max_in_flight inserts awaiting a response when the
+        connection can carry concurrent requests, and sent one after the other otherwise.
+
+        Args:
+            table: The table name to insert records in to
+            rows: The documents/records to insert
+            batch_size: The maximum number of rows sent in one insert
+            max_bytes: The maximum encoded size in bytes of the rows sent in one insert
+            max_in_flight: The maximum number of inserts awaiting a response at once
+            continue_on_error: Keep sending batches after a batch fails instead of raising InsertManyError
+
+        Example:
+            result = db.insert_many('person', ({'name': name} for name in names), batch_size=500)
+            print(result.inserted, result.errors)
+        """
+        raise NotImplementedError(f"insert_many not implemented for: {self}")
+
+    def live(
+            self,
+            table: Union[str, Table],
+            diff: bool = False,
+            fields: Optional[Union[str, List[str]]] = None,
+            where: Optional[str] = None,
+            params: Optional[Dict[str, Any]] = None,
+    ) -> UUID:
         """Initiates a live query for a specified table name.
 
+        If fields or where are given the live query is started with a LIVE SELECT statement, so the
+        database only sends notifications for the matching records with the selected fields.
+
         Args:
             table: The table name to listen for changes for.
             diff: If set to true, live notifications will include
             an array of JSON Patch objects, rather than
             the entire record for each notification. Defaults to false.
+            fields: The fields to include in notifications, all fields if unset. Can't be used with diff.
+            where: A condition the changed records have to match to be notified.
+            params: The variables used in the where condition.
 
         Returns:
             The live query uuid
 
         Example:
             db.live('person')
+            db.live('person', fields=['name', 'age'], where='age > $min_age', params={'min_age': 18})
         """
         raise NotImplementedError(f"live not implemented for: {self}")
 
@@ -399,6 +548,30 @@ class SyncTemplate:
         """
         raise NotImplementedError(f"subscribe_live not implemented for: {self}")
 
+    def subscribe_live_batches(
+            self,
+            query_uuid: Union[str, UUID],
+            max_size: int = DEFAULT_LIVE_BATCH_SIZE,
+            window: float = DEFAULT_LIVE_BATCH_WINDOW,
+    ) -> Generator[List[dict], None, None]:
+        """Yields the notifications of a running live query in batches with one notification per changed record.
+
+        A batch is collected from its first notification until max_size notifications are received or the
+        window passes. Notifications for the same record are collapsed to its latest state, and a record
+        created and deleted within the batch is left out.
+
+        Args:
+            query_uuid: The uuid for the live query
+            max_size: The maximum number of notifications collected in a batch.
+            window: The maximum number of seconds a batch is collected for.
+
+        Example:
+            for batch in db.subscribe_live_batches(UUID, window=0.5):
+                for notification in batch:
+                    print(notification['action'], notification['result'])
+        """
+        raise NotImplementedError(f"subscribe_live_batches not implemented for: {self}")
+
     def kill(self, query_uuid: Union[str, UUID]) -> None:
         """Kills a running live query by it's UUID.
 
@@ -1,22 +1,68 @@
 """
 Defines a compact representation of datetime using nanoseconds.
+
+The conversions only use integer arithmetic so no nanosecond is lost, and the batch conversions to and from
+NumPy, datetime and ISO 8601 strings handle whole sequences of values in one call.
 """
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Tuple
-import pytz  # type: ignore
-from math import floor
+import re
+from datetime import date, datetime, time, timedelta, timezone
+from functools import total_ordering
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from surrealdb.data.types.frozen import Frozen
+
+NANOSECONDS_PER_SECOND = 1_000_000_000
+
+NANOSECONDS_PER_DAY = 86_400 * NANOSECONDS_PER_SECOND
+
+# the value NumPy uses for NaT in a datetime64[ns] array viewed as int64
+NAT = -2 ** 63
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_EPOCH_ORDINAL = _EPOCH.toordinal()
 
+_DEFAULT_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
-@dataclass
-class DateTimeCompact:
+_ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,9}))?(Z|[+-]\d{2}:\d{2})?",
+    re.IGNORECASE,
+)
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            "numpy is needed for this conversion, install it with: pip install surrealdb[numpy]"
+        ) from error
+    return numpy
+
+
+@total_ordering
+class DateTimeCompact(Frozen):
     """
     Represents a compact datetime object stored as a single integer value in nanoseconds.
+    Instances are immutable, hashable and ordered by time.
 
     Attributes:
         timestamp: The number of nanoseconds since the epoch (1970-01-01T00:00:00Z).
     """
-    timestamp: int = 0  # nanoseconds
+
+    __slots__ = ("timestamp",)
+
+    def __init__(self, timestamp: int = 0) -> None:
+        """
+        Initializes a DateTimeCompact object.
+
+        Args:
+            timestamp: The number of nanoseconds since the epoch.
+        """
+        _set_timestamp(self, timestamp)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(timestamp={self.timestamp!r})"
 
     @staticmethod
     def parse(seconds: int, nanoseconds: int) -> "DateTimeCompact":
@@ -30,7 +76,7 @@ class DateTimeCompact:
         Returns:
             A DateTimeCompact object representing the specified time.
         """
-        return DateTimeCompact(nanoseconds + (seconds * pow(10, 9)))
+        return DateTimeCompact(nanoseconds + seconds * NANOSECONDS_PER_SECOND)
 
     def get_seconds_and_nano(self) -> Tuple[int, int]:
         """
@@ -41,11 +87,9 @@ class DateTimeCompact:
                 - The number of seconds since the epoch.
                 - The remaining nanoseconds after the seconds.
         """
-        sec = floor(self.timestamp / pow(10, 9))
-        nsec = self.timestamp - (sec * pow(10, 9))
-        return sec, nsec
+        return divmod(self.timestamp, NANOSECONDS_PER_SECOND)
 
-    def get_date_time(self, fmt: str = "%Y-%m-%dT%H:%M:%S.%fZ") -> str:
+    def get_date_time(self, fmt: str = _DEFAULT_FORMAT) -> str:
         """
         Converts the timestamp into a formatted datetime string.
 
@@ -55,7 +99,174 @@ class DateTimeCompact:
         Returns:
             A string representation of the datetime in the specified format.
         """
-        return datetime.fromtimestamp(self.timestamp / pow(10, 9), pytz.UTC).strftime(fmt)
+        if fmt == _DEFAULT_FORMAT:
+            # the ISO 8601 string cut to microseconds, without going through strftime
+            return self.to_iso()[:-4] + "Z"
+        return self.to_datetime().strftime(fmt)
+
+    def to_datetime(self) -> datetime:
+        """
+        Converts the timestamp into a UTC datetime, dropping the nanoseconds below a microsecond.
+
+        Returns:
+            A timezone aware datetime.
+        """
+        return _EPOCH + timedelta(microseconds=self.timestamp // 1_000)
+
+    @staticmethod
+    def from_datetime(value: datetime) -> "DateTimeCompact":
+        """
+        Creates a DateTimeCompact object from a datetime. A naive datetime is taken to be in UTC.
+
+        Args:
+            value: The datetime to convert.
+
+        Returns:
+            A DateTimeCompact object representing the same time.
+        """
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - _EPOCH
+        return DateTimeCompact(
+            (delta.days * 86_400 + delta.seconds) * NANOSECONDS_PER_SECOND + delta.microseconds * 1_000
+        )
+
+    def to_iso(self) -> str:
+        """
+        Converts the timestamp into an ISO 8601 string in UTC with all nine digits of the nanoseconds, such as
+        2023-11-14T22:13:20.123456789Z.
+
+        Returns:
+            The ISO 8601 string.
+        """
+        days, nanoseconds = divmod(self.timestamp, NANOSECONDS_PER_DAY)
+        seconds, nanoseconds = divmod(nanoseconds, NANOSECONDS_PER_SECOND)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        day = date.fromordinal(_EPOCH_ORDINAL + days)
+        return f"{day.isoformat()}T{hours:02d}:{minutes:02d}:{seconds:02d}.{nanoseconds:09d}Z"
+
+    @staticmethod
+    def from_iso(value: str) -> "DateTimeCompact":
+        """
+        Creates a DateTimeCompact object from an ISO 8601 string with up to nine digits of fractional seconds,
+        such as 2023-11-14T22:13:20.123456789Z. A string without an offset is taken to be in UTC.
+
+        Args:
+            value: The ISO 8601 string.
+
+        Returns:
+            A DateTimeCompact object representing the same time.
+
+        Raises:
+            ValueError: If the string is not an ISO 8601 datetime.
+        """
+        match = _ISO_DATETIME.fullmatch(value)
+        if match is None:
+            raise ValueError(f"invalid ISO 8601 datetime: {value!r}")
+        year, month, day, hour, minute, second, fraction, offset = match.groups()
+        try:
+            days = date(int(year), int(month), int(day)).toordinal() - _EPOCH_ORDINAL
+            time(int(hour), int(minute), int(second))
+        except ValueError as error:
+            raise ValueError(f"invalid ISO 8601 datetime: {value!r}") from error
+        seconds = days * 86_400 + int(hour) * 3_600 + int(minute) * 60 + int(second)
+        if offset is not None and offset.upper() != "Z":
+            sign = -1 if offset[0] == "-" else 1
+            seconds -= sign * (int(offset[1:3]) * 3_600 + int(offset[4:6]) * 60)
+        nanoseconds = int(fraction.ljust(9, "0")) if fraction else 0
+        return DateTimeCompact(seconds * NANOSECONDS_PER_SECOND + nanoseconds)
+
+    @staticmethod
+    def to_numpy(values: Sequence[Optional["DateTimeCompact"]]) -> Any:
+        """
+        Converts DateTimeCompact objects into a NumPy datetime64[ns] array in one pass, None becoming NaT.
+
+        Args:
+            values: The DateTimeCompact objects or None.
+
+        Returns:
+            A NumPy datetime64[ns] array.
+        """
+        numpy = _numpy()
+        timestamps = (NAT if value is None else value.timestamp for value in values)
+        return numpy.fromiter(timestamps, dtype=numpy.int64, count=len(values)).view("datetime64[ns]")
+
+    @staticmethod
+    def from_numpy(values: Any) -> List[Optional["DateTimeCompact"]]:
+        """
+        Converts a NumPy datetime64 array of any unit into DateTimeCompact objects, NaT becoming None.
+
+        Args:
+            values: The NumPy datetime64 array.
+
+        Returns:
+            A list of DateTimeCompact objects or None.
+        """
+        timestamps = _numpy().asarray(values).astype("datetime64[ns]").view("int64").tolist()
+        return [None if timestamp == NAT else DateTimeCompact(timestamp) for timestamp in timestamps]
+
+    @staticmethod
+    def to_datetimes(values: Iterable[Optional["DateTimeCompact"]]) -> List[Optional[datetime]]:
+        """
+        Converts DateTimeCompact objects into UTC datetimes, dropping the nanoseconds below a microsecond.
+
+        Args:
+            values: The DateTimeCompact objects or None.
+
+        Returns:
+            A list of timezone aware datetimes or None.
+        """
+        return [None if value is None else _EPOCH + timedelta(microseconds=value.timestamp // 1_000)
+                for value in values]
+
+    @staticmethod
+    def from_datetimes(values: Iterable[Optional[datetime]]) -> List[Optional["DateTimeCompact"]]:
+        """
+        Converts datetimes into DateTimeCompact objects, naive datetimes being taken to be in UTC.
+
+        Args:
+            values: The datetimes or None.
+
+        Returns:
+            A list of DateTimeCompact objects or None.
+        """
+        from_datetime = DateTimeCompact.from_datetime
+        return [None if value is None else from_datetime(value) for value in values]
+
+    @staticmethod
+    def to_iso_strings(values: Sequence[Optional["DateTimeCompact"]]) -> List[Optional[str]]:
+        """
+        Converts DateTimeCompact objects into ISO 8601 strings like to_iso does, formatting them all at once
+        with NumPy when it is installed.
+
+        Args:
+            values: The DateTimeCompact objects or None.
+
+        Returns:
+            A list of ISO 8601 strings or None.
+        """
+        try:
+            numpy = _numpy()
+            timestamps = DateTimeCompact.to_numpy(values)
+        except (ImportError, OverflowError):
+            return [None if value is None else value.to_iso() for value in values]
+        strings = numpy.datetime_as_string(timestamps, unit="ns", timezone="UTC").tolist()
+        return [None if value is None else string for value, string in zip(values, strings)]
+
+    @staticmethod
+    def from_iso_strings(values: Iterable[Optional[str]]) -> List[Optional["DateTimeCompact"]]:
+        """
+        Converts ISO 8601 strings into DateTimeCompact objects like from_iso does.
+
+        Args:
+            values: The ISO 8601 strings or None.
+
+        Returns:
+            A list of DateTimeCompact objects or None.
+        """
+        from_iso = DateTimeCompact.from_iso
+        return [None if value is None else from_iso(value) for value in values]
 
     def __eq__(self, other: object) -> bool:
         """
@@ -70,3 +281,17 @@ class DateTimeCompact:
         if isinstance(other, DateTimeCompact):
             return self.timestamp == other.timestamp
         return False
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, DateTimeCompact):
+            return NotImplemented
+        return self.timestamp < other.timestamp
+
+    def __hash__(self) -> int:
+        return hash(self.timestamp)
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.timestamp,)
+
+
+_set_timestamp = DateTimeCompact.timestamp.__set__
@@ -1,6 +1,9 @@
-from dataclasses import dataclass
-from typing import Tuple, Union
-from math import floor, pow
+import re
+from datetime import timedelta
+from functools import total_ordering
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from surrealdb.data.types.frozen import Frozen
 
 UNITS = {
     "ns": 1,
@@ -13,9 +16,41 @@ UNITS = {
     "w": int(604800 * 1e9),
 }
 
-@dataclass
-class Duration:
-    elapsed: int = 0  # nanoseconds
+# the value NumPy uses for NaT in a timedelta64[ns] array viewed as int64
+NAT = -2 ** 63
+
+_ISO_DURATION = re.compile(
+    r"(-)?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)(?:[.,](\d{1,9}))?S)?)?",
+    re.IGNORECASE,
+)
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            "numpy is needed for this conversion, install it with: pip install surrealdb[numpy]"
+        ) from error
+    return numpy
+
+
+@total_ordering
+class Duration(Frozen):
+    """
+    An immutable length of time in nanoseconds, hashable and ordered by length.
+
+    Attributes:
+        elapsed: The length of time in nanoseconds.
+    """
+
+    __slots__ = ("elapsed",)
+
+    def __init__(self, elapsed: int = 0) -> None:
+        _set_elapsed(self, elapsed)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(elapsed={self.elapsed!r})"
 
     @staticmethod
     def parse(value: Union[str, int], nanoseconds: int = 0) -> "Duration":
@@ -32,15 +67,106 @@ class Duration:
             raise TypeError("Duration must be initialized with an int or str")
 
     def get_seconds_and_nano(self) -> Tuple[int, int]:
-        sec = floor(self.elapsed / UNITS["s"])
-        nsec = self.elapsed - (sec * UNITS["s"])
-        return sec, nsec
+        return divmod(self.elapsed, UNITS["s"])
+
+    def to_timedelta(self) -> timedelta:
+        """
+        Returns the duration as a timedelta, dropping the nanoseconds below a microsecond.
+        """
+        return timedelta(microseconds=self.elapsed // UNITS["us"])
+
+    @staticmethod
+    def from_timedelta(value: timedelta) -> "Duration":
+        return Duration((value.days * 86_400 + value.seconds) * UNITS["s"] + value.microseconds * UNITS["us"])
+
+    def to_iso(self) -> str:
+        """
+        Returns the duration as an ISO 8601 duration with up to nine digits of fractional seconds, such as
+        P1DT2H3M4.000000005S.
+        """
+        sign = "-" if self.elapsed < 0 else ""
+        seconds, nanoseconds = divmod(abs(self.elapsed), UNITS["s"])
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        time = "".join(f"{value}{unit}" for value, unit in ((hours, "H"), (minutes, "M")) if value)
+        if nanoseconds:
+            time += f"{seconds}.{nanoseconds:09d}".rstrip("0") + "S"
+        elif seconds or not (days or time):
+            time += f"{seconds}S"
+        return f"{sign}P{f'{days}D' if days else ''}{'T' + time if time else ''}"
+
+    @staticmethod
+    def from_iso(value: str) -> "Duration":
+        """
+        Parses an ISO 8601 duration made of weeks, days, hours, minutes and seconds with up to nine digits of
+        fractional seconds. Years and months have no fixed length and are not accepted.
+        """
+        match = _ISO_DURATION.fullmatch(value)
+        if match is None or not any(match.groups()[1:]):
+            raise ValueError(f"invalid ISO 8601 duration: {value!r}")
+        sign, weeks, days, hours, minutes, seconds, fraction = match.groups()
+        elapsed = (
+            int(weeks or 0) * UNITS["w"]
+            + int(days or 0) * UNITS["d"]
+            + int(hours or 0) * UNITS["h"]
+            + int(minutes or 0) * UNITS["m"]
+            + int(seconds or 0) * UNITS["s"]
+            + (int(fraction.ljust(9, "0")) if fraction else 0)
+        )
+        return Duration(-elapsed if sign else elapsed)
+
+    @staticmethod
+    def to_numpy(values: Sequence[Optional["Duration"]]) -> Any:
+        """
+        Converts durations into a NumPy timedelta64[ns] array in one pass, None becoming NaT.
+        """
+        numpy = _numpy()
+        elapsed = (NAT if value is None else value.elapsed for value in values)
+        return numpy.fromiter(elapsed, dtype=numpy.int64, count=len(values)).view("timedelta64[ns]")
+
+    @staticmethod
+    def from_numpy(values: Any) -> List[Optional["Duration"]]:
+        """
+        Converts a NumPy timedelta64 array of any unit into durations, NaT becoming None.
+        """
+        elapsed = _numpy().asarray(values).astype("timedelta64[ns]").view("int64").tolist()
+        return [None if value == NAT else Duration(value) for value in elapsed]
+
+    @staticmethod
+    def to_timedeltas(values: Iterable[Optional["Duration"]]) -> List[Optional[timedelta]]:
+        return [None if value is None else timedelta(microseconds=value.elapsed // UNITS["us"]) for value in values]
+
+    @staticmethod
+    def from_timedeltas(values: Iterable[Optional[timedelta]]) -> List[Optional["Duration"]]:
+        from_timedelta = Duration.from_timedelta
+        return [None if value is None else from_timedelta(value) for value in values]
+
+    @staticmethod
+    def to_iso_strings(values: Iterable[Optional["Duration"]]) -> List[Optional[str]]:
+        return [None if value is None else value.to_iso() for value in values]
+
+    @staticmethod
+    def from_iso_strings(values: Iterable[Optional[str]]) -> List[Optional["Duration"]]:
+        from_iso = Duration.from_iso
+        return [None if value is None else from_iso(value) for value in values]
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Duration):
             return self.elapsed == other.elapsed
         return False
 
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, Duration):
+            return NotImplemented
+        return self.elapsed < other.elapsed
+
+    def __hash__(self) -> int:
+        return hash(self.elapsed)
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.elapsed,)
+
     @property
     def nanoseconds(self) -> int:
         return self.elapsed
@@ -82,3 +208,6 @@ class Duration:
 
     def to_compact(self) -> list:
         return [self.elapsed // UNITS["s"]]
+
+
+_set_elapsed = Duration.elapsed.__set__
@@ -0,0 +1,70 @@
+"""
+Defines the base class of the immutable, slot based data types and how their values are hashed and ordered.
+"""
+from dataclasses import FrozenInstanceError
+from typing import Any, Hashable, Tuple
+from uuid import UUID
+
+
+class Frozen:
+    """
+    The base class of the data types. Instances have no __dict__ and can't be changed once built, so they
+    can be hashed, used as dict keys and put in sets.
+
+    Subclasses declare their attributes in __slots__ and set them in __init__ with the __set__ of the slot
+    descriptors, as assigning an attribute raises a FrozenInstanceError like a frozen dataclass does.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+
+def hashable(value: Any) -> Hashable:
+    """
+    Returns a hashable stand-in for a value, turning the lists and dicts of array and object IDs into
+    tuples and frozensets. Values that are equal get equal stand-ins.
+
+    Args:
+        value: The value to hash.
+
+    Returns:
+        The value itself if it is hashable, a hashable copy otherwise.
+    """
+    if isinstance(value, list):
+        return tuple(hashable(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((key, hashable(item)) for key, item in value.items())
+    return value
+
+
+# the position of each kind of value in the order of record IDs, numbers first then strings, UUIDs,
+# arrays and objects, which is how the database sorts them
+_NUMBER, _STRING, _UUID, _ARRAY, _OBJECT, _OTHER = range(6)
+
+
+def sort_key(value: Any) -> Tuple:
+    """
+    Returns a key ordering values of different types consistently, so IDs such as 1 and "a" can be compared.
+
+    Args:
+        value: The value to order.
+
+    Returns:
+        A tuple of the rank of the type of the value and the value, or its ordered items.
+    """
+    if isinstance(value, (int, float)):
+        return _NUMBER, value
+    if isinstance(value, str):
+        return _STRING, value
+    if isinstance(value, UUID):
+        return _UUID, value
+    if isinstance(value, (list, tuple)):
+        return _ARRAY, tuple(sort_key(item) for item in value)
+    if isinstance(value, dict):
+        return _OBJECT, tuple(sorted((key, sort_key(item)) for key, item in value.items()))
+    return _OTHER, repr(value)
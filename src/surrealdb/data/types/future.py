@@ -2,19 +2,33 @@
 Defines a simple Future class to hold a value of any type.
 """
 
-from dataclasses import dataclass
 from typing import Any
 
+from surrealdb.data.types.frozen import Frozen, hashable
 
-@dataclass
-class Future:
+
+class Future(Frozen):
     """
     Represents a placeholder for a value that may be unset or resolved in the future.
+    Futures are immutable and hashable.
 
     Attributes:
         value: The value held by the Future object. This can be of any type.
     """
-    value: Any
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        """
+        Initializes a Future object.
+
+        Args:
+            value: The value held by the Future object.
+        """
+        _set_value(self, value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(value={self.value!r})"
 
     def __eq__(self, other: object) -> bool:
         """
@@ -29,3 +43,12 @@ class Future:
         if isinstance(other, Future):
             return self.value == other.value
         return False
+
+    def __hash__(self) -> int:
+        return hash(hashable(self.value))
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.value,)
+
+
+_set_value = Future.value.__set__
@@ -1,9 +1,15 @@
 """
 Defines a unset of geometry classes for representing geometric shapes such as points, lines, polygons, and collections.
-"""
 
+Lines, polygons and the multi geometries keep the coordinates of all their points in one flat array of float64
+values, the longitude then the latitude of every point, instead of a GeometryPoint per point. Polygons and multi
+lines also keep the offset of every line in the points, and multi polygons the offset of every polygon in the
+lines, the layout GeoArrow uses. Their lists of points, lines and polygons are built from the array when accessed.
+"""
+from array import array
 from dataclasses import dataclass
-from typing import List, Tuple
+from itertools import chain
+from typing import Any, Iterable, List, Sequence, Tuple
 
 
 class Geometry:
@@ -12,6 +18,8 @@ class Geometry:
     and parsing them into specific geometry types.
     """
 
+    __slots__ = ()
+
     def get_coordinates(self):
         """
         Returns the coordinates of the geometry. Should be implemented by subclasses.
@@ -35,6 +43,8 @@ class GeometryPoint(Geometry):
         longitude: The longitude of the point.
         latitude: The latitude of the point.
     """
+    __slots__ = ("longitude", "latitude")
+
     longitude: float
     latitude: float
 
@@ -69,165 +79,348 @@ class GeometryPoint(Geometry):
         return False
 
 
-@dataclass
-class GeometryLine(Geometry):
+def _point_values(points: Iterable[Any]) -> Iterable[float]:
+    for point in points:
+        if isinstance(point, GeometryPoint):
+            yield point.longitude
+            yield point.latitude
+        else:
+            yield from point
+
+
+def _extend(coordinates: array, points: Sequence[Any]) -> None:
     """
-    Represents a line defined by two or more points.
+    Appends the longitude and latitude of points, given as GeometryPoints or (longitude, latitude) pairs, to
+    a flat array of coordinates. The pairs are unpacked by array.extend without a loop in Python.
+    """
+    start = len(coordinates)
+    try:
+        coordinates.extend(chain.from_iterable(points))
+    except TypeError:
+        # GeometryPoints, as decoded from points tagged one by one, are not iterable
+        del coordinates[start:]
+        coordinates.extend(_point_values(points))
+    if len(coordinates) - start != 2 * len(points):
+        del coordinates[start:]
+        raise ValueError(f"every point must be a longitude and a latitude: {points!r}")
+
+
+def _flat(coordinates: Any) -> array:
+    """
+    Returns flat coordinates as an array of float64 values, an array('d') as it is and a buffer of float64
+    values, such as a NumPy array, with a single copy.
+    """
+    if isinstance(coordinates, array) and coordinates.typecode == "d":
+        return coordinates
+    flat = array("d")
+    try:
+        view = memoryview(coordinates)
+    except TypeError:
+        flat.extend(coordinates)
+        return flat
+    if view.format == "d" and view.c_contiguous:
+        flat.frombytes(view.cast("B"))
+    else:
+        flat.extend(view.tolist())
+    return flat
+
+
+def _offsets(offsets: Iterable[int], length: int) -> array:
+    """
+    Returns offsets as an array of int64 values, checking they go from 0 to length without going back.
+    """
+    if not isinstance(offsets, array) or offsets.typecode != "q":
+        offsets = array("q", offsets)
+    if not offsets or offsets[0] != 0 or offsets[-1] != length:
+        raise ValueError(f"the offsets must go from 0 to {length}")
+    if any(end < start for start, end in zip(offsets, offsets[1:])):
+        raise ValueError("the offsets must not decrease")
+    return offsets
+
+
+def _pairs(coordinates: array) -> List[Tuple[float, float]]:
+    return list(zip(coordinates[0::2], coordinates[1::2]))
+
+
+def _to_numpy(coordinates: array) -> Any:
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("numpy is needed for to_numpy, install it with: pip install surrealdb[numpy]") from error
+    return numpy.frombuffer(coordinates, dtype=numpy.float64).reshape(-1, 2)
+
+
+class _PointArray(Geometry):
+    """
+    A geometry made of points, kept in a flat array of coordinates.
 
     Attributes:
-        geometry_points: A list of GeometryPoint objects defining the line.
+        coordinates: The longitude and latitude of every point, one after the other.
     """
-    geometry_points: List[GeometryPoint]
 
-    def __init__(self, point1: GeometryPoint, point2: GeometryPoint, *other_points: GeometryPoint) -> None:
+    __slots__ = ("coordinates",)
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Any) -> Any:
         """
-        The constructor for the GeometryLine class.
+        Creates the geometry from the flat coordinates of its points, without a GeometryPoint per point.
+
+        Args:
+            coordinates: The longitude and latitude of every point one after the other. An array('d') is kept
+                without being copied.
+
+        Returns:
+            The geometry.
+        """
+        geometry = cls.__new__(cls)
+        geometry.coordinates = _flat(coordinates)
+        if len(geometry.coordinates) % 2:
+            raise ValueError("the coordinates must be pairs of a longitude and a latitude")
+        return geometry
+
+    @property
+    def geometry_points(self) -> List[GeometryPoint]:
+        """
+        The points of the geometry, built from the coordinates. Changing the list does not change the geometry,
+        assign a new list of points instead.
         """
-        self.geometry_points = [point1, point2] + list(other_points)
+        return list(map(GeometryPoint, self.coordinates[0::2], self.coordinates[1::2]))
+
+    @geometry_points.setter
+    def geometry_points(self, points: Sequence[Any]) -> None:
+        coordinates = array("d")
+        _extend(coordinates, points)
+        self.coordinates = coordinates
+
+    def to_numpy(self) -> Any:
+        """
+        Returns the coordinates as a NumPy array of shape (points, 2) sharing the memory of the geometry.
+        """
+        return _to_numpy(self.coordinates)
 
     def get_coordinates(self) -> List[Tuple[float, float]]:
         """
-        Returns the coordinates of the line as a list of tuples.
+        Returns the coordinates of the points as a list of tuples.
 
         Returns:
             A list of (longitude, latitude) tuples.
         """
-        return [point.get_coordinates() for point in self.geometry_points]
+        return _pairs(self.coordinates)
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({", ".join(repr(geo) for geo in self.geometry_points)})'
 
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, self.__class__):
+            return self.coordinates == other.coordinates
+        return False
+
+    __hash__ = None
+
+
+class GeometryLine(_PointArray):
+    """
+    Represents a line defined by two or more points.
+
+    Attributes:
+        coordinates: The longitude and latitude of every point of the line, one after the other.
+        geometry_points: A list of GeometryPoint objects defining the line, built from the coordinates.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, point1: GeometryPoint, point2: GeometryPoint, *other_points: GeometryPoint) -> None:
+        """
+        The constructor for the GeometryLine class.
+        """
+        self.geometry_points = (point1, point2) + other_points
+
     @staticmethod
     def parse_coordinates(coordinates: List[Tuple[float, float]]) -> "GeometryLine":
         """
         Parses a list of coordinate tuples into a GeometryLine.
 
         Args:
-            coordinates: A list of tuples containing longitude and latitude.
+            coordinates: A list of tuples containing longitude and latitude, or of GeometryPoint objects.
 
         Returns:
             A GeometryLine object.
         """
-        return GeometryLine(*[GeometryPoint.parse_coordinates(point) for point in coordinates])
-
-    def __eq__(self, other: object) -> bool:
-        if isinstance(other, GeometryLine):
-            return self.geometry_points == other.geometry_points
-        return False
+        line = GeometryLine.__new__(GeometryLine)
+        line.geometry_points = coordinates
+        return line
 
 
-@dataclass
-class GeometryPolygon(Geometry):
+class GeometryMultiPoint(_PointArray):
     """
-    Represents a polygon defined by multiple lines.
+    Represents multiple points in 2D space.
 
     Attributes:
-        geometry_lines: A list of GeometryLine objects defining the polygon.
+        coordinates: The longitude and latitude of every point, one after the other.
+        geometry_points: A list of GeometryPoint objects, built from the coordinates.
     """
-    geometry_lines: List[GeometryLine]
-
-    def __init__(self, line1: GeometryLine, line2: GeometryLine, *other_lines: GeometryLine):
-        self.geometry_lines = [line1, line2] + list(other_lines)
 
-    def get_coordinates(self) -> List[List[Tuple[float, float]]]:
-        """
-        Returns the coordinates of the polygon as a list of lines, each containing a list of coordinate tuples.
-
-        Returns:
-            A list of lists of (longitude, latitude) tuples.
-        """
-        return [line.get_coordinates() for line in self.geometry_lines]
+    __slots__ = ()
 
-    def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({", ".join(repr(geo) for geo in self.geometry_lines)})'
+    def __init__(self, *geometry_points: GeometryPoint):
+        self.geometry_points = geometry_points
 
     @staticmethod
-    def parse_coordinates(coordinates: List[List[Tuple[float, float]]]) -> "GeometryPolygon":
+    def parse_coordinates(coordinates: List[Tuple[float, float]]) -> "GeometryMultiPoint":
         """
-        Parses a list of lines, each defined by a list of coordinate tuples, into a GeometryPolygon.
+        Parses a list of coordinate tuples into a GeometryMultiPoint.
 
         Args:
-            coordinates: A list of lists containing longitude and latitude tuples.
+            coordinates: A list of tuples containing longitude and latitude, or of GeometryPoint objects.
 
         Returns:
-            A GeometryPolygon object.
+            A GeometryMultiPoint object.
         """
-        return GeometryPolygon(*[GeometryLine.parse_coordinates(line) for line in coordinates])
+        return GeometryMultiPoint(*coordinates)
 
-    def __eq__(self, other: object) -> bool:
-        if isinstance(other, GeometryPolygon):
-            return self.geometry_lines == other.geometry_lines
-        return False
+
+def _pack_lines(lines: Iterable[Any]) -> Tuple[array, array]:
+    """
+    Packs lines, given as GeometryLines or lists of points, into flat coordinates and the offsets of the lines.
+    """
+    coordinates, offsets = array("d"), array("q", [0])
+    for line in lines:
+        if isinstance(line, _PointArray):
+            coordinates.extend(line.coordinates)
+        else:
+            _extend(coordinates, line)
+        offsets.append(len(coordinates) // 2)
+    return coordinates, offsets
 
 
-@dataclass
-class GeometryMultiPoint(Geometry):
+class _LineArray(Geometry):
     """
-    Represents multiple points in 2D space.
+    A geometry made of lines, kept in a flat array of the coordinates of their points and the offsets of the
+    lines in the points.
 
     Attributes:
-        geometry_points: A list of GeometryPoint objects.
+        coordinates: The longitude and latitude of every point of every line, one after the other.
+        offsets: The position of the first point of every line, then the number of points.
     """
-    geometry_points: List[GeometryPoint]
 
-    def __init__(self, *geometry_points: GeometryPoint):
-        self.geometry_points = list(geometry_points)
+    __slots__ = ("coordinates", "offsets")
 
-    def get_coordinates(self) -> List[Tuple[float, float]]:
+    @classmethod
+    def from_coordinates(cls, coordinates: Any, offsets: Iterable[int]) -> Any:
         """
-        Returns the coordinates of all points as a list of tuples.
+        Creates the geometry from the flat coordinates of its points and the offsets of its lines, without a
+        GeometryPoint per point.
+
+        Args:
+            coordinates: The longitude and latitude of every point one after the other. An array('d') is kept
+                without being copied.
+            offsets: The position of the first point of every line, then the number of points, for instance
+                [0, 4, 9] for a first line of 4 points and a second line of 5.
 
         Returns:
-            A list of (longitude, latitude) tuples.
+            The geometry.
+        """
+        geometry = cls.__new__(cls)
+        geometry.coordinates = _flat(coordinates)
+        if len(geometry.coordinates) % 2:
+            raise ValueError("the coordinates must be pairs of a longitude and a latitude")
+        geometry.offsets = _offsets(offsets, len(geometry.coordinates) // 2)
+        return geometry
+
+    @property
+    def geometry_lines(self) -> List[GeometryLine]:
         """
-        return [point.get_coordinates() for point in self.geometry_points]
+        The lines of the geometry, built from the coordinates. Changing the list does not change the geometry,
+        assign a new list of lines instead.
+        """
+        return [GeometryLine.from_coordinates(self.coordinates[2 * start:2 * end]) for start, end in self._spans()]
 
-    def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({", ".join(repr(geo) for geo in self.geometry_points)})'
+    @geometry_lines.setter
+    def geometry_lines(self, lines: Iterable[Any]) -> None:
+        self.coordinates, self.offsets = _pack_lines(lines)
 
-    @staticmethod
-    def parse_coordinates(coordinates: List[Tuple[float, float]]) -> "GeometryMultiPoint":
+    def parts(self) -> List[memoryview]:
         """
-        Parses a list of coordinate tuples into a GeometryMultiPoint.
+        Returns the flat coordinates of every line as a view sharing the memory of the geometry.
+        """
+        view = memoryview(self.coordinates)
+        return [view[2 * start:2 * end] for start, end in self._spans()]
 
-        Args:
-            coordinates: A list of tuples containing longitude and latitude.
+    def to_numpy(self) -> Any:
+        """
+        Returns the coordinates of all the points as a NumPy array of shape (points, 2) sharing the memory of
+        the geometry, the lines being split by the offsets.
+        """
+        return _to_numpy(self.coordinates)
+
+    def get_coordinates(self) -> List[List[Tuple[float, float]]]:
+        """
+        Returns the coordinates of the lines, each as a list of coordinate tuples.
 
         Returns:
-            A GeometryMultiPoint object.
+            A list of lists of (longitude, latitude) tuples.
         """
-        return GeometryMultiPoint(*[GeometryPoint.parse_coordinates(point) for point in coordinates])
+        return [_pairs(self.coordinates[2 * start:2 * end]) for start, end in self._spans()]
+
+    def _spans(self) -> Iterable[Tuple[int, int]]:
+        return zip(self.offsets, self.offsets[1:])
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({", ".join(repr(geo) for geo in self.geometry_lines)})'
 
     def __eq__(self, other: object) -> bool:
-        if isinstance(other, GeometryMultiPoint):
-            return self.geometry_points == other.geometry_points
+        if isinstance(other, self.__class__):
+            return self.offsets == other.offsets and self.coordinates == other.coordinates
         return False
 
+    __hash__ = None
 
-@dataclass
-class GeometryMultiLine(Geometry):
+
+class GeometryPolygon(_LineArray):
     """
-    Represents multiple lines.
+    Represents a polygon defined by multiple lines.
 
     Attributes:
-        geometry_lines: A list of GeometryLine objects.
+        coordinates: The longitude and latitude of every point of every line, one after the other.
+        offsets: The position of the first point of every line, then the number of points.
+        geometry_lines: A list of GeometryLine objects defining the polygon, built from the coordinates.
     """
-    geometry_lines: List[GeometryLine]
 
-    def __init__(self, *geometry_lines: GeometryLine):
-        self.geometry_lines = list(geometry_lines)
+    __slots__ = ()
 
-    def get_coordinates(self) -> List[List[Tuple[float, float]]]:
+    def __init__(self, line1: GeometryLine, line2: GeometryLine, *other_lines: GeometryLine):
+        self.geometry_lines = (line1, line2) + other_lines
+
+    @staticmethod
+    def parse_coordinates(coordinates: List[List[Tuple[float, float]]]) -> "GeometryPolygon":
         """
-        Returns the coordinates of all lines as a list of lists of tuples.
+        Parses a list of lines, each defined by a list of coordinate tuples, into a GeometryPolygon.
+
+        Args:
+            coordinates: A list of lists containing longitude and latitude tuples, or of GeometryLine objects.
 
         Returns:
-            A list of lists of (longitude, latitude) tuples.
+            A GeometryPolygon object.
         """
-        return [line.get_coordinates() for line in self.geometry_lines]
+        polygon = GeometryPolygon.__new__(GeometryPolygon)
+        polygon.geometry_lines = coordinates
+        return polygon
 
-    def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({", ".join(repr(geo) for geo in self.geometry_lines)})'
+
+class GeometryMultiLine(_LineArray):
+    """
+    Represents multiple lines.
+
+    Attributes:
+        coordinates: The longitude and latitude of every point of every line, one after the other.
+        offsets: The position of the first point of every line, then the number of points.
+        geometry_lines: A list of GeometryLine objects, built from the coordinates.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *geometry_lines: GeometryLine):
+        self.geometry_lines = geometry_lines
 
     @staticmethod
     def parse_coordinates(coordinates: List[List[Tuple[float, float]]]) -> "GeometryMultiLine":
@@ -235,31 +428,99 @@ class GeometryMultiLine(Geometry):
         Parses a list of lines, each defined by a list of coordinate tuples, into a GeometryMultiLine.
 
         Args:
-            coordinates: A list of lists containing longitude and latitude tuples.
+            coordinates: A list of lists containing longitude and latitude tuples, or of GeometryLine objects.
 
         Returns:
             A GeometryMultiLine object.
         """
-        return GeometryMultiLine(*[GeometryLine.parse_coordinates(line) for line in coordinates])
-
-    def __eq__(self, other: object) -> bool:
-        if isinstance(other, GeometryMultiLine):
-            return self.geometry_lines == other.geometry_lines
-        return False
+        return GeometryMultiLine(*coordinates)
 
 
-@dataclass
 class GeometryMultiPolygon(Geometry):
     """
     Represents multiple polygons.
 
     Attributes:
-        geometry_polygons: A list of GeometryPolygon objects.
+        coordinates: The longitude and latitude of every point of every polygon, one after the other.
+        offsets: The position of the first point of every line of every polygon, then the number of points.
+        polygon_offsets: The position of the first line of every polygon in offsets, then the number of lines.
+        geometry_polygons: A list of GeometryPolygon objects, built from the coordinates.
     """
-    geometry_polygons: List[GeometryPolygon]
+
+    __slots__ = ("coordinates", "offsets", "polygon_offsets")
 
     def __init__(self, *geometry_polygons: GeometryPolygon):
-        self.geometry_polygons = list(geometry_polygons)
+        self.geometry_polygons = geometry_polygons
+
+    @classmethod
+    def from_coordinates(
+            cls, coordinates: Any, offsets: Iterable[int], polygon_offsets: Iterable[int]
+    ) -> "GeometryMultiPolygon":
+        """
+        Creates a multi polygon from the flat coordinates of its points and the offsets of its lines and
+        polygons, without a GeometryPoint per point.
+
+        Args:
+            coordinates: The longitude and latitude of every point one after the other. An array('d') is kept
+                without being copied.
+            offsets: The position of the first point of every line, then the number of points.
+            polygon_offsets: The position of the first line of every polygon, then the number of lines.
+
+        Returns:
+            A GeometryMultiPolygon object.
+        """
+        multi_polygon = cls.__new__(cls)
+        multi_polygon.coordinates = _flat(coordinates)
+        multi_polygon.offsets = _offsets(offsets, len(multi_polygon.coordinates) // 2)
+        multi_polygon.polygon_offsets = _offsets(polygon_offsets, len(multi_polygon.offsets) - 1)
+        return multi_polygon
+
+    @property
+    def geometry_polygons(self) -> List[GeometryPolygon]:
+        """
+        The polygons, built from the coordinates. Changing the list does not change the multi polygon, assign a
+        new list of polygons instead.
+        """
+        polygons = []
+        for first, last in zip(self.polygon_offsets, self.polygon_offsets[1:]):
+            start, end = self.offsets[first], self.offsets[last]
+            polygons.append(GeometryPolygon.from_coordinates(
+                self.coordinates[2 * start:2 * end], [offset - start for offset in self.offsets[first:last + 1]]
+            ))
+        return polygons
+
+    @geometry_polygons.setter
+    def geometry_polygons(self, polygons: Iterable[Any]) -> None:
+        coordinates, offsets, polygon_offsets = array("d"), array("q", [0]), array("q", [0])
+        for polygon in polygons:
+            if isinstance(polygon, GeometryPolygon):
+                points = len(coordinates) // 2
+                coordinates.extend(polygon.coordinates)
+                offsets.extend(points + offset for offset in polygon.offsets[1:])
+            else:
+                for line in polygon:
+                    if isinstance(line, _PointArray):
+                        coordinates.extend(line.coordinates)
+                    else:
+                        _extend(coordinates, line)
+                    offsets.append(len(coordinates) // 2)
+            polygon_offsets.append(len(offsets) - 1)
+        self.coordinates, self.offsets, self.polygon_offsets = coordinates, offsets, polygon_offsets
+
+    def parts(self) -> List[List[memoryview]]:
+        """
+        Returns the flat coordinates of every line of every polygon as views sharing the memory of the multi polygon.
+        """
+        view = memoryview(self.coordinates)
+        lines = [view[2 * start:2 * end] for start, end in zip(self.offsets, self.offsets[1:])]
+        return [lines[first:last] for first, last in zip(self.polygon_offsets, self.polygon_offsets[1:])]
+
+    def to_numpy(self) -> Any:
+        """
+        Returns the coordinates of all the points as a NumPy array of shape (points, 2) sharing the memory of
+        the multi polygon, the lines and polygons being split by the offsets.
+        """
+        return _to_numpy(self.coordinates)
 
     def get_coordinates(self) -> List[List[List[Tuple[float, float]]]]:
         """
@@ -268,7 +529,7 @@ class GeometryMultiPolygon(Geometry):
         Returns:
             A list of lists of lists of (longitude, latitude) tuples.
         """
-        return [polygon.get_coordinates() for polygon in self.geometry_polygons]
+        return [[_pairs(array("d", line)) for line in polygon] for polygon in self.parts()]
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({", ".join(repr(geo) for geo in self.geometry_polygons)})'
@@ -279,18 +540,25 @@ class GeometryMultiPolygon(Geometry):
         Parses a list of polygons, each defined by a list of lines, into a GeometryMultiPolygon.
 
         Args:
-            coordinates: A list of lists of lists containing longitude and latitude tuples.
+            coordinates: A list of lists of lists containing longitude and latitude tuples, or of GeometryPolygon
+                objects.
 
         Returns:
             A GeometryMultiPolygon object.
         """
-        return GeometryMultiPolygon(*[GeometryPolygon.parse_coordinates(polygon) for polygon in coordinates])
+        return GeometryMultiPolygon(*coordinates)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, GeometryMultiPolygon):
-            return self.geometry_polygons == other.geometry_polygons
+            return (
+                self.polygon_offsets == other.polygon_offsets and
+                self.offsets == other.offsets and
+                self.coordinates == other.coordinates
+            )
         return False
 
+    __hash__ = None
+
 
 @dataclass
 class GeometryCollection:
@@ -1,16 +1,20 @@
 """
 Defines classes for representing bounded ranges, including inclusive and exclusive bounds.
 """
+from typing import Any
 
-from dataclasses import dataclass
+from surrealdb.data.types.frozen import Frozen, hashable
 
 
-class Bound:
+class Bound(Frozen):
     """
     Represents a generic boundary for a range. This is an abstract base class
     that can be extended by specific bound types, such as inclusive or exclusive bounds.
+    Bounds and ranges are immutable and hashable.
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """
         Initializes a generic bound.
@@ -29,8 +33,10 @@ class Bound:
         """
         return isinstance(other, Bound)
 
+    def __hash__(self) -> int:
+        return hash(Bound)
+
 
-@dataclass
 class BoundIncluded(Bound):
     """
     Represents an inclusive bound of a range.
@@ -39,7 +45,7 @@ class BoundIncluded(Bound):
         value: The value of the inclusive bound.
     """
 
-    value: any
+    __slots__ = ("value",)
 
     def __init__(self, value):
         """
@@ -49,7 +55,10 @@ class BoundIncluded(Bound):
             value: The value of the bound.
         """
         super().__init__()
-        self.value = value
+        _set_included_value(self, value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(value={self.value!r})"
 
     def __eq__(self, other: object) -> bool:
         """
@@ -65,8 +74,13 @@ class BoundIncluded(Bound):
             return self.value == other.value
         return False
 
+    def __hash__(self) -> int:
+        return hash((BoundIncluded, hashable(self.value)))
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.value,)
+
 
-@dataclass
 class BoundExcluded(Bound):
     """
     Represents an exclusive bound of a range.
@@ -75,7 +89,7 @@ class BoundExcluded(Bound):
         value: The value of the exclusive bound.
     """
 
-    value: any
+    __slots__ = ("value",)
 
     def __init__(self, value):
         """
@@ -85,7 +99,10 @@ class BoundExcluded(Bound):
             value: The value of the bound.
         """
         super().__init__()
-        self.value = value
+        _set_excluded_value(self, value)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(value={self.value!r})"
 
     def __eq__(self, other: object) -> bool:
         """
@@ -101,9 +118,14 @@ class BoundExcluded(Bound):
             return self.value == other.value
         return False
 
+    def __hash__(self) -> int:
+        return hash((BoundExcluded, hashable(self.value)))
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.value,)
 
-@dataclass
-class Range:
+
+class Range(Frozen):
     """
     Represents a range with a beginning and an end bound.
 
@@ -112,8 +134,21 @@ class Range:
         end: The ending bound of the range (inclusive or exclusive).
     """
 
-    begin: Bound
-    end: Bound
+    __slots__ = ("begin", "end")
+
+    def __init__(self, begin: Bound, end: Bound) -> None:
+        """
+        Initializes a range.
+
+        Args:
+            begin: The starting bound of the range.
+            end: The ending bound of the range.
+        """
+        _set_begin(self, begin)
+        _set_end(self, end)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(begin={self.begin!r}, end={self.end!r})"
 
     def __eq__(self, other: object) -> bool:
         """
@@ -128,3 +163,15 @@ class Range:
         if isinstance(other, Range):
             return self.begin == other.begin and self.end == other.end
         return False
+
+    def __hash__(self) -> int:
+        return hash((self.begin, self.end))
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.begin, self.end)
+
+
+_set_included_value = BoundIncluded.value.__set__
+_set_excluded_value = BoundExcluded.value.__set__
+_set_begin = Range.begin.__set__
+_set_end = Range.end.__set__
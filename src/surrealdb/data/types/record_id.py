@@ -1,17 +1,27 @@
 """
 Defines the data type for the record ID.
 """
-from dataclasses import dataclass
+from functools import total_ordering
+from typing import Any
 
+from surrealdb.data.types.frozen import Frozen, hashable, sort_key
 
-class RecordID:
+
+@total_ordering
+class RecordID(Frozen):
     """
     An identifier of the record. This class houses the ID of the row, and the table name.
 
+    Record IDs are immutable and hashable, and are ordered by table name then by ID the way the database
+    orders them, numbers before strings before arrays and objects.
+
     Attributes:
         table_name: The table name associated with the record ID
         identifier: The ID of the row
     """
+
+    __slots__ = ("table_name", "id")
+
     def __init__(self, table_name: str, identifier) -> None:
         """
         The constructor for the RecordID class.
@@ -20,23 +30,33 @@ class RecordID:
             table_name: The table name associated with the record ID
             identifier: The ID of the row
         """
-        self.table_name = table_name
-        self.id = identifier
+        _set_table_name(self, table_name)
+        _set_id(self, identifier)
 
     def __str__(self) -> str:
         return f"{self.table_name}:{self.id}"
 
     def __repr__(self) -> str:
-        return f"{self.__class__.__name__}(table_name={self.table_name}, record_id={self.id})".format(
-            self=self
-        )
+        return f"{self.__class__.__name__}(table_name={self.table_name}, record_id={self.id})"
 
-    def __eq__(self, other):
+    def __eq__(self, other: object) -> bool:
         if isinstance(other, RecordID):
             return (
                     self.table_name == other.table_name and
                     self.id == other.id
             )
+        return False
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, RecordID):
+            return NotImplemented
+        return (self.table_name, sort_key(self.id)) < (other.table_name, sort_key(other.id))
+
+    def __hash__(self) -> int:
+        return hash((self.table_name, hashable(self.id)))
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.table_name, self.id)
 
     @staticmethod
     def parse(record_str: str) -> "RecordID":
@@ -56,3 +76,7 @@ class RecordID:
 
         table, record_id = record_str.split(":")
         return RecordID(table, record_id)
+
+
+_set_table_name = RecordID.table_name.__set__
+_set_id = RecordID.id.__set__
@@ -1,15 +1,23 @@
 """
 Defines a Table class to represent a database table by its name.
 """
+from functools import total_ordering
+from typing import Any
 
-class Table:
+from surrealdb.data.types.frozen import Frozen
+
+
+@total_ordering
+class Table(Frozen):
     """
-    Represents a database table by its name.
+    Represents a database table by its name. Tables are immutable, hashable and ordered by name.
 
     Attributes:
         table_name: The name of the table.
     """
 
+    __slots__ = ("table_name",)
+
     def __init__(self, table_name: str) -> None:
         """
         Initializes a Table object with a specific table name.
@@ -17,7 +25,7 @@ class Table:
         Args:
             table_name: The name of the table.
         """
-        self.table_name = table_name
+        _set_table_name(self, table_name)
 
     def __str__(self) -> str:
         """
@@ -50,3 +58,17 @@ class Table:
         if isinstance(other, Table):
             return self.table_name == other.table_name
         return False
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, Table):
+            return NotImplemented
+        return self.table_name < other.table_name
+
+    def __hash__(self) -> int:
+        return hash(self.table_name)
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.table_name,)
+
+
+_set_table_name = Table.table_name.__set__
@@ -1,3 +1,8 @@
+import re
+from collections.abc import Sequence
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import cbor2
 from cerberus import Validator
 from cerberus.errors import ValidationError
 
@@ -6,53 +11,204 @@ from surrealdb.request_message.methods import RequestMethod
 from surrealdb.data.utils import process_thing
 from surrealdb.data.types.table import Table
 
+JWT_PATTERN = r"^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$"
+
+# CBOR map headers for a map of three and of two entries
+_ENVELOPE_HEADERS = {True: b"\xa3", False: b"\xa2"}
+_ID_KEY = cbor2.dumps("id")
+_METHOD_KEY = cbor2.dumps("method")
+_PARAMS_KEY = cbor2.dumps("params")
+
+# maps (method, has params) to the encoded envelope around the id: the part before it and the part after it up
+# to the params. The id is left out of the key as multiplexed connections send a new id with every request.
+_FRAME_PARTS: Dict[Tuple[str, bool], Tuple[bytes, bytes]] = dict()
+
+
+def _encode_text(value: str) -> bytes:
+    """
+    Encodes the short string ids the connections send without going through an encoder.
+    """
+    data = value.encode("utf-8")
+    if len(data) < 24:
+        # major type 3 is a text string, with the length in the initial byte
+        return bytes((0x60 + len(data),)) + data
+    if len(data) < 256:
+        return b"\x78" + bytes((len(data),)) + data
+    return encode(value)
+
+
+def _frame_parts(method: str, has_params: bool) -> Tuple[bytes, bytes]:
+    parts = _FRAME_PARTS.get((method, has_params))
+    if parts is None:
+        parts = (
+            _ENVELOPE_HEADERS[has_params] + _ID_KEY,
+            _METHOD_KEY + encode(method) + (_PARAMS_KEY if has_params else b""),
+        )
+        _FRAME_PARTS[(method, has_params)] = parts
+    return parts
+
+
+def encode_message(data: dict) -> bytes:
+    """
+    Encodes a message envelope of id, method and optionally params in that order.
+
+    The encoding of the keys and method is cached per method, so only the id and the params are encoded per
+    call. Produces the same bytes as encode(data).
+    """
+    has_params = "params" in data
+    if len(data) != 2 + has_params:
+        return encode(data)
+    method = data["method"]
+    if type(method) is not str:
+        return encode(data)
+    head, tail = _frame_parts(method, has_params)
+    request_id = data["id"]
+    encoded_id = _encode_text(request_id) if type(request_id) is str else encode(request_id)
+    if has_params:
+        return b"".join((head, encoded_id, tail, encode(data["params"])))
+    return head + encoded_id + tail
+
+
+class ParamsRule:
+    """
+    The checks a message for one method has to pass before it is encoded.
+
+    The checks are plain structural checks compiled once per method. The Cerberus schema is only run when a
+    check fails so the error message is the same as the one Cerberus would give.
+
+    Attributes:
+        schema: The Cerberus schema for the whole message, used to build the error message.
+        has_params: Whether the message has a params list.
+        min_length: The minimum number of params, if any.
+        max_length: The maximum number of params, if any.
+        item_pattern: The compiled regex every param has to match, if any.
+        string_items: Whether every param has to be a string.
+    """
+
+    __slots__ = ("schema", "has_params", "min_length", "max_length", "item_pattern", "string_items")
+
+    def __init__(
+            self,
+            method: RequestMethod,
+            has_params: bool = True,
+            min_length: Optional[int] = None,
+            max_length: Optional[int] = None,
+            string_items: bool = False,
+            item_pattern: Optional[str] = None,
+    ) -> None:
+        self.has_params = has_params
+        self.min_length = min_length
+        self.max_length = max_length
+        self.string_items = string_items or item_pattern is not None
+        self.item_pattern = re.compile(item_pattern) if item_pattern is not None else None
+        self.schema: Dict[str, Any] = {
+            "id": {"required": True},
+            "method": {"type": "string", "required": True, "allowed": [method.value]},
+        }
+        if has_params:
+            params_schema: Dict[str, Any] = {"type": "list", "required": True}
+            if min_length is not None:
+                params_schema["minlength"] = min_length
+            if max_length is not None:
+                params_schema["maxlength"] = max_length
+            if self.string_items:
+                params_schema["schema"] = {"type": "string"}
+                if item_pattern is not None:
+                    params_schema["schema"]["regex"] = item_pattern
+            self.schema["params"] = params_schema
+
+    def check(self, data: dict) -> bool:
+        if data["id"] is None:
+            return False
+        if not self.has_params:
+            return True
+        params = data["params"]
+        # mirrors the Cerberus "list" type which is any sequence apart from a string
+        if not isinstance(params, Sequence) or isinstance(params, str):
+            return False
+        if self.min_length is not None and len(params) < self.min_length:
+            return False
+        if self.max_length is not None and len(params) > self.max_length:
+            return False
+        if self.string_items:
+            for item in params:
+                if not isinstance(item, str):
+                    return False
+                if self.item_pattern is not None and self.item_pattern.match(item) is None:
+                    return False
+        return True
+
+
+PARAMS_RULES: Dict[RequestMethod, ParamsRule] = {
+    RequestMethod.USE: ParamsRule(RequestMethod.USE, string_items=True),
+    RequestMethod.INFO: ParamsRule(RequestMethod.INFO, has_params=False),
+    RequestMethod.VERSION: ParamsRule(RequestMethod.VERSION, has_params=False),
+    RequestMethod.AUTHENTICATE: ParamsRule(
+        RequestMethod.AUTHENTICATE, min_length=1, max_length=1, item_pattern=JWT_PATTERN
+    ),
+    RequestMethod.INVALIDATE: ParamsRule(RequestMethod.INVALIDATE, has_params=False),
+    RequestMethod.LET: ParamsRule(RequestMethod.LET, min_length=2),
+    RequestMethod.UNSET: ParamsRule(RequestMethod.UNSET),
+    RequestMethod.LIVE: ParamsRule(RequestMethod.LIVE, min_length=1, max_length=2),
+    RequestMethod.KILL: ParamsRule(RequestMethod.KILL),
+    RequestMethod.QUERY: ParamsRule(RequestMethod.QUERY, min_length=2, max_length=2),
+    RequestMethod.INSERT: ParamsRule(RequestMethod.INSERT, min_length=2, max_length=2),
+    RequestMethod.PATCH: ParamsRule(RequestMethod.PATCH, min_length=2, max_length=2),
+    RequestMethod.SELECT: ParamsRule(RequestMethod.SELECT),
+    RequestMethod.CREATE: ParamsRule(RequestMethod.CREATE, min_length=1, max_length=2),
+    RequestMethod.UPDATE: ParamsRule(RequestMethod.UPDATE, min_length=1, max_length=2),
+    RequestMethod.MERGE: ParamsRule(RequestMethod.MERGE, min_length=1, max_length=2),
+    RequestMethod.DELETE: ParamsRule(RequestMethod.DELETE, min_length=1, max_length=1),
+    RequestMethod.INSERT_RELATION: ParamsRule(RequestMethod.INSERT_RELATION, min_length=2, max_length=2),
+    RequestMethod.UPSERT: ParamsRule(RequestMethod.UPSERT, min_length=1, max_length=2),
+}
+
 
 class WsCborDescriptor:
+    """
+    Encodes a RequestMessage into a CBOR websocket frame.
+
+    Each method is dispatched through a dict to its prep function and checked against the ParamsRule
+    compiled for it. The checks are skipped when the message's validate attribute is False.
+    """
+
+    def __init__(self) -> None:
+        self._preps: Dict[RequestMethod, Callable[[Any], bytes]] = {
+            RequestMethod.USE: self.prep_use,
+            RequestMethod.INFO: self.prep_info,
+            RequestMethod.VERSION: self.prep_version,
+            RequestMethod.SIGN_UP: self.prep_signup,
+            RequestMethod.SIGN_IN: self.prep_signin,
+            RequestMethod.AUTHENTICATE: self.prep_authenticate,
+            RequestMethod.INVALIDATE: self.prep_invalidate,
+            RequestMethod.LET: self.prep_let,
+            RequestMethod.UNSET: self.prep_unset,
+            RequestMethod.LIVE: self.prep_live,
+            RequestMethod.KILL: self.prep_kill,
+            RequestMethod.QUERY: self.prep_query,
+            RequestMethod.INSERT: self.prep_insert,
+            RequestMethod.PATCH: self.prep_patch,
+            RequestMethod.SELECT: self.prep_select,
+            RequestMethod.CREATE: self.prep_create,
+            RequestMethod.UPDATE: self.prep_update,
+            RequestMethod.MERGE: self.prep_merge,
+            RequestMethod.DELETE: self.prep_delete,
+            RequestMethod.INSERT_RELATION: self.prep_insert_relation,
+            RequestMethod.UPSERT: self.prep_upsert,
+        }
+
     def __get__(self, obj, type=None) -> bytes:
-        if obj.method == RequestMethod.USE:
-            return self.prep_use(obj)
-        elif obj.method == RequestMethod.INFO:
-            return self.prep_info(obj)
-        elif obj.method == RequestMethod.VERSION:
-            return self.prep_version(obj)
-        elif obj.method == RequestMethod.SIGN_UP:
-            return self.prep_signup(obj)
-        elif obj.method == RequestMethod.SIGN_IN:
-            return self.prep_signin(obj)
-        elif obj.method == RequestMethod.AUTHENTICATE:
-            return self.prep_authenticate(obj)
-        elif obj.method == RequestMethod.INVALIDATE:
-            return self.prep_invalidate(obj)
-        elif obj.method == RequestMethod.LET:
-            return self.prep_let(obj)
-        elif obj.method == RequestMethod.UNSET:
-            return self.prep_unset(obj)
-        elif obj.method == RequestMethod.LIVE:
-            return self.prep_live(obj)
-        elif obj.method == RequestMethod.KILL:
-            return self.prep_kill(obj)
-        elif obj.method == RequestMethod.QUERY:
-            return self.prep_query(obj)
-        elif obj.method == RequestMethod.INSERT:
-            return self.prep_insert(obj)
-        elif obj.method == RequestMethod.PATCH:
-            return self.prep_patch(obj)
-        elif obj.method == RequestMethod.SELECT:
-            return self.prep_select(obj)
-        elif obj.method == RequestMethod.CREATE:
-            return self.prep_create(obj)
-        elif obj.method == RequestMethod.UPDATE:
-            return self.prep_update(obj)
-        elif obj.method == RequestMethod.MERGE:
-            return self.prep_merge(obj)
-        elif obj.method == RequestMethod.DELETE:
-            return self.prep_delete(obj)
-        elif obj.method == RequestMethod.INSERT_RELATION:
-            return self.prep_insert_relation(obj)
-        elif obj.method == RequestMethod.UPSERT:
-            return self.prep_upsert(obj)
-
-        raise ValueError(f"Invalid method for Cbor WS encoding: {obj.method}")
+        prep = self._preps.get(obj.method)
+        if prep is None:
+            raise ValueError(f"Invalid method for Cbor WS encoding: {obj.method}")
+        return prep(obj)
+
+    def _validate(self, obj, data: dict) -> None:
+        if not obj.validate:
+            return
+        rule = PARAMS_RULES[obj.method]
+        if not rule.check(data):
+            self._raise_invalid_schema(data=data, schema=rule.schema, method=obj.method.value)
 
     def _raise_invalid_schema(self, data:dict, schema: dict, method: str) -> None:
         v = Validator(schema)
@@ -65,41 +221,24 @@ class WsCborDescriptor:
             "method": obj.method.value,
             "params": [obj.kwargs.get("namespace"), obj.kwargs.get("database")],
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True},  # "method" must be a string
-            "params": {
-                "type": "list",  # "params" must be a list
-                "schema": {"type": "string"},  # Elements of "params" must be strings
-                "required": True
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_info(self, obj) -> bytes:
         data = {
             "id": obj.id,
             "method": obj.method.value
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True},  # "method" must be a string
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_version(self, obj) -> bytes:
         data = {
             "id": obj.id,
             "method": obj.method.value
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True},  # "method" must be a string
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_signup(self, obj) -> bytes:
         passed_params = obj.kwargs.get("data")
@@ -116,26 +255,7 @@ class WsCborDescriptor:
         }
         for key, value in passed_params["variables"].items():
             data["params"][0][key] = value
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True},  # "method" must be a string
-            "params": {
-                "type": "list",  # "params" must be a list
-                "schema": {
-                    "type": "dict",  # Each element of the "params" list must be a dictionary
-                    "schema": {
-                        "NS": {"type": "string", "required": True},  # "NS" must be a string
-                        "DB": {"type": "string", "required": True},  # "DB" must be a string
-                        "AC": {"type": "string", "required": True},  # "AC" must be a string
-                        "username": {"type": "string", "required": True},  # "username" must be a string
-                        "password": {"type": "string", "required": True},  # "password" must be a string
-                    },
-                },
-                "required": True,
-            },
-        }
-        # self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        return encode_message(data)
 
     def prep_signin(self, obj) -> bytes:
         """
@@ -245,7 +365,7 @@ class WsCborDescriptor:
 
         else:
             raise ValueError(f"Invalid data for signin: {obj.kwargs}")
-        return encode(data)
+        return encode_message(data)
 
     def prep_authenticate(self, obj) -> bytes:
         data = {
@@ -255,34 +375,16 @@ class WsCborDescriptor:
                 obj.kwargs.get("token")
             ]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["authenticate"]},
-            "params": {
-                "type": "list",
-                "schema": {
-                    "type": "string",
-                    "regex": r"^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$",  # Matches JWT format
-                },
-                "required": True,
-                "minlength": 1,
-                "maxlength": 1,  # Ensures exactly one token in the list
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_invalidate(self, obj) -> bytes:
         data = {
             "id": obj.id,
             "method": obj.method.value
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True}
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_let(self, obj) -> bytes:
         data = {
@@ -290,17 +392,8 @@ class WsCborDescriptor:
             "method": obj.method.value,
             "params": [obj.kwargs.get("key"), obj.kwargs.get("value")]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["let"]},
-            "params": {
-                "type": "list",
-                "minlength": 2,
-                "required": True
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_unset(self, obj) -> bytes:
         data = {
@@ -308,36 +401,23 @@ class WsCborDescriptor:
             "method": obj.method.value,
             "params": obj.kwargs.get("params")
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["unset"]},
-            "params": {
-                "type": "list",
-                "required": True
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_live(self, obj) -> bytes:
         table = obj.kwargs.get("table")
         if isinstance(table, str):
             table = Table(table)
+        params = [table]
+        if obj.kwargs.get("diff"):
+            params.append(True)
         data = {
             "id": obj.id,
             "method": obj.method.value,
-            "params": [table]
+            "params": params
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["live"]},
-            "params": {
-                "type": "list",
-                "required": True
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_kill(self, obj) -> bytes:
         data = {
@@ -345,16 +425,8 @@ class WsCborDescriptor:
             "method": obj.method.value,
             "params": [obj.kwargs.get("uuid")]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["kill"]},
-            "params": {
-                "type": "list",
-                "required": True
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_query(self, obj) -> bytes:
         data = {
@@ -365,18 +437,8 @@ class WsCborDescriptor:
                 obj.kwargs.get("params", dict())
             ]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["query"]},
-            "params": {
-                "type": "list",
-                "minlength": 2,  # Ensures there are at least two elements
-                "maxlength": 2,  # Ensures exactly two elements
-                "required": True
-            },
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_insert(self, obj) -> bytes:
         data = {
@@ -387,18 +449,8 @@ class WsCborDescriptor:
                 obj.kwargs.get("params")
             ]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["insert"]},
-            "params": {
-                "type": "list",
-                "minlength": 2,  # Ensure there are at least two elements
-                "maxlength": 2,  # Ensure exactly two elements
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_patch(self, obj) -> bytes:
         data = {
@@ -411,18 +463,8 @@ class WsCborDescriptor:
         }
         if obj.kwargs.get("params") is None:
             raise ValidationError("parameters cannot be None for a patch method")
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["patch"]},
-            "params": {
-                "type": "list",
-                "minlength": 2,  # Ensure there are at least two elements
-                "maxlength": 2,  # Ensure exactly two elements
-                "required": True,
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_select(self, obj) -> bytes:
         data = {
@@ -430,16 +472,8 @@ class WsCborDescriptor:
             "method": obj.method.value,
             "params": obj.kwargs.get("params")
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["select"]},
-            "params": {
-                "type": "list",
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_create(self, obj) -> bytes:
         data = {
@@ -449,19 +483,8 @@ class WsCborDescriptor:
         }
         if obj.kwargs.get("data"):
             data["params"].append(obj.kwargs.get("data"))
-
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["create"]},
-            "params": {
-                "type": "list",
-                "minlength": 1,
-                "maxlength": 2,
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_update(self, obj) -> bytes:
         data = {
@@ -472,18 +495,8 @@ class WsCborDescriptor:
                 obj.kwargs.get("data", dict())
             ]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["update"]},
-            "params": {
-                "type": "list",
-                "minlength": 1,
-                "maxlength": 2,
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_merge(self, obj) -> bytes:
         data = {
@@ -494,18 +507,8 @@ class WsCborDescriptor:
                 obj.kwargs.get("data", dict())
             ]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["merge"]},
-            "params": {
-                "type": "list",
-                "minlength": 1,
-                "maxlength": 2,
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_delete(self, obj) -> bytes:
         data = {
@@ -513,18 +516,8 @@ class WsCborDescriptor:
             "method": obj.method.value,
             "params": [process_thing(obj.kwargs.get("record_id"))]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["delete"]},
-            "params": {
-                "type": "list",
-                "minlength": 1,
-                "maxlength": 1,
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_insert_relation(self, obj) -> bytes:
         data = {
@@ -537,19 +530,8 @@ class WsCborDescriptor:
         params = obj.kwargs.get("params", [])
         # for i in params:
         data["params"].append(params)
-
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["insert_relation"]},
-            "params": {
-                "type": "list",
-                "minlength": 2,
-                "maxlength": 2,
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
 
     def prep_upsert(self, obj) -> bytes:
         data = {
@@ -560,15 +542,5 @@ class WsCborDescriptor:
                 obj.kwargs.get("data", dict())
             ]
         }
-        schema = {
-            "id": {"required": True},
-            "method": {"type": "string", "required": True, "allowed": ["upsert"]},
-            "params": {
-                "type": "list",
-                "minlength": 1,
-                "maxlength": 2,
-                "required": True
-            }
-        }
-        self._raise_invalid_schema(data=data, schema=schema, method=obj.method.value)
-        return encode(data)
+        self._validate(obj, data)
+        return encode_message(data)
@@ -1,14 +1,30 @@
+from typing import Optional
+
 from surrealdb.request_message.descriptors.cbor_ws import WsCborDescriptor
 from surrealdb.request_message.descriptors.json_http import JsonHttpDescriptor
 from surrealdb.request_message.methods import RequestMethod
 
 
 class RequestMessage:
+    """
+    A request to be sent to the database, encoded through the descriptors.
+
+    Attributes:
+        id: The ID of the request used to match the response.
+        method: The RPC method of the request.
+        kwargs: The arguments of the request.
+        validate: Whether the params are checked before encoding. Set RequestMessage.validate to False
+            to skip the checks for every message in production.
+    """
 
     WS_CBOR_DESCRIPTOR = WsCborDescriptor()
     JSON_HTTP_DESCRIPTOR = JsonHttpDescriptor()
 
-    def __init__(self, id_for_request, method: RequestMethod, **kwargs) -> None:
+    validate: bool = True
+
+    def __init__(self, id_for_request, method: RequestMethod, validate: Optional[bool] = None, **kwargs) -> None:
         self.id = id_for_request
         self.method = method
         self.kwargs = kwargs
+        if validate is not None:
+            self.validate = validate
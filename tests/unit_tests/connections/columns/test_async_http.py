@@ -0,0 +1,69 @@
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+from surrealdb.connections.query_result import StatementError
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestAsyncHttpSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "http://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncHttpSurrealConnection(self.url)
+        _ = await self.connection.signin(self.vars_params)
+        _ = await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.query(
+            "CREATE user:1 SET name = 'Tobie', age = 30, joined = d'2024-01-01T00:00:00Z', tenure = 1h;"
+            "CREATE user:2 SET name = 'Jaime', age = 40, joined = d'2024-01-02T00:00:00Z', tenure = 2h;"
+        )
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_query_columns(self):
+        columns = await self.connection.query_columns("SELECT * FROM user ORDER BY id;")
+        self.assertEqual(2, columns.length)
+        self.assertEqual(["user:1", "user:2"], list(columns["id"]))
+        self.assertEqual(["Tobie", "Jaime"], list(columns["name"]))
+        self.assertEqual("int64", columns["age"].dtype.name)
+        self.assertEqual([30, 40], columns["age"].tolist())
+        self.assertEqual("datetime64[ns]", str(columns["joined"].dtype))
+        self.assertEqual("timedelta64[ns]", str(columns["tenure"].dtype))
+        self.assertEqual(3600 * 10 ** 9, int(columns["tenure"][0].astype("int64")))
+
+    async def test_query_columns_statement(self):
+        columns = await self.connection.query_columns(
+            "RETURN 1; SELECT name FROM user WHERE age > $age;", {"age": 35}, statement=-1
+        )
+        self.assertEqual(["Jaime"], list(columns["name"]))
+
+    async def test_query_columns_statement_error(self):
+        with self.assertRaises(StatementError):
+            await self.connection.query_columns("THROW 'boom';")
+
+    async def test_select_columns(self):
+        columns = await self.connection.select_columns("user")
+        self.assertEqual(2, columns.length)
+        self.assertEqual({"user:1", "user:2"}, set(columns["id"]))
+        record = await self.connection.select_columns(RecordID("user", 1))
+        self.assertEqual(["Tobie"], list(record["name"]))
+
+    async def test_to_dataframe(self):
+        columns = await self.connection.query_columns("SELECT * FROM user ORDER BY id;")
+        frame = columns.to_dataframe(record_ids="category")
+        self.assertEqual(["Tobie", "Jaime"], frame["name"].tolist())
+        self.assertEqual("category", str(frame["id"].dtype))
+
+
+if __name__ == "__main__":
+    main()
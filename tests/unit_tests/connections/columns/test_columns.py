@@ -0,0 +1,163 @@
+import math
+from unittest import main, skipIf, TestCase
+
+import cbor2
+
+from surrealdb.connections.columns import ColumnBuilder, frame_id, read_columns
+from surrealdb.connections.query_result import StatementError
+from surrealdb.data.cbor import Interner, encode
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.record_id import RecordID
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+def query_frame(*statements) -> bytes:
+    results = [{"result": result, "status": status, "time": "1µs"} for result, status in statements]
+    return encode({"id": "1", "result": results})
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestColumnBuilder(TestCase):
+
+    def build(self, *rows):
+        builder = ColumnBuilder()
+        for row in rows:
+            builder.append(row)
+        return builder.build()
+
+    def test_typed_columns(self):
+        columns = self.build(
+            {"id": RecordID("user", 1), "age": 30, "score": 1.5, "admin": True, "joined": DateTimeCompact(5),
+             "tenure": Duration(7), "name": "Tobie"},
+            {"id": RecordID("user", 2), "age": 40, "score": 2.5, "admin": False, "joined": DateTimeCompact(6),
+             "tenure": Duration(8), "name": "Jaime"},
+        )
+        self.assertEqual(2, columns.length)
+        self.assertEqual(["id", "age", "score", "admin", "joined", "tenure", "name"], list(columns))
+        self.assertEqual("int64", columns["age"].dtype.name)
+        self.assertEqual("float64", columns["score"].dtype.name)
+        self.assertEqual("bool", columns["admin"].dtype.name)
+        self.assertEqual("datetime64[ns]", str(columns["joined"].dtype))
+        self.assertEqual("timedelta64[ns]", str(columns["tenure"].dtype))
+        self.assertEqual(object, columns["name"].dtype)
+        self.assertEqual(["user:1", "user:2"], list(columns["id"]))
+        self.assertEqual([5, 6], columns["joined"].astype("int64").tolist())
+        self.assertEqual([7, 8], columns["tenure"].astype("int64").tolist())
+
+    def test_missing_values(self):
+        columns = self.build({"age": 1, "at": DateTimeCompact(1), "name": "a"}, {"other": 1}, {"age": 3, "admin": True})
+        self.assertEqual(["age", "at", "name", "other", "admin"], list(columns))
+        self.assertEqual("float64", columns["age"].dtype.name)
+        self.assertTrue(math.isnan(columns["age"][1]))
+        self.assertTrue(numpy.isnat(columns["at"][1]))
+        self.assertEqual(["a", None, None], list(columns["name"]))
+        self.assertEqual([None, None, True], list(columns["admin"]))
+
+    def test_integers_in_a_float_column(self):
+        self.assertEqual([1.0, 2.5, 3.0], self.build({"n": 1}, {"n": 2.5}, {"n": 3})["n"].tolist())
+
+    def test_mixed_values_are_objects(self):
+        columns = self.build({"n": 1, "at": Duration(1)}, {"n": "two", "at": None}, {"n": 2 ** 70, "at": 3})
+        self.assertEqual(object, columns["n"].dtype)
+        self.assertEqual([1, "two", 2 ** 70], list(columns["n"]))
+        self.assertEqual([Duration(1), None, 3], list(columns["at"]))
+
+    def test_integer_too_big_for_int64(self):
+        self.assertEqual([1, 2 ** 64], list(self.build({"n": 1}, {"n": 2 ** 64})["n"]))
+
+    def test_record_id_codes(self):
+        teams = [RecordID("team", 1), None, RecordID("team", "1"), RecordID("team", 2)]
+        columns = self.build(*({"team": team} for team in teams))
+        codes, strings = columns.record_id_codes("team")
+        self.assertEqual([0, -1, 0, 1], codes.tolist())
+        self.assertEqual(["team:1", "team:2"], list(strings))
+        self.assertEqual(["team:1", None, "team:1", "team:2"], list(columns["team"]))
+
+    def test_rows_must_be_objects(self):
+        with self.assertRaises(TypeError):
+            ColumnBuilder().append(1)
+
+    @skipIf(pandas is None, "pandas is not installed")
+    def test_to_dataframe(self):
+        columns = self.build({"id": RecordID("user", 1), "age": 30}, {"id": RecordID("user", 2), "age": 40})
+        frame = columns.to_dataframe()
+        self.assertEqual(["user:1", "user:2"], frame["id"].tolist())
+        self.assertEqual([30, 40], frame["age"].tolist())
+        self.assertEqual("category", str(columns.to_dataframe(record_ids="category")["id"].dtype))
+        with self.assertRaises(ValueError):
+            columns.to_dataframe(record_ids="codes")
+
+
+@skipIf(numpy is None, "numpy is not installed")
+class TestReadColumns(TestCase):
+
+    def test_query_statement(self):
+        data = query_frame((1, "OK"), ([{"n": 1}, {"n": 2}], "OK"), ([{"m": 3}], "OK"))
+        self.assertEqual([1, 2], read_columns(data, "query", statement=1)["n"].tolist())
+        self.assertEqual([3], read_columns(data, "query", statement=-1)["m"].tolist())
+        with self.assertRaises(IndexError):
+            read_columns(data, "query", statement=3)
+
+    def test_statement_error(self):
+        with self.assertRaises(StatementError) as context:
+            read_columns(query_frame(("boom", "ERR")), "query", statement=0)
+        self.assertEqual(0, context.exception.index)
+        self.assertEqual("boom", context.exception.message)
+
+    def test_single_record(self):
+        self.assertEqual([1], read_columns(encode({"id": "1", "result": {"n": 1}}), "select")["n"].tolist())
+        self.assertEqual(0, read_columns(encode({"id": "1", "result": None}), "select").length)
+
+    def test_response_error(self):
+        with self.assertRaises(Exception) as context:
+            read_columns(encode({"id": "1", "error": {"code": -32000, "message": "nope"}}), "select")
+        self.assertIn("error select", str(context.exception))
+
+    def test_indefinite_length_array(self):
+        # an indefinite length array holding {"n": 1} and {"n": 2}, then the break byte
+        rows = b"\x9f" + cbor2.dumps({"n": 1}) + cbor2.dumps({"n": 2}) + b"\xff"
+        data = b"\xa2" + cbor2.dumps("id") + cbor2.dumps("1") + cbor2.dumps("result") + rows
+        self.assertEqual([1, 2], read_columns(data, "select")["n"].tolist())
+
+    def test_interner(self):
+        interner = Interner()
+        data = encode({"id": "1", "result": [{"team": RecordID("team", 1)}]})
+        self.assertEqual(["team:1"], list(read_columns(data, "select", interner)["team"]))
+
+
+class TestFrameId(TestCase):
+
+    def test_frame_id(self):
+        self.assertEqual("7", frame_id(encode({"id": "7", "result": [1, 2, 3]})))
+        self.assertEqual("8", frame_id(encode({"result": [1, 2, 3], "id": "8"})))
+        self.assertIsNone(frame_id(encode({"result": {"id": "live", "action": "CREATE"}})))
+
+    def test_notification_result_is_not_read(self):
+        # the result of a notification is cut short, so reading it would fail
+        self.assertIsNone(frame_id(encode({"result": [1, 2, 3]})[:-1]))
+
+    def test_values_before_the_id(self):
+        values = [
+            [1, -2, 2 ** 40, 1.5, True, None, b"bytes", "text", {"nested": [RecordID("user", 1)]}],
+            DateTimeCompact(1),
+            "é" * 300,
+        ]
+        self.assertEqual("9", frame_id(encode({"result": values, "time": "1ms", "id": "9"})))
+        # indefinite length strings, arrays and maps
+        result = b"\x9f\x7f\x62ab\x61c\xff\xbf\x61k\x5f\x41x\xff\xff\xff"
+        frame = b"\xa2\x66result" + result + b"\x62id\x61" + b"7"
+        self.assertEqual("7", frame_id(frame))
+
+
+if __name__ == "__main__":
+    main()
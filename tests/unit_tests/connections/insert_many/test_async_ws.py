@@ -0,0 +1,75 @@
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.connections.bulk_insert import InsertManyError
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url)
+        _ = await self.connection.signin(self.vars_params)
+        _ = await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    @staticmethod
+    def rows(count: int):
+        for i in range(count):
+            yield {"id": i, "name": f"user {i}"}
+
+    async def test_insert_many(self):
+        outcome = await self.connection.insert_many("user", self.rows(25), batch_size=10)
+        self.assertTrue(outcome.ok)
+        self.assertEqual(25, outcome.inserted)
+        self.assertEqual(3, outcome.batches)
+        self.assertEqual(25, len(await self.connection.query("SELECT * FROM user;")))
+
+    async def test_insert_many_max_bytes(self):
+        outcome = await self.connection.insert_many("user", self.rows(25), batch_size=100, max_bytes=100)
+        self.assertEqual(25, outcome.inserted)
+        self.assertLess(1, outcome.batches)
+
+    async def test_insert_many_continue_on_error(self):
+        await self.connection.insert("user", {"id": 5, "name": "existing"})
+        outcome = await self.connection.insert_many("user", self.rows(25), batch_size=10, continue_on_error=True)
+        self.assertFalse(outcome.ok)
+        self.assertEqual(15, outcome.inserted)
+        self.assertEqual(3, outcome.batches)
+        self.assertEqual(1, outcome.failed_batches)
+        self.assertEqual(10, outcome.failed_rows)
+        self.assertEqual(0, outcome.errors[0].index)
+        self.assertEqual(0, outcome.errors[0].offset)
+
+    async def test_insert_many_stop_on_error(self):
+        await self.connection.insert("user", {"id": 5, "name": "existing"})
+        with self.assertRaises(InsertManyError) as context:
+            await self.connection.insert_many("user", self.rows(25), batch_size=10, max_in_flight=1)
+        self.assertEqual(1, context.exception.result.batches)
+        self.assertEqual(0, context.exception.result.inserted)
+
+    async def test_insert_many_multiplexed(self):
+        connection = AsyncWsSurrealConnection(self.url, multiplex=True)
+        await connection.signin(self.vars_params)
+        await connection.use(namespace=self.namespace, database=self.database_name)
+        outcome = await connection.insert_many("user", self.rows(100), batch_size=7, max_in_flight=4)
+        self.assertEqual(100, outcome.inserted)
+        self.assertEqual(15, outcome.batches)
+        self.assertEqual(100, len(await connection.query("SELECT * FROM user;")))
+        await connection.close()
+
+
+if __name__ == "__main__":
+    main()
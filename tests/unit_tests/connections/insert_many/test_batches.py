@@ -0,0 +1,73 @@
+from unittest import main, TestCase, IsolatedAsyncioTestCase
+
+from surrealdb.connections.bulk_insert import InsertManyError, insert_batches, insert_batches_async, iter_batches
+from surrealdb.data.cbor import decode, encode
+
+
+def failing_insert(rows):
+    values = decode(encode(rows))
+    if any(value.get("fail") for value in values):
+        raise Exception("row failed")
+    return values
+
+
+class TestIterBatches(TestCase):
+
+    def test_batch_size(self):
+        batches = list(iter_batches(({"n": i} for i in range(25)), batch_size=10, max_bytes=2 ** 20))
+        self.assertEqual([10, 10, 5], [batch.rows.length for batch in batches])
+        self.assertEqual([0, 10, 20], [batch.offset for batch in batches])
+        self.assertEqual([{"n": i} for i in range(10, 20)], decode(encode(batches[1].rows)))
+
+    def test_max_bytes(self):
+        row_size = len(encode({"n": 1}))
+        batches = list(iter_batches(({"n": 1} for _ in range(10)), batch_size=100, max_bytes=row_size * 3))
+        self.assertEqual([3, 3, 3, 1], [batch.rows.length for batch in batches])
+        for batch in batches:
+            self.assertLessEqual(len(batch.rows.data), row_size * 3)
+
+    def test_oversized_row(self):
+        batches = list(iter_batches([{"n": 1}, {"n": "x" * 100}, {"n": 2}], batch_size=100, max_bytes=20))
+        self.assertEqual([1, 1, 1], [batch.rows.length for batch in batches])
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            list(iter_batches([{"n": 1}], batch_size=0, max_bytes=10))
+        with self.assertRaises(ValueError):
+            list(iter_batches([{"n": 1}], batch_size=10, max_bytes=0))
+
+
+class TestInsertBatches(TestCase):
+
+    def test_continue_on_error(self):
+        rows = [{"n": i, "fail": i in (3, 17)} for i in range(25)]
+        for max_in_flight in (1, 4):
+            outcome = insert_batches(failing_insert, iter_batches(rows, 5, 2 ** 20), max_in_flight, True)
+            self.assertEqual(15, outcome.inserted)
+            self.assertEqual(5, outcome.batches)
+            self.assertEqual(10, outcome.failed_rows)
+            self.assertEqual([0, 3], [error.index for error in outcome.errors])
+
+    def test_stop_on_error(self):
+        rows = [{"n": i, "fail": i == 3} for i in range(25)]
+        with self.assertRaises(InsertManyError) as context:
+            insert_batches(failing_insert, iter_batches(rows, 5, 2 ** 20), 1, False)
+        self.assertEqual(1, context.exception.result.batches)
+        self.assertEqual("error inserting batch 0 (rows 0 to 4): row failed", str(context.exception))
+
+
+class TestInsertBatchesAsync(IsolatedAsyncioTestCase):
+
+    async def test_continue_on_error(self):
+        async def insert(rows):
+            return failing_insert(rows)
+
+        rows = [{"n": i, "fail": i in (3, 17)} for i in range(25)]
+        outcome = await insert_batches_async(insert, iter_batches(rows, 5, 2 ** 20), 4, True)
+        self.assertEqual(15, outcome.inserted)
+        self.assertEqual(5, outcome.batches)
+        self.assertEqual([0, 3], [error.index for error in outcome.errors])
+
+
+if __name__ == "__main__":
+    main()
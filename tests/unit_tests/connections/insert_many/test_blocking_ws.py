@@ -0,0 +1,75 @@
+from unittest import main, TestCase
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+from surrealdb.connections.bulk_insert import InsertManyError
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url)
+        _ = self.connection.signin(self.vars_params)
+        _ = self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+
+    def tearDown(self):
+        self.connection.query("DELETE user;")
+        self.connection.close()
+
+    @staticmethod
+    def rows(count: int):
+        for i in range(count):
+            yield {"id": i, "name": f"user {i}"}
+
+    def test_insert_many(self):
+        outcome = self.connection.insert_many("user", self.rows(25), batch_size=10)
+        self.assertTrue(outcome.ok)
+        self.assertEqual(25, outcome.inserted)
+        self.assertEqual(3, outcome.batches)
+        self.assertEqual(25, len(self.connection.query("SELECT * FROM user;")))
+
+    def test_insert_many_max_bytes(self):
+        outcome = self.connection.insert_many("user", self.rows(25), batch_size=100, max_bytes=100)
+        self.assertEqual(25, outcome.inserted)
+        self.assertLess(1, outcome.batches)
+
+    def test_insert_many_continue_on_error(self):
+        self.connection.insert("user", {"id": 5, "name": "existing"})
+        outcome = self.connection.insert_many("user", self.rows(25), batch_size=10, continue_on_error=True)
+        self.assertFalse(outcome.ok)
+        self.assertEqual(15, outcome.inserted)
+        self.assertEqual(3, outcome.batches)
+        self.assertEqual(1, outcome.failed_batches)
+        self.assertEqual(10, outcome.failed_rows)
+        self.assertEqual(0, outcome.errors[0].index)
+        self.assertEqual(0, outcome.errors[0].offset)
+
+    def test_insert_many_stop_on_error(self):
+        self.connection.insert("user", {"id": 5, "name": "existing"})
+        with self.assertRaises(InsertManyError) as context:
+            self.connection.insert_many("user", self.rows(25), batch_size=10, max_in_flight=1)
+        self.assertEqual(1, context.exception.result.batches)
+        self.assertEqual(0, context.exception.result.inserted)
+
+    def test_insert_many_multiplexed(self):
+        connection = BlockingWsSurrealConnection(self.url, multiplex=True)
+        connection.signin(self.vars_params)
+        connection.use(namespace=self.namespace, database=self.database_name)
+        outcome = connection.insert_many("user", self.rows(100), batch_size=7, max_in_flight=4)
+        self.assertEqual(100, outcome.inserted)
+        self.assertEqual(15, outcome.batches)
+        self.assertEqual(100, len(connection.query("SELECT * FROM user;")))
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
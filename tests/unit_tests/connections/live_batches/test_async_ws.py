@@ -0,0 +1,60 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.data import RecordID
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        self.pub_connection = AsyncWsSurrealConnection(self.url)
+        await self.pub_connection.signin(self.vars_params)
+        await self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    async def asyncTearDown(self):
+        await self.pub_connection.query("DELETE user;")
+        await self.pub_connection.close()
+        await self.connection.close()
+
+    async def test_batches(self):
+        query_uuid = await self.connection.live("user")
+        subscription = self.connection.subscribe_live_batches(query_uuid, max_size=100, window=1)
+        await self.pub_connection.query("CREATE user:tobie SET n = 0;")
+        for n in range(1, 20):
+            await self.pub_connection.query(f"UPDATE user:tobie SET n = {n};")
+        await self.pub_connection.query("CREATE user:jaime SET n = 0;")
+        await self.pub_connection.query("DELETE user:jaime;")
+        batch = await asyncio.wait_for(subscription.__anext__(), timeout=10)
+        self.assertEqual(1, len(batch))
+        self.assertEqual("CREATE", batch[0]["action"])
+        self.assertEqual(RecordID("user", "tobie"), batch[0]["result"]["id"])
+        self.assertEqual(19, batch[0]["result"]["n"])
+        await self.connection.kill(query_uuid)
+        self.assertEqual([], [batch async for batch in subscription])
+
+    async def test_max_size(self):
+        query_uuid = await self.connection.live("user")
+        subscription = self.connection.subscribe_live_batches(query_uuid, max_size=2, window=10)
+        for n in range(4):
+            await self.pub_connection.query(f"CREATE user:{n} SET n = {n};")
+        batches = [await asyncio.wait_for(subscription.__anext__(), timeout=5) for _ in range(2)]
+        self.assertEqual([[0, 1], [2, 3]], [[item["result"]["n"] for item in batch] for batch in batches])
+        await self.connection.kill(query_uuid)
+
+
+if __name__ == "__main__":
+    main()
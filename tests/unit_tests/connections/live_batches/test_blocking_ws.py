@@ -0,0 +1,46 @@
+from unittest import TestCase, main
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.pub_connection = BlockingWsSurrealConnection(self.url)
+        self.pub_connection.signin(self.vars_params)
+        self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    def tearDown(self):
+        self.pub_connection.query("DELETE user;")
+        self.pub_connection.close()
+        self.connection.close()
+
+    def test_batches(self):
+        query_uuid = self.connection.live("user")
+        subscription = self.connection.subscribe_live_batches(query_uuid, max_size=100, window=1)
+        self.pub_connection.query("CREATE user:tobie SET n = 0;")
+        for n in range(1, 20):
+            self.pub_connection.query(f"UPDATE user:tobie SET n = {n};")
+        batch = next(subscription)
+        self.assertEqual(1, len(batch))
+        self.assertEqual("CREATE", batch[0]["action"])
+        self.assertEqual(19, batch[0]["result"]["n"])
+        self.connection.kill(query_uuid)
+        self.assertEqual([], list(subscription))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from unittest import TestCase, main
+
+from surrealdb.connections.live import coalesce_notifications
+from surrealdb.data.types.record_id import RecordID
+
+
+def notification(action, identifier, n=None):
+    return {"action": action, "result": {"id": RecordID("user", identifier), "n": n}}
+
+
+def summary(batch):
+    return [(item["action"], item["result"]["id"].id, item["result"]["n"]) for item in batch]
+
+
+class TestCoalesceNotifications(TestCase):
+
+    def test_latest_state(self):
+        batch = coalesce_notifications([
+            notification("UPDATE", 1, 1),
+            notification("UPDATE", 2, 2),
+            notification("UPDATE", 1, 3),
+        ])
+        self.assertEqual([("UPDATE", 1, 3), ("UPDATE", 2, 2)], summary(batch))
+
+    def test_create_and_update(self):
+        batch = coalesce_notifications([notification("CREATE", 1, 1), notification("UPDATE", 1, 2)])
+        self.assertEqual([("CREATE", 1, 2)], summary(batch))
+
+    def test_create_and_delete_cancel_out(self):
+        batch = coalesce_notifications([
+            notification("CREATE", 1, 1),
+            notification("UPDATE", 2, 2),
+            notification("UPDATE", 1, 3),
+            notification("DELETE", 1, 3),
+        ])
+        self.assertEqual([("UPDATE", 2, 2)], summary(batch))
+
+    def test_update_and_delete(self):
+        batch = coalesce_notifications([notification("UPDATE", 1, 1), notification("DELETE", 1, 1)])
+        self.assertEqual([("DELETE", 1, 1)], summary(batch))
+
+    def test_delete_and_create(self):
+        batch = coalesce_notifications([notification("DELETE", 1, 1), notification("CREATE", 1, 2)])
+        self.assertEqual([("UPDATE", 1, 2)], summary(batch))
+
+    def test_records_of_different_types(self):
+        batch = coalesce_notifications([notification("UPDATE", 1, 1), notification("UPDATE", "1", 2)])
+        self.assertEqual(2, len(batch))
+
+    def test_diffs_are_kept(self):
+        diffs = [
+            {"action": "UPDATE", "result": [{"op": "replace", "path": "/n", "value": 1}]},
+            {"action": "UPDATE", "result": [{"op": "replace", "path": "/n", "value": 2}]},
+        ]
+        self.assertEqual(diffs, coalesce_notifications(diffs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.connections.live import OverflowPolicy
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url, live_queue_size=3)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        self.pub_connection = AsyncWsSurrealConnection(self.url)
+        await self.pub_connection.signin(self.vars_params)
+        await self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    async def asyncTearDown(self):
+        await self.pub_connection.query("DELETE user;")
+        await self.pub_connection.close()
+        await self.connection.close()
+
+    async def create_users(self, start, stop):
+        for n in range(start, stop):
+            await self.pub_connection.query(f"CREATE user:{n} SET n = {n};")
+        await asyncio.sleep(0.5)
+
+    async def test_drop_oldest(self):
+        query_uuid = await self.connection.live("user", overflow=OverflowPolicy.DROP_OLDEST)
+        await self.create_users(0, 10)
+        stats = self.connection.live_stats(query_uuid)
+        self.assertEqual(3, stats.size)
+        self.assertEqual(7, stats.dropped)
+        subscription = self.connection.subscribe_live(query_uuid)
+        updates = [await subscription.__anext__() for _ in range(3)]
+        self.assertEqual([7, 8, 9], [update["n"] for update in updates])
+        await self.connection.kill(query_uuid)
+
+    async def test_block_keeps_every_notification(self):
+        query_uuid = await self.connection.live("user", overflow=OverflowPolicy.BLOCK)
+        await self.create_users(0, 6)
+        stats = self.connection.live_stats(query_uuid)
+        self.assertEqual(3, stats.size)
+        self.assertEqual(3, stats.backlog)
+        # the full queue does not hold up the responses to other requests
+        self.assertIsInstance(await asyncio.wait_for(self.connection.version(), timeout=5), str)
+        subscription = self.connection.subscribe_live(query_uuid)
+        updates = [await asyncio.wait_for(subscription.__anext__(), timeout=10) for _ in range(6)]
+        self.assertEqual(list(range(6)), [update["n"] for update in updates])
+        await self.connection.kill(query_uuid)
+
+    async def test_kill_ends_subscription(self):
+        query_uuid = await self.connection.live("user")
+        await self.create_users(0, 6)
+        subscription = self.connection.subscribe_live(query_uuid)
+        await self.connection.kill(query_uuid)
+        updates = [update async for update in subscription]
+        self.assertEqual([3, 4, 5], [update["n"] for update in updates])
+        self.assertIsNone(self.connection.live_stats(query_uuid))
+
+    async def test_cancelled_live_is_killed(self):
+        live = asyncio.ensure_future(self.connection.live("user"))
+        await asyncio.sleep(0)
+        live.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await live
+        await self.create_users(0, 3)
+        self.assertEqual({}, self.connection._live._fanouts)
+
+
+if __name__ == "__main__":
+    main()
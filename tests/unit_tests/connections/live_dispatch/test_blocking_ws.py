@@ -0,0 +1,72 @@
+import time
+from unittest import TestCase, main
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+from surrealdb.connections.live import OverflowPolicy
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url, live_queue_size=3)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.pub_connection = BlockingWsSurrealConnection(self.url)
+        self.pub_connection.signin(self.vars_params)
+        self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    def tearDown(self):
+        self.pub_connection.query("DELETE user;")
+        self.pub_connection.close()
+        self.connection.close()
+
+    def create_users(self, start, stop):
+        for n in range(start, stop):
+            self.pub_connection.query(f"CREATE user:{n} SET n = {n};")
+        time.sleep(0.5)
+
+    def test_coalesce(self):
+        query_uuid = self.connection.live("user", overflow=OverflowPolicy.COALESCE)
+        self.create_users(0, 2)
+        for n in range(2, 6):
+            self.pub_connection.query(f"UPDATE user:{n % 2} SET n = {n};")
+        time.sleep(0.5)
+        stats = self.connection.live_stats(query_uuid)
+        self.assertEqual(2, stats.size)
+        self.assertEqual(4, stats.coalesced)
+        subscription = self.connection.subscribe_live(query_uuid)
+        self.assertEqual([4, 5], [next(subscription)["n"] for _ in range(2)])
+        self.connection.kill(query_uuid)
+
+    def test_block_keeps_every_notification(self):
+        query_uuid = self.connection.live("user", overflow=OverflowPolicy.BLOCK)
+        self.create_users(0, 6)
+        stats = self.connection.live_stats(query_uuid)
+        self.assertEqual(3, stats.size)
+        self.assertEqual(3, stats.backlog)
+        # the full queue does not hold up the responses to other requests
+        self.assertIsInstance(self.connection.version(), str)
+        subscription = self.connection.subscribe_live(query_uuid)
+        self.assertEqual(list(range(6)), [next(subscription)["n"] for _ in range(6)])
+        self.connection.kill(query_uuid)
+
+    def test_kill_ends_subscription(self):
+        query_uuid = self.connection.live("user")
+        self.create_users(0, 6)
+        subscription = self.connection.subscribe_live(query_uuid)
+        self.connection.kill(query_uuid)
+        self.assertEqual([3, 4, 5], [update["n"] for update in subscription])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from unittest import main, TestCase, IsolatedAsyncioTestCase
+
+from surrealdb.connections.live import AsyncLiveQueue, BlockingLiveQueue, LiveBuffer, OverflowPolicy
+from surrealdb.data.types.record_id import RecordID
+
+
+def notification(table, identifier, n):
+    return {"action": "UPDATE", "result": {"id": RecordID(table, identifier), "n": n}}
+
+
+class TestLiveBuffer(TestCase):
+
+    def test_block_keeps_a_backlog(self):
+        buffer = LiveBuffer(2, OverflowPolicy.BLOCK)
+        for n in range(4):
+            buffer.push(notification("user", n, n))
+        self.assertEqual(2, len(buffer))
+        self.assertEqual(2, buffer.stats().backlog)
+        self.assertEqual([0, 1], [buffer.pop()["result"]["n"] for _ in range(2)])
+        self.assertEqual(2, len(buffer))
+        self.assertEqual(0, buffer.stats().backlog)
+        self.assertEqual([2, 3], [buffer.pop()["result"]["n"] for _ in range(2)])
+        self.assertEqual(4, buffer.stats().received)
+        self.assertEqual(0, buffer.stats().dropped)
+
+    def test_drop_oldest(self):
+        buffer = LiveBuffer(2, OverflowPolicy.DROP_OLDEST)
+        for n in range(5):
+            buffer.push(notification("user", n, n))
+        self.assertEqual([3, 4], [buffer.pop()["result"]["n"] for _ in range(2)])
+        stats = buffer.stats()
+        self.assertEqual(5, stats.received)
+        self.assertEqual(3, stats.dropped)
+
+    def test_coalesce(self):
+        buffer = LiveBuffer(10, OverflowPolicy.COALESCE)
+        for n in range(6):
+            buffer.push(notification("user", n % 2, n))
+        # the record IDs 1 and "1" are different records
+        buffer.push(notification("user", "1", 6))
+        self.assertEqual([4, 5, 6], [buffer.pop()["result"]["n"] for _ in range(3)])
+        self.assertEqual(4, buffer.stats().coalesced)
+
+    def test_coalesce_after_pop(self):
+        buffer = LiveBuffer(10, OverflowPolicy.COALESCE)
+        buffer.push(notification("user", 1, 1))
+        buffer.pop()
+        buffer.push(notification("user", 1, 2))
+        self.assertEqual(1, len(buffer))
+        self.assertEqual(0, buffer.stats().coalesced)
+
+    def test_coalesce_full(self):
+        buffer = LiveBuffer(2, OverflowPolicy.COALESCE)
+        for n in range(3):
+            buffer.push(notification("user", n, n))
+        buffer.push(notification("user", 2, 3))
+        self.assertEqual([1, 3], [buffer.pop()["result"]["n"] for _ in range(2)])
+        self.assertEqual(1, buffer.stats().dropped)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            LiveBuffer(0, OverflowPolicy.BLOCK)
+
+    def test_policy_from_value(self):
+        self.assertIs(OverflowPolicy.COALESCE, OverflowPolicy.from_value("COALESCE"))
+        self.assertIs(OverflowPolicy.BLOCK, OverflowPolicy.from_value(OverflowPolicy.BLOCK))
+        with self.assertRaises(ValueError):
+            OverflowPolicy.from_value("grow")
+
+
+class TestAsyncLiveQueue(IsolatedAsyncioTestCase):
+
+    async def test_put_never_waits(self):
+        queue = AsyncLiveQueue(1, OverflowPolicy.BLOCK)
+        queue.put(notification("user", 1, 1))
+        queue.put(notification("user", 2, 2))
+        self.assertEqual(1, (await queue.get())["result"]["n"])
+        self.assertEqual(2, (await queue.get())["result"]["n"])
+
+    def test_default_drops_oldest(self):
+        queue = AsyncLiveQueue(1)
+        queue.put(notification("user", 1, 1))
+        queue.put(notification("user", 2, 2))
+        self.assertEqual(1, queue.stats().dropped)
+
+    async def test_close_releases_get(self):
+        queue = AsyncLiveQueue(1, OverflowPolicy.BLOCK)
+        queue.put(notification("user", 1, 1))
+        queue.close()
+        queue.put(notification("user", 2, 2))
+        self.assertEqual(1, (await queue.get())["result"]["n"])
+        self.assertIsNone(await queue.get())
+
+    async def test_wait(self):
+        queue = AsyncLiveQueue()
+        self.assertFalse(await queue.wait(0.01))
+        queue.put(notification("user", 1, 1))
+        self.assertTrue(await queue.wait(0.01))
+        self.assertEqual(1, len(queue.buffer))
+
+    async def test_close_with_error(self):
+        queue = AsyncLiveQueue()
+        get = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0.01)
+        queue.close(ConnectionError("closed"))
+        with self.assertRaises(Exception) as context:
+            await get
+        self.assertEqual("Error in live subscription: closed", str(context.exception))
+
+
+class TestBlockingLiveQueue(TestCase):
+
+    def test_put_never_waits(self):
+        queue = BlockingLiveQueue(1, OverflowPolicy.BLOCK)
+        queue.put(notification("user", 1, 1))
+        thread = threading.Thread(target=queue.put, args=(notification("user", 2, 2),))
+        thread.start()
+        thread.join(1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, queue.get()["result"]["n"])
+        self.assertEqual(2, queue.get()["result"]["n"])
+
+    def test_close(self):
+        queue = BlockingLiveQueue()
+        self.assertIsNone(queue.get(timeout=0.01))
+        queue.close(ConnectionError("closed"))
+        with self.assertRaises(Exception):
+            queue.get()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        self.pub_connection = AsyncWsSurrealConnection(self.url)
+        await self.pub_connection.signin(self.vars_params)
+        await self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    async def asyncTearDown(self):
+        await self.pub_connection.query("DELETE user;")
+        await self.pub_connection.close()
+        await self.connection.close()
+
+    async def test_shared_live_query(self):
+        subscriber_uuids = await asyncio.gather(*[self.connection.live("user", shared=True) for _ in range(5)])
+        self.assertEqual(5, len(set(subscriber_uuids)))
+        subscriptions = [self.connection.subscribe_live(subscriber_uuid) for subscriber_uuid in subscriber_uuids]
+        await self.pub_connection.query("CREATE user:tobie SET name = 'Tobie';")
+        for subscription in subscriptions:
+            update = await asyncio.wait_for(subscription.__anext__(), timeout=10)
+            self.assertEqual("Tobie", update["name"])
+        for subscriber_uuid in subscriber_uuids:
+            await self.connection.kill(subscriber_uuid)
+
+    async def test_kill_keeps_other_subscribers(self):
+        first = await self.connection.live("user", shared=True)
+        second = await self.connection.live("user", shared=True)
+        subscription = self.connection.subscribe_live(second)
+        await self.connection.kill(first)
+        await self.pub_connection.query("CREATE user:tobie SET name = 'Tobie';")
+        update = await asyncio.wait_for(subscription.__anext__(), timeout=10)
+        self.assertEqual("Tobie", update["name"])
+        await self.connection.kill(second)
+        self.assertIsNone(self.connection.live_stats(second))
+
+    async def test_different_definitions(self):
+        everyone = await self.connection.live("user", shared=True)
+        adults = await self.connection.live("user", shared=True, where="age >= 18")
+        subscription = self.connection.subscribe_live(adults)
+        await self.pub_connection.query("CREATE user:jaime SET age = 12;")
+        await self.pub_connection.query("CREATE user:tobie SET age = 35;")
+        update = await asyncio.wait_for(subscription.__anext__(), timeout=10)
+        self.assertEqual(35, update["age"])
+        everyone_subscription = self.connection.subscribe_live(everyone)
+        updates = [await asyncio.wait_for(everyone_subscription.__anext__(), timeout=10) for _ in range(2)]
+        self.assertEqual([12, 35], [update["age"] for update in updates])
+        await self.connection.kill(everyone)
+        await self.connection.kill(adults)
+
+
+if __name__ == "__main__":
+    main()
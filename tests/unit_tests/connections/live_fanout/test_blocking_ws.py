@@ -0,0 +1,56 @@
+import threading
+from unittest import TestCase, main
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.pub_connection = BlockingWsSurrealConnection(self.url)
+        self.pub_connection.signin(self.vars_params)
+        self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    def tearDown(self):
+        self.pub_connection.query("DELETE user;")
+        self.pub_connection.close()
+        self.connection.close()
+
+    def test_shared_live_query(self):
+        subscriber_uuids = []
+
+        def subscribe():
+            subscriber_uuids.append(self.connection.live("user", shared=True))
+
+        threads = [threading.Thread(target=subscribe) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(4, len(set(subscriber_uuids)))
+        subscriptions = [self.connection.subscribe_live(subscriber_uuid) for subscriber_uuid in subscriber_uuids]
+        self.pub_connection.query("CREATE user:tobie SET name = 'Tobie';")
+        for subscription in subscriptions:
+            self.assertEqual("Tobie", next(subscription)["name"])
+        for subscriber_uuid in subscriber_uuids:
+            self.connection.kill(subscriber_uuid)
+        # every subscription ends once it is killed
+        for subscription in subscriptions:
+            self.assertEqual([], list(subscription))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from unittest import TestCase, main
+from uuid import uuid4
+
+from surrealdb.connections.live import BlockingLiveQueue, LiveRegistry, live_definition
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+
+class TestLiveDefinition(TestCase):
+
+    def test_equal_definitions(self):
+        self.assertEqual(
+            live_definition("user", False, ["name"], "age > $a", {"a": 1, "b": 2}),
+            live_definition(Table("user"), False, ["name"], "age > $a", {"b": 2, "a": 1}),
+        )
+
+    def test_different_definitions(self):
+        definition = live_definition("user", False, None, "age > $a", {"a": 1})
+        self.assertNotEqual(definition, live_definition("user", True, None, "age > $a", {"a": 1}))
+        self.assertNotEqual(definition, live_definition("user", False, None, "age > $a", {"a": 2}))
+        self.assertNotEqual(definition, live_definition("person", False, None, "age > $a", {"a": 1}))
+
+
+class TestLiveRegistry(TestCase):
+
+    def test_single_subscriber(self):
+        registry = LiveRegistry()
+        query_uuid = uuid4()
+        live_queue = registry.add(query_uuid, query_uuid, BlockingLiveQueue())
+        self.assertEqual([live_queue], registry.queues(query_uuid))
+        self.assertIs(live_queue, registry.add(query_uuid, query_uuid, BlockingLiveQueue()))
+        self.assertEqual(query_uuid, registry.remove(query_uuid))
+        self.assertTrue(live_queue.closed)
+        self.assertEqual([], registry.queues(query_uuid))
+
+    def test_shared(self):
+        registry = LiveRegistry()
+        query_uuid = uuid4()
+        definition = live_definition("user", False, None, None, None)
+        first, second = uuid4(), uuid4()
+        self.assertFalse(registry.join(definition, first, BlockingLiveQueue()))
+        registry.add(query_uuid, first, BlockingLiveQueue(), definition)
+        self.assertTrue(registry.join(definition, second, BlockingLiveQueue()))
+        self.assertEqual(2, len(registry.queues(query_uuid)))
+        # the live query is only killed with its last subscriber
+        self.assertIsNone(registry.remove(first))
+        self.assertEqual(1, len(registry.queues(query_uuid)))
+        self.assertEqual(query_uuid, registry.remove(second))
+        self.assertFalse(registry.join(definition, uuid4(), BlockingLiveQueue()))
+
+    def test_dispatch_copies_for_every_other_subscriber(self):
+        registry = LiveRegistry()
+        query_uuid = uuid4()
+        definition = live_definition("user", False, None, None, None)
+        first = registry.add(query_uuid, uuid4(), BlockingLiveQueue(1), definition)
+        second = BlockingLiveQueue(1)
+        registry.join(definition, uuid4(), second)
+        for n in range(3):
+            registry.dispatch(query_uuid, {"id": RecordID("user", 1), "tags": [n]})
+        # the first subscriber falling behind does not stop the second from getting the notifications
+        self.assertEqual(2, first.stats().dropped)
+        notification = first.get()
+        notification["tags"].append("changed")
+        self.assertEqual({"id": RecordID("user", 1), "tags": [2]}, second.get())
+
+    def test_remove_unknown(self):
+        unknown = uuid4()
+        self.assertEqual(unknown, LiveRegistry().remove(unknown))
+
+    def test_close(self):
+        registry = LiveRegistry()
+        query_uuid = uuid4()
+        live_queue = registry.add(query_uuid, query_uuid, BlockingLiveQueue())
+        registry.close(ConnectionError("closed"))
+        self.assertIs(live_queue.error.__class__, ConnectionError)
+        self.assertIsNone(registry.queue(query_uuid))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.data import RecordID
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        self.pub_connection = AsyncWsSurrealConnection(self.url)
+        await self.pub_connection.signin(self.vars_params)
+        await self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    async def asyncTearDown(self):
+        await self.pub_connection.query("DELETE user;")
+        await self.pub_connection.close()
+        await self.connection.close()
+
+    async def test_fields_and_where(self):
+        query_uuid = await self.connection.live(
+            "user", fields=["name"], where="age > $min_age", params={"min_age": 18}
+        )
+        subscription = self.connection.subscribe_live(query_uuid)
+        await self.pub_connection.query("CREATE user:jaime SET name = 'Jaime', age = 12;")
+        await self.pub_connection.query("CREATE user:tobie SET name = 'Tobie', age = 35;")
+        update = await asyncio.wait_for(subscription.__anext__(), timeout=10)
+        self.assertEqual({"name": "Tobie"}, update)
+        await self.connection.kill(query_uuid)
+
+    async def test_diff(self):
+        query_uuid = await self.connection.live("user", diff=True)
+        subscription = self.connection.subscribe_live(query_uuid)
+        await self.pub_connection.query("CREATE user:tobie SET name = 'Tobie';")
+        update = await asyncio.wait_for(subscription.__anext__(), timeout=10)
+        self.assertIsInstance(update, list)
+        self.assertIn("op", update[0])
+        await self.connection.kill(query_uuid)
+
+    async def test_invalid_where(self):
+        with self.assertRaises(Exception):
+            await self.connection.live("user", where="age >")
+        self.assertEqual(RecordID("user", "tobie"), (await self.connection.query(
+            "CREATE user:tobie SET name = 'Tobie';"
+        ))[0]["id"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from unittest import TestCase, main
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.pub_connection = BlockingWsSurrealConnection(self.url)
+        self.pub_connection.signin(self.vars_params)
+        self.pub_connection.use(namespace=self.namespace, database=self.database_name)
+
+    def tearDown(self):
+        self.pub_connection.query("DELETE user;")
+        self.pub_connection.close()
+        self.connection.close()
+
+    def test_fields_and_where(self):
+        query_uuid = self.connection.live("user", fields="name", where="age > $min_age", params={"min_age": 18})
+        subscription = self.connection.subscribe_live(query_uuid)
+        self.pub_connection.query("CREATE user:jaime SET name = 'Jaime', age = 12;")
+        self.pub_connection.query("CREATE user:tobie SET name = 'Tobie', age = 35;")
+        self.assertEqual({"name": "Tobie"}, next(subscription))
+        self.connection.kill(query_uuid)
+
+    def test_diff(self):
+        query_uuid = self.connection.live("user", diff=True)
+        subscription = self.connection.subscribe_live(query_uuid)
+        self.pub_connection.query("CREATE user:tobie SET name = 'Tobie';")
+        update = next(subscription)
+        self.assertIsInstance(update, list)
+        self.assertIn("op", update[0])
+        self.connection.kill(query_uuid)
+
+
+if __name__ == "__main__":
+    main()
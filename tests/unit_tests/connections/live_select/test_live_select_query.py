@@ -0,0 +1,44 @@
+from unittest import TestCase, main
+from uuid import uuid4
+
+from surrealdb.connections.live import live_select_query, live_select_uuid, live_select_variables
+from surrealdb.data.types.table import Table
+
+
+class TestLiveSelectQuery(TestCase):
+
+    def test_fields_and_where(self):
+        self.assertEqual(
+            "LIVE SELECT id, name FROM $live_table WHERE age > $min_age;",
+            live_select_query(["id", "name"], "age > $min_age", False),
+        )
+
+    def test_all_fields(self):
+        self.assertEqual("LIVE SELECT * FROM $live_table WHERE active;", live_select_query(None, "active", False))
+        self.assertEqual("LIVE SELECT name FROM $live_table;", live_select_query("name", None, False))
+
+    def test_diff(self):
+        self.assertEqual("LIVE SELECT DIFF FROM $live_table WHERE active;", live_select_query(None, "active", True))
+        with self.assertRaises(ValueError):
+            live_select_query(["name"], None, True)
+
+    def test_no_fields(self):
+        with self.assertRaises(ValueError):
+            live_select_query([], None, False)
+
+    def test_variables(self):
+        variables = live_select_variables("user", {"min_age": 18})
+        self.assertEqual({"min_age": 18, "live_table": Table("user")}, variables)
+        self.assertEqual({"live_table": Table("user")}, live_select_variables(Table("user"), None))
+        with self.assertRaises(ValueError):
+            live_select_variables("user:tobie", None)
+
+    def test_uuid(self):
+        query_uuid = uuid4()
+        self.assertEqual(query_uuid, live_select_uuid({"result": [{"result": query_uuid, "status": "OK"}]}))
+        self.assertIsNone(live_select_uuid({"result": [{"result": "Parse error", "status": "ERR"}]}))
+        self.assertIsNone(live_select_uuid({"error": {"code": -32000, "message": "error"}}))
+
+
+if __name__ == "__main__":
+    main()
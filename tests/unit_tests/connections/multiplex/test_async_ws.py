@@ -0,0 +1,56 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url, multiplex=True)
+        _ = await self.connection.signin(self.vars_params)
+        _ = await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        for i in range(20):
+            await self.connection.query(f"CREATE user:{i} SET number = {i};")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_concurrent_selects(self):
+        outcome = await asyncio.gather(
+            *[self.connection.select(f"user:{i}") for i in range(20)]
+        )
+        self.assertEqual([i for i in range(20)], [record["number"] for record in outcome])
+
+    async def test_concurrent_mixed_requests(self):
+        outcome = await asyncio.gather(
+            self.connection.query("SELECT * FROM user WHERE number < 5;"),
+            self.connection.version(),
+            self.connection.select("user"),
+        )
+        self.assertEqual(5, len(outcome[0]))
+        self.assertIsInstance(outcome[1], str)
+        self.assertEqual(20, len(outcome[2]))
+
+    async def test_requests_fail_after_close(self):
+        await self.connection.close()
+        with self.assertRaises(Exception):
+            await self.connection.select("user")
+        self.connection = AsyncWsSurrealConnection(self.url, multiplex=True)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+
+
+if __name__ == "__main__":
+    main()
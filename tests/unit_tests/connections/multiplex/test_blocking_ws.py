@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, main
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url, multiplex=True)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        for i in range(20):
+            self.connection.query(f"CREATE user:{i} SET number = {i};")
+
+    def tearDown(self):
+        self.connection.query("DELETE user;")
+        self.connection.close()
+
+    def test_threads_share_connection(self):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outcome = list(executor.map(lambda i: self.connection.select(f"user:{i}"), range(20)))
+        self.assertEqual([i for i in range(20)], [record["number"] for record in outcome])
+
+    def test_threads_mixed_requests(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            query = executor.submit(self.connection.query, "SELECT * FROM user WHERE number < 5;")
+            version = executor.submit(self.connection.version)
+            select = executor.submit(self.connection.select, "user")
+        self.assertEqual(5, len(query.result()))
+        self.assertIsInstance(version.result(), str)
+        self.assertEqual(20, len(select.result()))
+
+
+if __name__ == "__main__":
+    main()
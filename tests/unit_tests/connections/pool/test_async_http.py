@@ -0,0 +1,76 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_pool import AsyncSurrealPool
+from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+
+
+class TestAsyncSurrealPool(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "http://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.pool = AsyncSurrealPool(self.url, min_connections=1, max_connections=2, acquire_timeout=5)
+        await self.pool.signin(self.vars_params)
+        await self.pool.use(namespace=self.namespace, database=self.database_name)
+        await self.pool.open()
+        async with self.pool.acquire() as connection:
+            await connection.query("DELETE user;")
+            await connection.query("CREATE user:tobie SET name = 'Tobie';")
+
+    async def asyncTearDown(self):
+        async with self.pool.acquire() as connection:
+            await connection.query("DELETE user;")
+        await self.pool.close()
+
+    async def test_acquire_replays_session(self):
+        async with self.pool.acquire() as connection:
+            self.assertIsInstance(connection, AsyncHttpSurrealConnection)
+            outcome = await connection.select("user")
+        self.assertEqual("Tobie", outcome[0]["name"])
+
+    async def test_let_replayed(self):
+        await self.pool.let("name", "Tobie")
+        async with self.pool.acquire() as connection:
+            outcome = await connection.query("SELECT * FROM user WHERE name = $name;")
+        self.assertEqual(1, len(outcome))
+
+    async def test_max_connections(self):
+        async def select():
+            async with self.pool.acquire() as connection:
+                return await connection.select("user")
+
+        outcome = await asyncio.gather(*[select() for _ in range(10)])
+        self.assertEqual(10, len(outcome))
+        stats = self.pool.stats()
+        self.assertLessEqual(stats.size, 2)
+        self.assertEqual(0, stats.in_use)
+        self.assertEqual(0, stats.waiters)
+
+    async def test_acquire_timeout(self):
+        async with self.pool.acquire():
+            async with self.pool.acquire():
+                with self.assertRaises(TimeoutError):
+                    async with self.pool.acquire(timeout=0.1):
+                        pass
+        self.assertEqual(1, self.pool.stats().timeouts)
+
+    async def test_reap(self):
+        async with self.pool.acquire():
+            async with self.pool.acquire():
+                pass
+        self.assertEqual(2, self.pool.stats().idle)
+        self.pool.max_idle_time = 0
+        self.assertEqual(1, await self.pool.reap())
+        self.assertEqual(1, self.pool.stats().size)
+
+
+if __name__ == "__main__":
+    main()
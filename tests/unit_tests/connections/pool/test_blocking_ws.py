@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, main
+
+from websockets.sync.server import serve
+
+from surrealdb.connections.blocking_pool import BlockingSurrealPool
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+
+
+class TestBlockingSurrealPool(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.pool = BlockingSurrealPool(self.url, min_connections=1, max_connections=2, acquire_timeout=5)
+        self.pool.signin(self.vars_params)
+        self.pool.use(namespace=self.namespace, database=self.database_name)
+        self.pool.open()
+        with self.pool.acquire() as connection:
+            connection.query("DELETE user;")
+            connection.query("CREATE user:tobie SET name = 'Tobie';")
+
+    def tearDown(self):
+        with self.pool.acquire() as connection:
+            connection.query("DELETE user;")
+        self.pool.close()
+
+    def test_acquire_replays_session(self):
+        with self.pool.acquire() as connection:
+            self.assertIsInstance(connection, BlockingWsSurrealConnection)
+            outcome = connection.select("user")
+        self.assertEqual("Tobie", outcome[0]["name"])
+
+    def test_let_replayed(self):
+        self.pool.let("name", "Tobie")
+        with self.pool.acquire() as connection:
+            outcome = connection.query("SELECT * FROM user WHERE name = $name;")
+        self.assertEqual(1, len(outcome))
+
+    def test_max_connections(self):
+        def select(_):
+            with self.pool.acquire() as connection:
+                return connection.select("user")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outcome = list(executor.map(select, range(20)))
+        self.assertEqual(20, len(outcome))
+        stats = self.pool.stats()
+        self.assertLessEqual(stats.size, 2)
+        self.assertEqual(0, stats.in_use)
+        self.assertEqual(0, stats.waiters)
+
+    def test_acquire_timeout(self):
+        with self.pool.acquire():
+            with self.pool.acquire():
+                with self.assertRaises(TimeoutError):
+                    with self.pool.acquire(timeout=0.1):
+                        pass
+        self.assertEqual(1, self.pool.stats().timeouts)
+
+    def test_reap(self):
+        with self.pool.acquire():
+            with self.pool.acquire():
+                pass
+        self.assertEqual(2, self.pool.stats().idle)
+        self.pool.max_idle_time = 0
+        self.assertEqual(1, self.pool.reap())
+        self.assertEqual(1, self.pool.stats().size)
+
+
+
+class TestBlockingSurrealPoolHealthCheck(TestCase):
+
+    def setUp(self):
+        # a server that accepts connections but never answers, like the far end of a half-open socket
+        def never_answer(websocket):
+            for _ in websocket:
+                pass
+
+        self.server = serve(never_answer, "localhost", 0, subprotocols=["cbor"])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        port = self.server.socket.getsockname()[1]
+        self.pool = BlockingSurrealPool(
+            f"ws://localhost:{port}", min_connections=0, health_check_interval=0, health_check_timeout=0.1
+        )
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+
+    def test_unanswered_health_check_replaces_member(self):
+        with self.pool.acquire() as first:
+            pass
+        started = time.monotonic()
+        with self.pool.acquire(timeout=1) as second:
+            self.assertIsNot(first, second)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(1, self.pool.stats().discarded)
+
+
+if __name__ == "__main__":
+    main()
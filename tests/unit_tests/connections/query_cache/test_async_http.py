@@ -0,0 +1,60 @@
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+from surrealdb.connections.query_cache import QueryCache
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestAsyncHttpSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "http://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.cache = QueryCache()
+        self.connection = AsyncHttpSurrealConnection(self.url, query_cache=self.cache)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.query("CREATE user:tobie SET name = 'Tobie';")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_cached_query(self):
+        query = "SELECT name FROM user WHERE name = $name;"
+        first = await self.connection.query(query, {"name": "Tobie"}, cache=True, tags=["user"])
+        await self.connection.query("UPDATE user:tobie SET age = 30;")
+        second = await self.connection.query(query, {"name": "Tobie"}, cache=True, tags=["user"])
+        self.assertEqual([{"name": "Tobie"}], first)
+        self.assertEqual(first, second)
+        stats = self.cache.stats()
+        self.assertEqual((1, 1), (stats.hits, stats.misses))
+
+    async def test_uncached_query(self):
+        await self.connection.query("SELECT * FROM user;")
+        self.assertEqual(0, self.cache.stats().size)
+
+    async def test_invalidated_by_tag(self):
+        query = "SELECT name FROM user;"
+        await self.connection.query(query, cache=True, tags=["user"])
+        await self.connection.query("UPDATE user:tobie SET name = 'Tobie Morgan';")
+        self.cache.invalidate_tag("user")
+        self.assertEqual([{"name": "Tobie Morgan"}], await self.connection.query(query, cache=True, tags=["user"]))
+
+    async def test_invalidated_by_own_write(self):
+        query = "SELECT name FROM user;"
+        await self.connection.query(query, cache=True, tags=["user"])
+        await self.connection.merge(RecordID("user", "tobie"), {"name": "Tobie Morgan"})
+        self.assertEqual([{"name": "Tobie Morgan"}], await self.connection.query(query, cache=True, tags=["user"]))
+
+
+if __name__ == "__main__":
+    main()
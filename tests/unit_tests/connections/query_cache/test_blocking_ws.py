@@ -0,0 +1,60 @@
+from unittest import main, TestCase
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+from surrealdb.connections.query_cache import QueryCache
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.cache = QueryCache()
+        self.connection = BlockingWsSurrealConnection(self.url, query_cache=self.cache)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.connection.query("CREATE user:tobie SET name = 'Tobie';")
+
+    def tearDown(self):
+        self.connection.query("DELETE user;")
+        self.connection.close()
+
+    def test_cached_query(self):
+        query = "SELECT name FROM user WHERE name = $name;"
+        first = self.connection.query(query, {"name": "Tobie"}, cache=True, tags=["user"])
+        self.connection.query("UPDATE user:tobie SET age = 30;")
+        second = self.connection.query(query, {"name": "Tobie"}, cache=True, tags=["user"])
+        self.assertEqual([{"name": "Tobie"}], first)
+        self.assertEqual(first, second)
+        stats = self.cache.stats()
+        self.assertEqual((1, 1), (stats.hits, stats.misses))
+
+    def test_uncached_query(self):
+        self.connection.query("SELECT * FROM user;")
+        self.assertEqual(0, self.cache.stats().size)
+
+    def test_invalidated_by_tag(self):
+        query = "SELECT name FROM user;"
+        self.connection.query(query, cache=True, tags=["user"])
+        self.connection.query("UPDATE user:tobie SET name = 'Tobie Morgan';")
+        self.cache.invalidate_tag("user")
+        self.assertEqual([{"name": "Tobie Morgan"}], self.connection.query(query, cache=True, tags=["user"]))
+
+    def test_invalidated_by_own_write(self):
+        query = "SELECT name FROM user;"
+        self.connection.query(query, cache=True, tags=["user"])
+        self.connection.merge(RecordID("user", "tobie"), {"name": "Tobie Morgan"})
+        self.assertEqual([{"name": "Tobie Morgan"}], self.connection.query(query, cache=True, tags=["user"]))
+
+
+if __name__ == "__main__":
+    main()
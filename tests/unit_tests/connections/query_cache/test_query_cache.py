@@ -0,0 +1,164 @@
+import asyncio
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+from surrealdb.connections.query_cache import (
+    QueryCache,
+    cached_query,
+    cached_query_async,
+    query_cache_key,
+)
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+
+def response(result, status="OK"):
+    return {"result": [{"result": result, "status": status, "time": "1ms"}]}
+
+
+class TestQueryCacheKey(TestCase):
+
+    def test_params_order_does_not_matter(self):
+        self.assertEqual(
+            query_cache_key("SELECT * FROM $tb;", {"tb": "user", "limit": 10, "nested": {"a": 1, "b": 2}}),
+            query_cache_key("SELECT * FROM $tb;", {"nested": {"b": 2, "a": 1}, "limit": 10, "tb": "user"}),
+        )
+
+    def test_different_keys(self):
+        key = query_cache_key("SELECT * FROM $tb;", {"tb": "user"})
+        self.assertNotEqual(key, query_cache_key("SELECT * FROM $tb;", {"tb": "post"}))
+        self.assertNotEqual(key, query_cache_key("SELECT * FROM user;", {"tb": "user"}))
+        self.assertNotEqual(key, query_cache_key("SELECT * FROM $tb;", {"tb": RecordID("user", 1)}))
+        self.assertNotEqual(key, query_cache_key("SELECT * FROM $tb;", {"tb": "user"}, ["test_ns", "test_db", None]))
+        self.assertEqual(query_cache_key("SELECT 1;", None), query_cache_key("SELECT 1;", {}))
+
+
+class TestQueryCache(TestCase):
+
+    def test_hit_returns_copy(self):
+        cache = QueryCache()
+        cache.put(b"key", [{"name": "Tobie"}], cache.epoch)
+        data, refresh = cache.lookup(b"key")
+        self.assertFalse(refresh)
+        result = cached_query(cache, b"key", lambda: self.fail("sent"), None, (), True)
+        result[0]["name"] = "Jaime"
+        self.assertEqual([{"name": "Tobie"}], cached_query(cache, b"key", lambda: self.fail("sent"), None, (), True))
+        self.assertEqual(3, cache.stats().hits)
+
+    def test_byte_budget(self):
+        cache = QueryCache(max_bytes=1200)
+        cache.put(b"1", "a" * 300, cache.epoch)
+        cache.put(b"2", "b" * 300, cache.epoch)
+        cache.lookup(b"1")
+        cache.put(b"3", "c" * 300, cache.epoch)
+        self.assertIsNotNone(cache.lookup(b"1")[0])
+        self.assertIsNone(cache.lookup(b"2")[0])
+        cache.put(b"4", "d" * 2000, cache.epoch)
+        self.assertIsNone(cache.lookup(b"4")[0])
+        stats = cache.stats()
+        self.assertEqual(1, stats.evictions)
+        self.assertLessEqual(stats.bytes, 1200)
+
+    def test_ttl(self):
+        cache = QueryCache(ttl=0.01)
+        cache.put(b"key", 1, cache.epoch)
+        cache.put(b"long", 1, cache.epoch, ttl=10)
+        time.sleep(0.02)
+        self.assertIsNone(cache.lookup(b"key")[0])
+        self.assertIsNotNone(cache.lookup(b"long")[0])
+        self.assertEqual(1, cache.stats().expirations)
+
+    def test_invalidate_tag(self):
+        cache = QueryCache()
+        cache.put(b"users", 1, cache.epoch, tags=["user"])
+        cache.put(b"posts", 2, cache.epoch, tags=["post"])
+        cache.put(b"both", 3, cache.epoch, tags=["user", "post"])
+        cache.invalidate_tag("user")
+        self.assertIsNone(cache.lookup(b"users")[0])
+        self.assertIsNone(cache.lookup(b"both")[0])
+        self.assertIsNotNone(cache.lookup(b"posts")[0])
+        cache.invalidate_thing(RecordID("post", 1))
+        self.assertIsNone(cache.lookup(b"posts")[0])
+        self.assertEqual(3, cache.stats().invalidations)
+
+    def test_invalidate_thing(self):
+        cache = QueryCache()
+        for table in ("user", "post", "tag"):
+            cache.put(table.encode(), 1, cache.epoch, tags=[table])
+        cache.invalidate_thing("user:tobie")
+        cache.invalidate_thing(Table("post"))
+        self.assertEqual(1, cache.stats().size)
+
+    def test_put_after_invalidation_is_skipped(self):
+        cache = QueryCache()
+        epoch = cache.epoch
+        cache.invalidate_tag("user")
+        cache.put(b"key", 1, epoch, tags=["user"])
+        self.assertEqual(0, cache.stats().size)
+        epoch = cache.epoch
+        cache.clear()
+        cache.put(b"key", 1, epoch)
+        self.assertEqual(0, cache.stats().size)
+
+    def test_put_after_invalidation_of_another_tag(self):
+        cache = QueryCache()
+        epoch = cache.epoch
+        cache.invalidate_tag("post")
+        cache.put(b"users", 1, epoch, tags=["user"])
+        cache.put(b"untagged", 2, epoch)
+        cache.put(b"both", 3, epoch, tags=["user", "post"])
+        self.assertEqual(2, cache.stats().size)
+        self.assertIsNone(cache.lookup(b"both")[0])
+
+    def test_errors_are_not_cached(self):
+        cache = QueryCache()
+        self.assertEqual("boom", cached_query(cache, b"key", lambda: response("boom", "ERR"), None, (), True))
+        self.assertEqual(0, cache.stats().size)
+
+
+class TestStaleWhileRevalidate(IsolatedAsyncioTestCase):
+
+    async def test_stale_result_is_refreshed_once(self):
+        cache = QueryCache(ttl=0.1, stale_ttl=10)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return response(len(calls))
+
+        self.assertEqual(1, await cached_query_async(cache, b"key", fetch, None, (), True))
+        await asyncio.sleep(0.11)
+        results = await asyncio.gather(*(cached_query_async(cache, b"key", fetch, None, (), True) for _ in range(5)))
+        self.assertEqual([1] * 5, results)
+        await asyncio.sleep(0.03)
+        self.assertEqual(2, await cached_query_async(cache, b"key", fetch, None, (), True))
+        self.assertEqual(2, len(calls))
+        stats = cache.stats()
+        self.assertEqual((5, 1), (stats.stale_hits, stats.refreshes))
+
+    async def test_stale_result_is_a_miss_without_background(self):
+        cache = QueryCache(ttl=0.01, stale_ttl=10)
+
+        async def fetch():
+            return response("fresh")
+
+        cache.put(b"key", "stale", cache.epoch)
+        await asyncio.sleep(0.02)
+        self.assertEqual("fresh", await cached_query_async(cache, b"key", fetch, None, (), False))
+        self.assertEqual("fresh", await cached_query_async(cache, b"key", fetch, None, (), False))
+        self.assertEqual(1, cache.stats().hits)
+
+    def test_blocking_refresh(self):
+        cache = QueryCache(ttl=0.01, stale_ttl=10)
+        cache.put(b"key", "stale", cache.epoch)
+        time.sleep(0.02)
+        self.assertEqual("stale", cached_query(cache, b"key", lambda: response("fresh"), None, (), True))
+        deadline = time.monotonic() + 1
+        while cache.lookup(b"key")[0] is None or cached_query(cache, b"key", self.fail, None, (), True) != "fresh":
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+
+if __name__ == "__main__":
+    main()
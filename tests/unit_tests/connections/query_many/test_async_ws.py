@@ -0,0 +1,61 @@
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.connections.query_result import StatementError
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url)
+        _ = await self.connection.signin(self.vars_params)
+        _ = await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_query_many(self):
+        outcome = await self.connection.query_many(
+            "CREATE user:tobie SET name = $name; SELECT name FROM user; RETURN 1;",
+            {"name": "Tobie"}
+        )
+        self.assertTrue(outcome.ok)
+        self.assertEqual(3, len(outcome))
+        self.assertEqual(["OK", "OK", "OK"], [statement.status for statement in outcome])
+        self.assertEqual(RecordID("user", "tobie"), outcome[0].result[0]["id"])
+        self.assertEqual([{"name": "Tobie"}], outcome[1].result)
+        self.assertEqual(1, outcome[2].result)
+        for statement in outcome:
+            self.assertIsNotNone(statement.duration)
+
+    async def test_query_many_statement_error(self):
+        outcome = await self.connection.query_many("RETURN 1; THROW 'boom'; RETURN 2;")
+        self.assertFalse(outcome.ok)
+        self.assertEqual(["OK", "ERR", "OK"], [statement.status for statement in outcome])
+        self.assertEqual(1, outcome[0].unwrap())
+        self.assertEqual(2, outcome[2].unwrap())
+        self.assertEqual([1], [statement.index for statement in outcome.errors])
+        with self.assertRaises(StatementError) as context:
+            outcome.values()
+        self.assertEqual(1, context.exception.index)
+        self.assertIn("boom", str(context.exception))
+
+    async def test_query_many_raise_on_error(self):
+        with self.assertRaises(StatementError):
+            await self.connection.query_many("RETURN 1; THROW 'boom';", raise_on_error=True)
+
+
+if __name__ == "__main__":
+    main()
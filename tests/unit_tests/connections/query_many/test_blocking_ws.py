@@ -0,0 +1,61 @@
+from unittest import main, TestCase
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+from surrealdb.connections.query_result import StatementError
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url)
+        _ = self.connection.signin(self.vars_params)
+        _ = self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+
+    def tearDown(self):
+        self.connection.query("DELETE user;")
+        self.connection.close()
+
+    def test_query_many(self):
+        outcome = self.connection.query_many(
+            "CREATE user:tobie SET name = $name; SELECT name FROM user; RETURN 1;",
+            {"name": "Tobie"}
+        )
+        self.assertTrue(outcome.ok)
+        self.assertEqual(3, len(outcome))
+        self.assertEqual(["OK", "OK", "OK"], [statement.status for statement in outcome])
+        self.assertEqual(RecordID("user", "tobie"), outcome[0].result[0]["id"])
+        self.assertEqual([{"name": "Tobie"}], outcome[1].result)
+        self.assertEqual(1, outcome[2].result)
+        for statement in outcome:
+            self.assertIsNotNone(statement.duration)
+
+    def test_query_many_statement_error(self):
+        outcome = self.connection.query_many("RETURN 1; THROW 'boom'; RETURN 2;")
+        self.assertFalse(outcome.ok)
+        self.assertEqual(["OK", "ERR", "OK"], [statement.status for statement in outcome])
+        self.assertEqual(1, outcome[0].unwrap())
+        self.assertEqual(2, outcome[2].unwrap())
+        self.assertEqual([1], [statement.index for statement in outcome.errors])
+        with self.assertRaises(StatementError) as context:
+            outcome.values()
+        self.assertEqual(1, context.exception.index)
+        self.assertIn("boom", str(context.exception))
+
+    def test_query_many_raise_on_error(self):
+        with self.assertRaises(StatementError):
+            self.connection.query_many("RETURN 1; THROW 'boom';", raise_on_error=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from unittest import main, TestCase
+
+from surrealdb.connections.query_result import QueryResults, StatementError, parse_server_time
+from surrealdb.data.types.duration import Duration
+
+
+class TestQueryResult(TestCase):
+
+    def setUp(self):
+        self.results = QueryResults.from_response([
+            {"result": [{"name": "Tobie"}], "status": "OK", "time": "1.5ms"},
+            {"result": "An error occurred: boom", "status": "ERR", "time": "12.25µs"},
+        ])
+
+    def test_parse_server_time(self):
+        self.assertEqual(Duration(1_020_958), parse_server_time("1.020958ms"))
+        self.assertEqual(Duration(52_125), parse_server_time("52.125µs"))
+        self.assertEqual(Duration(52_125), parse_server_time("52.125us"))
+        self.assertEqual(Duration(120), parse_server_time("120ns"))
+        self.assertEqual(Duration(62_500_000_000), parse_server_time("1m2.5s"))
+        self.assertIsNone(parse_server_time(None))
+        with self.assertRaises(ValueError):
+            parse_server_time("fast")
+
+    def test_results(self):
+        self.assertFalse(self.results.ok)
+        self.assertEqual([{"name": "Tobie"}], self.results[0].unwrap())
+        self.assertIsNone(self.results[0].error)
+        self.assertEqual("An error occurred: boom", self.results[1].error)
+        self.assertEqual(Duration(1_512_250), self.results.total_time)
+
+    def test_errors_on_demand(self):
+        with self.assertRaises(StatementError) as context:
+            self.results.raise_for_errors()
+        self.assertEqual("error in statement 1: An error occurred: boom", str(context.exception))
+        with self.assertRaises(StatementError):
+            self.results[1].unwrap()
+
+
+if __name__ == "__main__":
+    main()
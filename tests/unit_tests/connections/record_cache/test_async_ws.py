@@ -0,0 +1,60 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.connections.record_cache import RecordCache
+from surrealdb.data import RecordID
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.cache = RecordCache(max_size=10)
+        self.connection = AsyncWsSurrealConnection(self.url, record_cache=self.cache)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.query("CREATE user:tobie SET name = 'Tobie';")
+        self.other_connection = AsyncWsSurrealConnection(self.url)
+        await self.other_connection.signin(self.vars_params)
+        await self.other_connection.use(namespace=self.namespace, database=self.database_name)
+
+    async def asyncTearDown(self):
+        await self.other_connection.query("DELETE user;")
+        await self.other_connection.close()
+        await self.connection.close()
+
+    async def test_read_through(self):
+        self.assertEqual("Tobie", (await self.connection.select("user:tobie"))["name"])
+        self.assertEqual("Tobie", (await self.connection.select(RecordID("user", "tobie")))["name"])
+        stats = self.cache.stats()
+        self.assertEqual((1, 1, 1), (stats.size, stats.hits, stats.misses))
+
+    async def test_invalidated_by_live_query(self):
+        await self.connection.select("user:tobie")
+        await self.other_connection.query("UPDATE user:tobie SET name = 'Tobie Morgan';")
+        await asyncio.sleep(0.5)
+        self.assertEqual("Tobie Morgan", (await self.connection.select("user:tobie"))["name"])
+        self.assertEqual(1, self.cache.stats().invalidations)
+
+    async def test_invalidated_by_own_write(self):
+        await self.connection.select("user:tobie")
+        await self.connection.merge(RecordID("user", "tobie"), {"name": "Tobie Morgan"})
+        self.assertEqual("Tobie Morgan", (await self.connection.select("user:tobie"))["name"])
+
+    async def test_tables_are_not_cached(self):
+        await self.connection.select("user")
+        self.assertEqual(0, self.cache.stats().size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import time
+from unittest import TestCase, main
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+from surrealdb.connections.record_cache import RecordCache
+from surrealdb.data import RecordID
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.cache = RecordCache(max_size=10)
+        self.connection = BlockingWsSurrealConnection(self.url, record_cache=self.cache)
+        self.connection.signin(self.vars_params)
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.connection.query("CREATE user:tobie SET name = 'Tobie';")
+        self.other_connection = BlockingWsSurrealConnection(self.url)
+        self.other_connection.signin(self.vars_params)
+        self.other_connection.use(namespace=self.namespace, database=self.database_name)
+
+    def tearDown(self):
+        self.other_connection.query("DELETE user;")
+        self.other_connection.close()
+        self.connection.close()
+
+    def test_read_through(self):
+        self.assertEqual("Tobie", self.connection.select("user:tobie")["name"])
+        self.assertEqual("Tobie", self.connection.select(RecordID("user", "tobie"))["name"])
+        stats = self.cache.stats()
+        self.assertEqual((1, 1, 1), (stats.size, stats.hits, stats.misses))
+
+    def test_invalidated_by_live_query(self):
+        self.connection.select("user:tobie")
+        self.other_connection.query("UPDATE user:tobie SET name = 'Tobie Morgan';")
+        time.sleep(0.5)
+        self.assertEqual("Tobie Morgan", self.connection.select("user:tobie")["name"])
+
+    def test_invalidated_by_own_write(self):
+        self.connection.select("user:tobie")
+        self.connection.delete(RecordID("user", "tobie"))
+        self.assertIsNone(self.connection.select("user:tobie"))
+
+    def test_use_clears_cache(self):
+        self.connection.select("user:tobie")
+        self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.assertEqual(0, self.cache.stats().size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import time
+from unittest import TestCase, main
+
+from surrealdb.connections.record_cache import RecordCache, RecordCacheWatcher, record_cache_key
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+
+class TestRecordCacheKey(TestCase):
+
+    def test_keys(self):
+        self.assertEqual(("user", 123), record_cache_key("user:123"))
+        self.assertEqual(("user", 123), record_cache_key(RecordID("user", 123)))
+        self.assertEqual(("user", "tobie"), record_cache_key("user:tobie"))
+        self.assertNotEqual(record_cache_key("user:123"), record_cache_key(RecordID("user", "123")))
+
+    def test_not_cached(self):
+        self.assertIsNone(record_cache_key("user"))
+        self.assertIsNone(record_cache_key(Table("user")))
+        self.assertIsNone(record_cache_key("user:⟨tobie jaime⟩"))
+        self.assertIsNone(record_cache_key(RecordID("user", [1, 2])))
+
+
+class TestRecordCache(TestCase):
+
+    def test_hit_returns_copy(self):
+        cache = RecordCache()
+        cache.put(("user", 1), {"id": RecordID("user", 1), "tags": ["a"]}, cache.epoch)
+        cached, record = cache.get(("user", 1))
+        self.assertTrue(cached)
+        record["tags"].append("b")
+        self.assertEqual(["a"], cache.get(("user", 1))[1]["tags"])
+        stats = cache.stats()
+        self.assertEqual((2, 0), (stats.hits, stats.misses))
+
+    def test_missing_record_is_cached(self):
+        cache = RecordCache()
+        self.assertEqual((False, None), cache.get(("user", 1)))
+        cache.put(("user", 1), None, cache.epoch)
+        self.assertEqual((True, None), cache.get(("user", 1)))
+
+    def test_lru_eviction(self):
+        cache = RecordCache(max_size=2)
+        cache.put(("user", 1), {"n": 1}, cache.epoch)
+        cache.put(("user", 2), {"n": 2}, cache.epoch)
+        cache.get(("user", 1))
+        cache.put(("user", 3), {"n": 3}, cache.epoch)
+        self.assertTrue(cache.get(("user", 1))[0])
+        self.assertFalse(cache.get(("user", 2))[0])
+        self.assertEqual(1, cache.stats().evictions)
+
+    def test_ttl(self):
+        cache = RecordCache(ttl=0.01)
+        cache.put(("user", 1), {"n": 1}, cache.epoch)
+        time.sleep(0.02)
+        self.assertFalse(cache.get(("user", 1))[0])
+        self.assertEqual(1, cache.stats().expirations)
+
+    def test_invalidate(self):
+        cache = RecordCache()
+        cache.put(("user", 1), {"n": 1}, cache.epoch)
+        cache.put(("user", 2), {"n": 2}, cache.epoch)
+        cache.put(("post", 1), {"n": 3}, cache.epoch)
+        cache.invalidate_thing("user:1")
+        self.assertFalse(cache.get(("user", 1))[0])
+        cache.invalidate_thing(Table("user"))
+        self.assertFalse(cache.get(("user", 2))[0])
+        self.assertTrue(cache.get(("post", 1))[0])
+        self.assertEqual(2, cache.stats().invalidations)
+
+    def test_put_after_invalidation_is_skipped(self):
+        cache = RecordCache()
+        epoch = cache.epoch
+        cache.invalidate(("user", 1))
+        cache.put(("user", 1), {"n": 1}, epoch)
+        self.assertFalse(cache.get(("user", 1))[0])
+        epoch = cache.epoch
+        cache.clear()
+        cache.put(("user", 1), {"n": 1}, epoch)
+        self.assertFalse(cache.get(("user", 1))[0])
+
+    def test_put_after_invalidation_of_another_table(self):
+        cache = RecordCache()
+        epoch = cache.epoch
+        cache.invalidate(("post", 1))
+        cache.invalidate_table("comment")
+        cache.put(("user", 1), {"n": 1}, epoch)
+        self.assertTrue(cache.get(("user", 1))[0])
+
+    def test_watcher(self):
+        cache = RecordCache()
+        closed = []
+        watcher = RecordCacheWatcher(cache, "user", closed.append)
+        cache.put(("user", 1), {"n": 1}, cache.epoch)
+        cache.put(("user", 2), {"n": 2}, cache.epoch)
+        watcher.put({"action": "UPDATE", "result": {"id": RecordID("user", 1), "n": 10}})
+        self.assertFalse(cache.get(("user", 1))[0])
+        self.assertTrue(cache.get(("user", 2))[0])
+        watcher.close()
+        self.assertFalse(cache.get(("user", 2))[0])
+        self.assertEqual(["user"], closed)
+
+
+if __name__ == "__main__":
+    main()
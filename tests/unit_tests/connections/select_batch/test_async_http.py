@@ -0,0 +1,58 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestAsyncHttpSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "http://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncHttpSurrealConnection(self.url, select_batch_window=0.001)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.query("CREATE user:1 SET name = 'Tobie'; CREATE user:2 SET name = 'Jaime';")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_select_batch(self):
+        tobie, jaime, missing = await asyncio.gather(
+            self.connection.select(RecordID("user", 1)),
+            self.connection.select(RecordID("user", 2)),
+            self.connection.select(RecordID("user", 3)),
+        )
+        self.assertEqual("Tobie", tobie["name"])
+        self.assertEqual("Jaime", jaime["name"])
+        self.assertIsNone(missing)
+        stats = self.connection.select_batcher.stats()
+        self.assertEqual((3, 1), (stats.requests, stats.batches))
+
+    async def test_session_variable_named_ids(self):
+        await self.connection.let("ids", [RecordID("user", 2)])
+        tobie, missing = await asyncio.gather(
+            self.connection.select(RecordID("user", 1)), self.connection.select(RecordID("user", 3))
+        )
+        self.assertEqual("Tobie", tobie["name"])
+        self.assertIsNone(missing)
+        self.assertEqual(1, self.connection.select_batcher.stats().batches)
+
+    async def test_tables_are_not_batched(self):
+        outcome = await self.connection.select("user")
+        self.assertEqual(2, len(outcome))
+        self.assertEqual(0, self.connection.select_batcher.stats().requests)
+
+
+if __name__ == "__main__":
+    main()
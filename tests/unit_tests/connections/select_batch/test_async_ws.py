@@ -0,0 +1,60 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url, multiplex=True, select_batch_window=0.001)
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.query("CREATE user:1 SET name = 'Tobie'; CREATE user:2 SET name = 'Jaime';")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_select_batch(self):
+        tobie, jaime, missing = await asyncio.gather(
+            self.connection.select(RecordID("user", 1)),
+            self.connection.select(RecordID("user", 2)),
+            self.connection.select(RecordID("user", 3)),
+        )
+        self.assertEqual("Tobie", tobie["name"])
+        self.assertEqual("Jaime", jaime["name"])
+        self.assertIsNone(missing)
+        stats = self.connection.select_batcher.stats()
+        self.assertEqual((3, 1), (stats.requests, stats.batches))
+
+    async def test_concurrent_batches_without_multiplex(self):
+        connection = AsyncWsSurrealConnection(self.url, select_batch_window=0.001, select_batch_size=1)
+        await connection.signin(self.vars_params)
+        await connection.use(namespace=self.namespace, database=self.database_name)
+        tobie, jaime = await asyncio.gather(
+            connection.select(RecordID("user", 1)), connection.select(RecordID("user", 2))
+        )
+        self.assertEqual(("Tobie", "Jaime"), (tobie["name"], jaime["name"]))
+        self.assertEqual(2, connection.select_batcher.stats().batches)
+        await connection.close()
+
+    async def test_tables_are_not_batched(self):
+        outcome = await self.connection.select("user")
+        self.assertEqual(2, len(outcome))
+        self.assertEqual(0, self.connection.select_batcher.stats().requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, main
+
+from surrealdb.connections.select_batch import SelectBatcher
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestSelectBatcher(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.batches = []
+        self.records = {("user", i): {"id": RecordID("user", i), "n": i} for i in range(10)}
+
+    async def load(self, record_ids):
+        self.batches.append(record_ids)
+        await asyncio.sleep(0)
+        keys = [(record_id.table_name, record_id.id) for record_id in record_ids]
+        return [self.records[key] for key in keys if key in self.records]
+
+    async def test_one_query_per_window(self):
+        batcher = SelectBatcher(self.load, 0.001)
+        ids = [RecordID("user", i) for i in range(12)]
+        results = await asyncio.gather(*(batcher.select(record_id) for record_id in ids))
+        self.assertEqual(1, len(self.batches))
+        self.assertEqual([{"id": RecordID("user", i), "n": i} for i in range(10)], results[:10])
+        self.assertEqual([None, None], results[10:])
+
+    async def test_duplicates_are_selected_once(self):
+        batcher = SelectBatcher(self.load, 0)
+        results = await asyncio.gather(*(batcher.select(RecordID("user", 1)) for _ in range(5)))
+        self.assertEqual([RecordID("user", 1)], self.batches[0])
+        self.assertEqual(5, len(results))
+        results[0]["n"] = 100
+        self.assertEqual([1] * 4, [result["n"] for result in results[1:]])
+        self.assertEqual(5, len({id(result) for result in results}))
+        stats = batcher.stats()
+        self.assertEqual((5, 1, 1, 0), (stats.requests, stats.batches, stats.records, stats.pending))
+
+    async def test_ids_of_different_types(self):
+        self.records[("user", "1")] = {"id": RecordID("user", "1"), "n": "1"}
+        batcher = SelectBatcher(self.load, 0)
+        number, text = await asyncio.gather(batcher.select(RecordID("user", 1)), batcher.select(RecordID("user", "1")))
+        self.assertEqual((1, "1"), (number["n"], text["n"]))
+
+    async def test_max_size(self):
+        batcher = SelectBatcher(self.load, 10, max_size=4)
+        await asyncio.gather(*(batcher.select(RecordID("user", i)) for i in range(8)))
+        self.assertEqual([4, 4], [len(batch) for batch in self.batches])
+
+    async def test_error_fails_the_batch(self):
+        async def fail(record_ids):
+            raise ValueError("boom")
+
+        batcher = SelectBatcher(fail, 0)
+        results = await asyncio.gather(
+            batcher.select(RecordID("user", 1)), batcher.select(RecordID("user", 2)), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    async def test_cancelled_caller(self):
+        batcher = SelectBatcher(self.load, 0.001)
+        first = asyncio.ensure_future(batcher.select(RecordID("user", 1)))
+        second = asyncio.ensure_future(batcher.select(RecordID("user", 1)))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(1, (await second)["n"])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            SelectBatcher(self.load, -1)
+        with self.assertRaises(ValueError):
+            SelectBatcher(self.load, 0, max_size=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url)
+        _ = await self.connection.signin(self.vars_params)
+        _ = await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.insert("user", [{"id": i, "name": f"user {i}", "age": i} for i in range(25)])
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_select_iter(self):
+        rows = [row async for row in self.connection.select_iter("user", page_size=10)]
+        self.assertEqual(25, len(rows))
+        self.assertEqual(list(range(25)), [row["id"].id for row in rows])
+
+    async def test_select_iter_exact_pages(self):
+        rows = [row async for row in self.connection.select_iter("user", page_size=5)]
+        self.assertEqual(25, len(rows))
+
+    async def test_select_iter_fields_and_where(self):
+        rows = [row async for row in self.connection.select_iter("user", page_size=4, fields=["age"], where="age >= $min", params={"min": 10})]
+        self.assertEqual(list(range(10, 25)), [row["age"] for row in rows])
+        self.assertEqual({"id", "age"}, set(rows[0].keys()))
+
+    async def test_select_iter_multiplexed(self):
+        connection = AsyncWsSurrealConnection(self.url, multiplex=True)
+        await connection.signin(self.vars_params)
+        await connection.use(namespace=self.namespace, database=self.database_name)
+        rows = [row async for row in connection.select_iter("user", page_size=3)]
+        self.assertEqual(list(range(25)), [row["id"].id for row in rows])
+        await connection.close()
+
+    async def test_select_iter_break(self):
+        rows = self.connection.select_iter("user", page_size=10)
+        async for _ in rows:
+            break
+        await rows.aclose()
+        self.assertEqual(25, len(await self.connection.select("user")))
+
+
+if __name__ == "__main__":
+    main()
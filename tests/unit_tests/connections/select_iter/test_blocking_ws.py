@@ -0,0 +1,59 @@
+from unittest import main, TestCase
+
+from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
+
+
+class TestBlockingWsSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingWsSurrealConnection(self.url)
+        _ = self.connection.signin(self.vars_params)
+        _ = self.connection.use(namespace=self.namespace, database=self.database_name)
+        self.connection.query("DELETE user;")
+        self.connection.insert("user", [{"id": i, "name": f"user {i}", "age": i} for i in range(25)])
+
+    def tearDown(self):
+        self.connection.query("DELETE user;")
+        self.connection.close()
+
+    def test_select_iter(self):
+        rows = list(self.connection.select_iter("user", page_size=10))
+        self.assertEqual(25, len(rows))
+        self.assertEqual(list(range(25)), [row["id"].id for row in rows])
+
+    def test_select_iter_exact_pages(self):
+        rows = list(self.connection.select_iter("user", page_size=5))
+        self.assertEqual(25, len(rows))
+
+    def test_select_iter_fields_and_where(self):
+        rows = list(self.connection.select_iter("user", page_size=4, fields=["age"], where="age >= $min", params={"min": 10}))
+        self.assertEqual(list(range(10, 25)), [row["age"] for row in rows])
+        self.assertEqual({"id", "age"}, set(rows[0].keys()))
+
+    def test_select_iter_multiplexed(self):
+        connection = BlockingWsSurrealConnection(self.url, multiplex=True)
+        connection.signin(self.vars_params)
+        connection.use(namespace=self.namespace, database=self.database_name)
+        rows = list(connection.select_iter("user", page_size=3))
+        self.assertEqual(list(range(25)), [row["id"].id for row in rows])
+        connection.close()
+
+    def test_select_iter_break(self):
+        rows = self.connection.select_iter("user", page_size=10)
+        for _ in rows:
+            break
+        rows.close()
+        self.assertEqual(25, len(self.connection.select("user")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+from unittest import main, TestCase
+
+from surrealdb.connections.pagination import keyset_queries, keyset_variables
+from surrealdb.data.types.table import Table
+
+
+class TestPagination(TestCase):
+
+    def test_keyset_queries(self):
+        first, after = keyset_queries(None, None, 100)
+        self.assertEqual("SELECT * FROM type::table($select_iter_table) ORDER BY id LIMIT 100;", first)
+        self.assertEqual(
+            "SELECT * FROM type::table($select_iter_table) WHERE id > $select_iter_last ORDER BY id LIMIT 100;",
+            after
+        )
+
+    def test_keyset_queries_fields_and_where(self):
+        first, after = keyset_queries(["name", "age"], "age > $age", 10)
+        self.assertEqual(
+            "SELECT id, name, age FROM type::table($select_iter_table) WHERE age > $age ORDER BY id LIMIT 10;",
+            first
+        )
+        self.assertEqual(
+            "SELECT id, name, age FROM type::table($select_iter_table) "
+            "WHERE id > $select_iter_last AND (age > $age) ORDER BY id LIMIT 10;",
+            after
+        )
+
+    def test_keyset_variables(self):
+        self.assertEqual({"age": 1, "select_iter_table": "user"}, keyset_variables(Table("user"), {"age": 1}))
+        with self.assertRaises(ValueError):
+            keyset_variables("user:tobie", None)
+        with self.assertRaises(ValueError):
+            keyset_queries(None, None, 0)
+
+
+if __name__ == "__main__":
+    main()
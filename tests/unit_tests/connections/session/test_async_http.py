@@ -0,0 +1,48 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_http import AsyncHttpSurrealConnection
+
+
+class TestAsyncHttpSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "http://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncHttpSurrealConnection(self.url, connection_limit=4, keepalive_timeout=30)
+        _ = await self.connection.signin(self.vars_params)
+        _ = await self.connection.use(namespace=self.namespace, database=self.database_name)
+
+    async def asyncTearDown(self):
+        await self.connection.close()
+
+    async def test_session_reused(self):
+        session = self.connection._session
+        await self.connection.version()
+        await asyncio.gather(*[self.connection.version() for _ in range(10)])
+        self.assertIs(session, self.connection._session)
+        self.assertEqual(4, session.connector.limit)
+
+    async def test_close(self):
+        session = self.connection._session
+        await self.connection.close()
+        self.assertTrue(session.closed)
+        self.assertIsNone(self.connection._session)
+        self.assertIsInstance(await self.connection.version(), str)
+
+    async def test_context_manager(self):
+        async with AsyncHttpSurrealConnection(self.url) as connection:
+            self.assertIsInstance(await connection.version(), str)
+            session = connection._session
+        self.assertTrue(session.closed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import main, TestCase
+
+from surrealdb.connections.blocking_http import BlockingHttpSurrealConnection
+
+
+class TestBlockingHttpSurrealConnection(TestCase):
+
+    def setUp(self):
+        self.url = "http://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = BlockingHttpSurrealConnection(self.url, pool_maxsize=4)
+        _ = self.connection.signin(self.vars_params)
+        _ = self.connection.use(namespace=self.namespace, database=self.database_name)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def test_headers_built_on_state_change(self):
+        headers = self.connection._headers
+        self.assertEqual(f"Bearer {self.connection.token}", headers["Authorization"])
+        self.assertEqual(self.namespace, headers["Surreal-NS"])
+        self.assertEqual(self.database_name, headers["Surreal-DB"])
+        self.connection.version()
+        self.assertIs(headers, self.connection._headers)
+        self.connection.invalidate()
+        self.assertNotIn("Authorization", self.connection._headers)
+
+    def test_shared_between_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outcome = list(executor.map(lambda _: self.connection.version(), range(20)))
+        self.assertEqual(20, len(outcome))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import asyncio
+from unittest import main, IsolatedAsyncioTestCase
+
+from surrealdb.connections.async_ws import AsyncWsSurrealConnection
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.url = "ws://localhost:8000"
+        self.password = "root"
+        self.username = "root"
+        self.vars_params = {
+            "username": self.username,
+            "password": self.password,
+        }
+        self.database_name = "test_db"
+        self.namespace = "test_ns"
+        self.connection = AsyncWsSurrealConnection(self.url, multiplex=True, single_flight=["select"])
+        await self.connection.signin(self.vars_params)
+        await self.connection.use(namespace=self.namespace, database=self.database_name)
+        await self.connection.query("DELETE user;")
+        await self.connection.query("CREATE user:tobie SET name = 'Tobie';")
+
+    async def asyncTearDown(self):
+        await self.connection.query("DELETE user;")
+        await self.connection.close()
+
+    async def test_select(self):
+        results = await asyncio.gather(*(self.connection.select(RecordID("user", "tobie")) for _ in range(10)))
+        self.assertTrue(all(result == {"id": RecordID("user", "tobie"), "name": "Tobie"} for result in results))
+        stats = self.connection.single_flight.stats()
+        self.assertEqual(10, stats.requests)
+        self.assertGreater(stats.shared, 0)
+
+    async def test_opt_out(self):
+        await asyncio.gather(*(self.connection.select("user", single_flight=False) for _ in range(10)))
+        self.assertEqual(0, self.connection.single_flight.stats().requests)
+
+    async def test_query_opt_in(self):
+        query = "SELECT * FROM user;"
+        results = await asyncio.gather(*(self.connection.query(query, single_flight=True) for _ in range(10)))
+        self.assertEqual(10, len(results))
+        self.assertGreater(self.connection.single_flight.stats().shared, 0)
+
+    async def test_write_is_not_joined(self):
+        pending = asyncio.ensure_future(self.connection.select(RecordID("user", "tobie")))
+        await asyncio.sleep(0)
+        await self.connection.merge(RecordID("user", "tobie"), {"name": "Tobie Morgan"})
+        self.assertEqual("Tobie Morgan", (await self.connection.select(RecordID("user", "tobie")))["name"])
+        await pending
+
+
+if __name__ == "__main__":
+    main()
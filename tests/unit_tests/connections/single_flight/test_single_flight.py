@@ -0,0 +1,99 @@
+import asyncio
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+
+from surrealdb.connections.single_flight import SingleFlight, single_flight_key
+from surrealdb.data.types.record_id import RecordID
+
+
+class TestSingleFlightKey(TestCase):
+
+    def test_keys(self):
+        self.assertEqual(
+            single_flight_key("query", "SELECT * FROM $tb;", {"tb": "user", "limit": 1}),
+            single_flight_key("query", "SELECT * FROM $tb;", {"limit": 1, "tb": "user"}),
+        )
+        self.assertNotEqual(single_flight_key("select", "user"), single_flight_key("query", "user"))
+        self.assertNotEqual(
+            single_flight_key("select", RecordID("user", 1)), single_flight_key("select", RecordID("user", 2))
+        )
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            SingleFlight(["create"])
+
+    def test_enabled(self):
+        group = SingleFlight(["select"])
+        self.assertTrue(group.enabled("select", None))
+        self.assertFalse(group.enabled("select", False))
+        self.assertFalse(group.enabled("query", None))
+        self.assertTrue(group.enabled("query", True))
+
+
+class TestSingleFlight(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.group = SingleFlight()
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"result": self.calls}
+
+    async def test_identical_requests_share_one_call(self):
+        results = await asyncio.gather(*(self.group.do(b"key", self.fetch) for _ in range(100)))
+        self.assertEqual(1, self.calls)
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(100, len({id(result) for result in results}))
+        stats = self.group.stats()
+        self.assertEqual((100, 99, 0), (stats.requests, stats.shared, stats.in_flight))
+        self.assertEqual(0.99, stats.hit_rate)
+
+    async def test_joined_caller_gets_its_own_result(self):
+        async def change():
+            result = await self.group.do(b"key", self.fetch)
+            result["result"] = "changed"
+            return result
+
+        # the caller that sent the request changes its result
+        sent, joined = await asyncio.gather(change(), self.group.do(b"key", self.fetch))
+        self.assertEqual(({"result": "changed"}, {"result": 1}), (sent, joined))
+        # a caller that joined the request changes its result
+        sent, joined = await asyncio.gather(self.group.do(b"key", self.fetch), change())
+        self.assertEqual(({"result": 2}, {"result": "changed"}), (sent, joined))
+
+    async def test_sequential_requests_are_not_shared(self):
+        await self.group.do(b"key", self.fetch)
+        await self.group.do(b"key", self.fetch)
+        self.assertEqual(2, self.calls)
+
+    async def test_different_keys(self):
+        await asyncio.gather(self.group.do(b"a", self.fetch), self.group.do(b"b", self.fetch))
+        self.assertEqual(2, self.calls)
+
+    async def test_error_is_shared(self):
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*(self.group.do(b"key", fail) for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(0, self.group.stats().in_flight)
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        first = asyncio.ensure_future(self.group.do(b"key", self.fetch))
+        second = asyncio.ensure_future(self.group.do(b"key", self.fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual({"result": 1}, await second)
+
+    async def test_forget(self):
+        first = asyncio.ensure_future(self.group.do(b"key", self.fetch))
+        await asyncio.sleep(0)
+        self.group.forget()
+        await asyncio.gather(first, self.group.do(b"key", self.fetch))
+        self.assertEqual(2, self.calls)
+
+
+if __name__ == "__main__":
+    main()
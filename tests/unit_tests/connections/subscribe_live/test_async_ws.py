@@ -1,7 +1,7 @@
 import asyncio
 from asyncio import TimeoutError
 from unittest import main, IsolatedAsyncioTestCase
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from surrealdb.connections.async_ws import AsyncWsSurrealConnection
 from surrealdb.data import RecordID
@@ -53,6 +53,16 @@ class TestAsyncWsSurrealConnection(IsolatedAsyncioTestCase):
         await self.pub_connection.socket.close()
         await self.connection.socket.close()
 
+    async def test_unknown_or_killed_live_query(self):
+        with self.assertRaises(ValueError):
+            await self.connection.subscribe_live(uuid4()).__anext__()
+        query_uuid = await self.connection.live("user")
+        await self.connection.kill(query_uuid)
+        with self.assertRaises(ValueError):
+            await self.connection.subscribe_live(query_uuid).__anext__()
+        await self.pub_connection.socket.close()
+        await self.connection.socket.close()
+
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,5 @@
 from unittest import TestCase, main
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from surrealdb.connections.blocking_ws import BlockingWsSurrealConnection
 from surrealdb.data import RecordID
@@ -55,5 +55,14 @@ class TestBlockingWsSurrealConnection(TestCase):
 
         self.pub_connection.kill(query_uuid)
 
+    def test_unknown_or_killed_live_query(self):
+        with self.assertRaises(ValueError):
+            next(self.connection.subscribe_live(uuid4()))
+        query_uuid = self.connection.live("user")
+        self.connection.kill(query_uuid)
+        with self.assertRaises(ValueError):
+            next(self.connection.subscribe_live(query_uuid))
+
+
 if __name__ == "__main__":
     main()
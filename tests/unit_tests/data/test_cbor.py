@@ -0,0 +1,152 @@
+from io import BytesIO
+from threading import Thread
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import cbor2
+
+from surrealdb.data import cbor as cbor_module
+from surrealdb.data.cbor import (
+    _new_pooled_encoder,
+    decode,
+    default_encoder,
+    encode,
+    register_decoder,
+    register_encoder,
+    unregister_decoder,
+    unregister_encoder,
+)
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.geometry import GeometryPoint, GeometryLine, GeometryPolygon, GeometryCollection
+from surrealdb.data.types.range import BoundIncluded, BoundExcluded
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+
+class Money:
+
+    def __init__(self, currency: str, amount: int) -> None:
+        self.currency = currency
+        self.amount = amount
+
+
+class TestCbor(TestCase):
+
+    def register(self, data_type, tag, to_value, from_value) -> None:
+        """
+        Registers a custom type for the length of the test.
+        """
+        register_encoder(data_type, tag, to_value)
+        register_decoder(tag, from_value)
+        self.addCleanup(unregister_decoder, tag)
+        self.addCleanup(unregister_encoder, data_type)
+
+    def test_round_trip(self):
+        line = GeometryLine(GeometryPoint(1.0, 2.0), GeometryPoint(3.0, 4.0))
+        values = [
+            RecordID("user", "tobie"),
+            Table("user"),
+            Duration(3_000_000_005),
+            DateTimeCompact(1_700_000_000_123_456_789),
+            BoundIncluded(1),
+            BoundExcluded(2),
+            GeometryPoint(1.0, 2.0),
+            line,
+            GeometryPolygon(line, line),
+            GeometryCollection(GeometryPoint(1.0, 2.0), line),
+        ]
+        for value in values:
+            self.assertEqual(value, decode(encode(value)))
+
+    def test_nested_round_trip(self):
+        data = {"id": RecordID("user", 1), "friends": [RecordID("user", 2), RecordID("user", 3)], "age": 30}
+        self.assertEqual(data, decode(encode(data)))
+
+    def test_subclass_uses_base_encoder(self):
+        class Person(Table):
+            pass
+
+        self.assertEqual(Table("person"), decode(encode(Person("person"))))
+
+    def test_unknown_type(self):
+        with self.assertRaises(BufferError):
+            encode(object())
+
+    def test_register_custom_type(self):
+        self.register(Money, 1000, lambda money: [money.currency, money.amount], lambda value: Money(*value))
+        outcome = decode(encode({"price": Money("GBP", 120)}))
+        self.assertIsInstance(outcome["price"], Money)
+        self.assertEqual("GBP", outcome["price"].currency)
+        self.assertEqual(120, outcome["price"].amount)
+
+    def test_pooled_encoder_matches_dumps(self):
+        data = [{"id": RecordID("user", i), "tags": ["a", "b"], "score": i / 2} for i in range(50)]
+        self.assertEqual(cbor2.dumps(data, default=default_encoder), encode(data))
+        self.assertEqual(cbor2.dumps([1], default=default_encoder), encode([1]))
+
+    def test_cbor2_dispatch_table(self):
+        # the pooled encoder puts the registered types in this private table of the pinned cbor2
+        table = cbor2.CBOREncoder(BytesIO())._encoders
+        self.assertIsInstance(table, dict)
+        self.assertIn(RecordID, _new_pooled_encoder()._encoders)
+
+    def test_pooled_encoder_without_dispatch_table(self):
+        class Encoder(cbor2.CBOREncoder):
+            _encoders = None
+
+        data = [{"id": RecordID("user", 1), "at": DateTimeCompact(5)}]
+        with patch.object(cbor_module.cbor2, "CBOREncoder", Encoder):
+            encoder = _new_pooled_encoder()
+        encoder.encode(data)
+        self.assertEqual(cbor2.dumps(data, default=default_encoder), encoder.fp.getvalue())
+
+    def test_pooled_encoder_after_error(self):
+        with self.assertRaises(BufferError):
+            encode([1, object()])
+        self.assertEqual([1, 2], decode(encode([1, 2])))
+
+    def test_nested_encode_call(self):
+        class Wrapper:
+            def __init__(self, value) -> None:
+                self.value = value
+
+        self.register(Wrapper, 1001, lambda wrapper: encode(wrapper.value), decode)
+        self.assertEqual({"a": [RecordID("user", 1)]}, decode(encode({"a": Wrapper([RecordID("user", 1)])})))
+
+    def test_register_after_encode(self):
+        class Point3D(GeometryPoint):
+            pass
+
+        point = Point3D(1.0, 2.0)
+        self.assertEqual(GeometryPoint(1.0, 2.0), decode(encode(point)))
+        self.register(Point3D, 1002, lambda p: "point", lambda value: value)
+        self.assertEqual("point", decode(encode(point)))
+
+    def test_unregister(self):
+        self.register(Money, 1000, lambda money: [money.currency, money.amount], lambda value: Money(*value))
+        encode(Money("GBP", 1))
+        unregister_encoder(Money)
+        unregister_decoder(1000)
+        with self.assertRaises(BufferError):
+            encode(Money("GBP", 1))
+        with self.assertRaises(BufferError):
+            decode(cbor2.dumps(cbor2.CBORTag(1000, ["GBP", 1])))
+
+    def test_encode_from_threads(self):
+        outcomes = dict()
+
+        def run(index: int) -> None:
+            outcomes[index] = [decode(encode(RecordID("user", i))) for i in range(200)]
+
+        threads = [Thread(target=run, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for index in range(8):
+            self.assertEqual([RecordID("user", i) for i in range(200)], outcomes[index])
+
+
+if __name__ == "__main__":
+    main()
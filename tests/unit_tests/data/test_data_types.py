@@ -0,0 +1,87 @@
+import copy
+import pickle
+from dataclasses import FrozenInstanceError
+from unittest import TestCase, main
+
+from surrealdb.data.cbor import decode, encode
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+from surrealdb.data.types.future import Future
+from surrealdb.data.types.range import BoundExcluded, BoundIncluded, Range
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+VALUES = [
+    RecordID("user", 1),
+    RecordID("user", ["London", 2024]),
+    RecordID("user", {"city": "London"}),
+    Table("user"),
+    Duration(1_500),
+    DateTimeCompact(1_700_000_000_000_000_000),
+    Future(1),
+    BoundIncluded(1),
+    BoundExcluded([1, 2]),
+    Range(BoundIncluded(1), BoundExcluded(5)),
+]
+
+
+class TestDataTypes(TestCase):
+
+    def test_slots(self):
+        for value in VALUES:
+            self.assertFalse(hasattr(value, "__dict__"), value)
+
+    def test_frozen(self):
+        for value in VALUES:
+            name = value.__slots__[0] if value.__slots__ else "value"
+            with self.assertRaises(FrozenInstanceError):
+                setattr(value, name, None)
+        with self.assertRaises(AttributeError):
+            del RecordID("user", 1).id
+
+    def test_hash(self):
+        for value in VALUES:
+            self.assertEqual(hash(value), hash(copy.deepcopy(value)), value)
+            self.assertEqual(value, pickle.loads(pickle.dumps(value)))
+        self.assertEqual(1, len({RecordID("user", 1), RecordID("user", 1)}))
+        self.assertEqual(2, len({RecordID("user", 1), RecordID("user", "1")}))
+        self.assertEqual(2, len({BoundIncluded(1), BoundExcluded(1)}))
+        self.assertEqual("tobie", {RecordID("user", "tobie"): "tobie"}[RecordID("user", "tobie")])
+
+    def test_equality(self):
+        self.assertNotEqual(RecordID("user", 1), RecordID("post", 1))
+        self.assertIs(False, RecordID("user", 1) == "user:1")
+        self.assertNotEqual(Table("user"), "user")
+
+    def test_record_id_ordering(self):
+        ordered = [
+            RecordID("post", 9),
+            RecordID("user", 1),
+            RecordID("user", 2.5),
+            RecordID("user", "a"),
+            RecordID("user", [1]),
+            RecordID("user", {"a": 1}),
+        ]
+        self.assertEqual(ordered, sorted(reversed(ordered)))
+        self.assertLess(RecordID("user", 1), RecordID("user", 2))
+        self.assertGreaterEqual(RecordID("user", "b"), RecordID("user", "a"))
+
+    def test_ordering(self):
+        self.assertEqual([Table("a"), Table("b")], sorted([Table("b"), Table("a")]))
+        self.assertEqual([Duration(1), Duration(2)], sorted([Duration(2), Duration(1)]))
+        self.assertLess(DateTimeCompact(1), DateTimeCompact(2))
+        with self.assertRaises(TypeError):
+            RecordID("user", 1) < Table("user")
+
+    def test_repr(self):
+        self.assertEqual("Duration(elapsed=1500)", repr(Duration(1_500)))
+        self.assertEqual("RecordID(table_name=user, record_id={'city': 'London'})", repr(VALUES[2]))
+        self.assertEqual("Range(begin=BoundIncluded(value=1), end=BoundExcluded(value=5))", repr(VALUES[-1]))
+
+    def test_round_trip(self):
+        for value in (RecordID("user", 1), Table("user"), Duration(1_500)):
+            self.assertEqual(value, decode(encode(value)))
+
+
+if __name__ == "__main__":
+    main()
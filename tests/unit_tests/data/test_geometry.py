@@ -0,0 +1,107 @@
+from array import array
+from unittest import TestCase, main, skipIf
+
+import cbor2
+
+from surrealdb.data.cbor import decode, encode, encode_coordinates
+from surrealdb.data.types.geometry import (
+    GeometryLine,
+    GeometryMultiLine,
+    GeometryMultiPoint,
+    GeometryMultiPolygon,
+    GeometryPoint,
+    GeometryPolygon,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def line(*pairs) -> GeometryLine:
+    return GeometryLine(*(GeometryPoint(longitude, latitude) for longitude, latitude in pairs))
+
+
+class TestGeometryArrays(TestCase):
+
+    def test_line_keeps_flat_coordinates(self):
+        geometry = line((1.0, 2.0), (3.0, 4.0), (5.0, 6.0))
+        self.assertEqual(array("d", [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]), geometry.coordinates)
+        self.assertEqual([GeometryPoint(3.0, 4.0)], geometry.geometry_points[1:2])
+        self.assertEqual([(1.0, 2.0), (3.0, 4.0), (5.0, 6.0)], geometry.get_coordinates())
+
+    def test_assign_points(self):
+        geometry = line((1.0, 2.0), (3.0, 4.0))
+        geometry.geometry_points = [GeometryPoint(7.0, 8.0), (9.0, 10.0)]
+        self.assertEqual(array("d", [7.0, 8.0, 9.0, 10.0]), geometry.coordinates)
+
+    def test_polygon_offsets_and_parts(self):
+        polygon = GeometryPolygon(line((0.0, 0.0), (1.0, 0.0), (0.0, 0.0)), line((2.0, 2.0), (3.0, 3.0)))
+        self.assertEqual(array("q", [0, 3, 5]), polygon.offsets)
+        self.assertEqual([[0.0, 0.0, 1.0, 0.0, 0.0, 0.0], [2.0, 2.0, 3.0, 3.0]], [p.tolist() for p in polygon.parts()])
+        self.assertEqual(line((2.0, 2.0), (3.0, 3.0)), polygon.geometry_lines[1])
+
+    def test_multi_polygon(self):
+        first = GeometryPolygon(line((0.0, 0.0), (1.0, 1.0)), line((2.0, 2.0), (3.0, 3.0)))
+        second = GeometryPolygon(
+            line((4.0, 4.0), (5.0, 5.0)), line((6.0, 6.0), (7.0, 7.0)), line((8.0, 8.0), (9.0, 9.0))
+        )
+        multi_polygon = GeometryMultiPolygon(first, second)
+        self.assertEqual(array("q", [0, 2, 5]), multi_polygon.polygon_offsets)
+        self.assertEqual([first, second], multi_polygon.geometry_polygons)
+        self.assertEqual(second.get_coordinates(), multi_polygon.get_coordinates()[1])
+
+    def test_parse_pairs_and_tagged_points(self):
+        expected = line((1.0, 2.0), (3.0, 4.0))
+        self.assertEqual(expected, GeometryLine.parse_coordinates([[1.0, 2.0], [3.0, 4.0]]))
+        self.assertEqual(expected, GeometryLine.parse_coordinates([GeometryPoint(1.0, 2.0), GeometryPoint(3.0, 4.0)]))
+        with self.assertRaises(ValueError):
+            GeometryLine.parse_coordinates([[1.0, 2.0], [3.0]])
+
+    def test_from_coordinates_validates_offsets(self):
+        with self.assertRaises(ValueError):
+            GeometryMultiLine.from_coordinates(array("d", [1.0, 2.0, 3.0, 4.0]), [0, 3])
+        with self.assertRaises(ValueError):
+            GeometryMultiPoint.from_coordinates([1.0, 2.0, 3.0])
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_views(self):
+        coordinates = numpy.arange(8, dtype=numpy.float64)
+        polygon = GeometryPolygon.from_coordinates(coordinates, [0, 2, 4])
+        view = polygon.to_numpy()
+        self.assertEqual((4, 2), view.shape)
+        view[0, 0] = 9.0
+        self.assertEqual(9.0, polygon.coordinates[0])
+
+
+class TestGeometryEncoding(TestCase):
+
+    def test_encoded_bytes_are_unchanged(self):
+        self.assertEqual(
+            cbor2.dumps(cbor2.CBORTag(89, [[1.0, 2.0], [3.0, 4.0]])), encode(line((1.0, 2.0), (3.0, 4.0)))
+        )
+        self.assertEqual(cbor2.dumps(cbor2.CBORTag(91, [])), encode(GeometryMultiPoint()))
+        self.assertEqual(2, encode_coordinates(array("d", [1.0, 2.0, 3.0, 4.0])).length)
+
+    def test_round_trip(self):
+        first = line((1.5, -2.25), (3.0, 4.0))
+        values = [
+            first,
+            GeometryMultiPoint(GeometryPoint(1.0, 2.0)),
+            GeometryPolygon(first, first),
+            GeometryMultiLine(first),
+            GeometryMultiPolygon(GeometryPolygon(first, first), GeometryPolygon(first, first, first)),
+        ]
+        for value in values:
+            self.assertEqual(value, decode(encode(value)))
+
+    def test_decode_nested_tagged_geometries(self):
+        point = cbor2.CBORTag(88, [1.0, 2.0])
+        tagged_line = cbor2.CBORTag(89, [point, cbor2.CBORTag(88, [3.0, 4.0])])
+        polygon = decode(cbor2.dumps(cbor2.CBORTag(90, [tagged_line, tagged_line])))
+        self.assertEqual(array("d", [1.0, 2.0, 3.0, 4.0, 1.0, 2.0, 3.0, 4.0]), polygon.coordinates)
+
+
+if __name__ == "__main__":
+    main()
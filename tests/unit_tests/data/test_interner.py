@@ -0,0 +1,49 @@
+from unittest import TestCase, main
+
+from surrealdb.data.cbor import Interner, decode, encode
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
+
+
+def rows(count):
+    return encode([
+        {"id": RecordID("person", index), "manager": RecordID("person", index % 2), "company": Table("company")}
+        for index in range(count)
+    ])
+
+
+class TestInterner(TestCase):
+
+    def test_same_result(self):
+        data = encode([{"id": RecordID("person", [1, 2]), 1: "one", "tags": {"nested": Table("tag")}}])
+        self.assertEqual(decode(data), decode(data, Interner(max_record_ids=10)))
+
+    def test_shared_objects(self):
+        outcome = decode(rows(4), Interner())
+        self.assertIs(outcome[0]["company"], outcome[3]["company"])
+        self.assertIs(outcome[0]["id"].table_name, outcome[3]["manager"].table_name)
+        self.assertIsNot(outcome[0]["manager"], outcome[2]["manager"])
+        first, last = list(outcome[0]), list(outcome[3])
+        self.assertTrue(all(a is b for a, b in zip(first, last)))
+
+    def test_record_id_cache(self):
+        interner = Interner(max_record_ids=3)
+        outcome = decode(rows(4), interner)
+        self.assertIs(outcome[0]["manager"], outcome[2]["manager"])
+        self.assertIs(outcome[1]["id"], outcome[1]["manager"])
+        self.assertEqual(3, len(interner._record_ids))
+
+    def test_record_id_types_are_kept_apart(self):
+        data = encode([RecordID("person", 1), RecordID("person", True), RecordID("person", 1.0), RecordID("person", 1)])
+        outcome = decode(data, Interner(max_record_ids=10))
+        self.assertEqual([int, bool, float, int], [type(record_id.id) for record_id in outcome])
+        self.assertIs(outcome[0], outcome[3])
+
+    def test_bounded(self):
+        interner = Interner(max_keys=2)
+        decode(encode([{"a": 1, "b": 2, "c": 3, "d" * 100: 4}]), interner)
+        self.assertEqual({"a", "b"}, set(interner._keys))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase, main, skipIf
+
+from surrealdb.data.types.datetime import DateTimeCompact
+from surrealdb.data.types.duration import Duration
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# a timestamp whose nanoseconds are lost when divided as a float
+TIMESTAMP = 1_700_000_000_123_456_789
+
+
+class TestDateTimeCompact(TestCase):
+
+    def test_seconds_and_nano_are_exact(self):
+        self.assertEqual((1_700_000_000, 123_456_789), DateTimeCompact(TIMESTAMP).get_seconds_and_nano())
+        self.assertEqual((-1, 999_999_999), DateTimeCompact(-1).get_seconds_and_nano())
+        big = DateTimeCompact(2 ** 62 + 1)
+        self.assertEqual(big, DateTimeCompact.parse(*big.get_seconds_and_nano()))
+
+    def test_datetime(self):
+        value = DateTimeCompact(TIMESTAMP)
+        self.assertEqual(datetime(2023, 11, 14, 22, 13, 20, 123_456, timezone.utc), value.to_datetime())
+        self.assertEqual("2023-11-14T22:13:20.123456Z", value.get_date_time())
+        self.assertEqual(DateTimeCompact(TIMESTAMP - 789), DateTimeCompact.from_datetime(value.to_datetime()))
+        self.assertEqual(DateTimeCompact(0), DateTimeCompact.from_datetime(datetime(1970, 1, 1)))
+
+    def test_iso(self):
+        value = DateTimeCompact(TIMESTAMP)
+        self.assertEqual("2023-11-14T22:13:20.123456789Z", value.to_iso())
+        self.assertEqual(value, DateTimeCompact.from_iso("2023-11-14T23:13:20.123456789+01:00"))
+        self.assertEqual(DateTimeCompact(TIMESTAMP - 456_789), DateTimeCompact.from_iso("2023-11-14T22:13:20.123Z"))
+        self.assertEqual("1969-12-31T23:59:59.999999999Z", DateTimeCompact(-1).to_iso())
+        for invalid in ("2023-02-30T00:00:00Z", "2023-11-14", "2023-11-14T22:13:20.1234567890Z"):
+            with self.assertRaises(ValueError):
+                DateTimeCompact.from_iso(invalid)
+
+    def test_batches(self):
+        values = [DateTimeCompact(TIMESTAMP), None, DateTimeCompact(5)]
+        strings = DateTimeCompact.to_iso_strings(values)
+        self.assertEqual(["2023-11-14T22:13:20.123456789Z", None, "1970-01-01T00:00:00.000000005Z"], strings)
+        self.assertEqual(values, DateTimeCompact.from_iso_strings(strings))
+        datetimes = DateTimeCompact.to_datetimes(values)
+        self.assertIsNone(datetimes[1])
+        self.assertEqual([DateTimeCompact(TIMESTAMP - 789), None, DateTimeCompact(0)],
+                         DateTimeCompact.from_datetimes(datetimes))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        values = [DateTimeCompact(TIMESTAMP), None]
+        array = DateTimeCompact.to_numpy(values)
+        self.assertEqual("datetime64[ns]", str(array.dtype))
+        self.assertEqual(TIMESTAMP, array.view("int64")[0])
+        self.assertTrue(numpy.isnat(array[1]))
+        self.assertEqual(values, DateTimeCompact.from_numpy(array))
+        days = numpy.array(["1970-01-02"], dtype="datetime64[D]")
+        self.assertEqual([DateTimeCompact(86_400_000_000_000)], DateTimeCompact.from_numpy(days))
+
+
+class TestDuration(TestCase):
+
+    def test_seconds_and_nano_are_exact(self):
+        self.assertEqual((1_700_000_000, 123_456_789), Duration(TIMESTAMP).get_seconds_and_nano())
+        self.assertEqual(Duration(TIMESTAMP), Duration.parse(*Duration(TIMESTAMP).get_seconds_and_nano()))
+
+    def test_timedelta(self):
+        self.assertEqual(timedelta(seconds=3, microseconds=1), Duration(3_000_001_999).to_timedelta())
+        self.assertEqual(Duration(86_400_000_001_000), Duration.from_timedelta(timedelta(days=1, microseconds=1)))
+
+    def test_iso(self):
+        cases = [
+            (0, "PT0S"),
+            (1_500, "PT0.0000015S"),
+            (90_061_000_000_005, "P1DT1H1M1.000000005S"),
+            (-5, "-PT0.000000005S"),
+        ]
+        for elapsed, string in cases:
+            self.assertEqual(string, Duration(elapsed).to_iso())
+            self.assertEqual(Duration(elapsed), Duration.from_iso(string))
+        self.assertEqual(Duration.parse("1w"), Duration.from_iso("P1W"))
+        for invalid in ("P", "PT", "P1Y", "1s"):
+            with self.assertRaises(ValueError):
+                Duration.from_iso(invalid)
+
+    def test_batches(self):
+        values = [Duration(1_500), None]
+        self.assertEqual(values, Duration.from_iso_strings(Duration.to_iso_strings(values)))
+        self.assertEqual([Duration(1_000), None], Duration.from_timedeltas(Duration.to_timedeltas(values)))
+
+    @skipIf(numpy is None, "numpy is not installed")
+    def test_numpy(self):
+        values = [Duration(1_500), None]
+        array = Duration.to_numpy(values)
+        self.assertEqual("timedelta64[ns]", str(array.dtype))
+        self.assertTrue(numpy.isnat(array[1]))
+        self.assertEqual(values, Duration.from_numpy(array))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 from unittest import TestCase, main
 
+import cbor2
+
+from surrealdb.data.cbor import decode, default_encoder
+from surrealdb.data.types.record_id import RecordID
+from surrealdb.data.types.table import Table
 from surrealdb.request_message.message import RequestMessage
+from surrealdb.request_message.descriptors.cbor_ws import _FRAME_PARTS
 from surrealdb.request_message.methods import RequestMethod
 
 
@@ -27,6 +33,19 @@ class TestWsCborAdapter(TestCase):
             str(context.exception)
         )
 
+    def test_use_fail_skipped_without_validation(self):
+        message = RequestMessage(1, RequestMethod.USE, validate=False, namespace="ns", database=1)
+        outcome = message.WS_CBOR_DESCRIPTOR
+        self.assertIsInstance(outcome, bytes)
+
+    def test_validate_class_attribute(self):
+        RequestMessage.validate = False
+        try:
+            message = RequestMessage(1, RequestMethod.USE, namespace="ns", database=1)
+            self.assertIsInstance(message.WS_CBOR_DESCRIPTOR, bytes)
+        finally:
+            RequestMessage.validate = True
+
     def test_info_pass(self):
         message = RequestMessage(1, RequestMethod.INFO)
         outcome = message.WS_CBOR_DESCRIPTOR
@@ -82,6 +101,17 @@ class TestWsCborAdapter(TestCase):
         outcome = message.WS_CBOR_DESCRIPTOR
         self.assertIsInstance(outcome, bytes)
 
+    def test_authenticate_fail(self):
+        message = RequestMessage(1, RequestMethod.AUTHENTICATE, token="not-a-token")
+        with self.assertRaises(ValueError) as context:
+            message.WS_CBOR_DESCRIPTOR
+        self.assertEqual(
+            "Invalid schema for Cbor WS encoding for authenticate: "
+            "{'params': [{0: [\"value does not match regex "
+            "'^[A-Za-z0-9_-]+\\\\.[A-Za-z0-9_-]+\\\\.[A-Za-z0-9_-]+$'\"]}]}",
+            str(context.exception)
+        )
+
     def test_invalidate_pass(self):
         message = RequestMessage(
             1,
@@ -118,6 +148,18 @@ class TestWsCborAdapter(TestCase):
         outcome = message.WS_CBOR_DESCRIPTOR
         self.assertIsInstance(outcome, bytes)
 
+    def test_live_diff_pass(self):
+        message = RequestMessage(
+            1,
+            RequestMethod.LIVE,
+            table="person",
+            diff=True
+        )
+        outcome = decode(message.WS_CBOR_DESCRIPTOR)
+        self.assertEqual([Table("person"), True], outcome["params"])
+        message = RequestMessage(1, RequestMethod.LIVE, table="person")
+        self.assertEqual([Table("person")], decode(message.WS_CBOR_DESCRIPTOR)["params"])
+
     def test_kill_pass(self):
         message = RequestMessage(
             1,
@@ -136,6 +178,20 @@ class TestWsCborAdapter(TestCase):
         outcome = message.WS_CBOR_DESCRIPTOR
         self.assertIsInstance(outcome, bytes)
 
+    def test_query_pass_none_params(self):
+        message = RequestMessage(1, RequestMethod.QUERY, query="query", params=None)
+        outcome = message.WS_CBOR_DESCRIPTOR
+        self.assertIsInstance(outcome, bytes)
+
+    def test_query_fail(self):
+        message = RequestMessage(None, RequestMethod.QUERY, query="query")
+        with self.assertRaises(ValueError) as context:
+            message.WS_CBOR_DESCRIPTOR
+        self.assertEqual(
+            "Invalid schema for Cbor WS encoding for query: {'id': ['null value not allowed']}",
+            str(context.exception)
+        )
+
     def test_create_pass_params(self):
         message = RequestMessage(
             1,
@@ -224,6 +280,23 @@ class TestWsCborAdapter(TestCase):
         outcome = message.WS_CBOR_DESCRIPTOR
         self.assertIsInstance(outcome, bytes)
 
+    def test_frame_matches_full_encoding(self):
+        for request_id in ["6e1a5c2b", "a" * 23, "a" * 24, "é" * 20, "a" * 300, 1, True, 1.0]:
+            message = RequestMessage(request_id, RequestMethod.SELECT, params=[RecordID("person", "tobie")])
+            expected = {"id": request_id, "method": "select", "params": [RecordID("person", "tobie")]}
+            self.assertEqual(cbor2.dumps(expected, default=default_encoder), message.WS_CBOR_DESCRIPTOR)
+            message = RequestMessage(request_id, RequestMethod.VERSION)
+            expected = {"id": request_id, "method": "version"}
+            self.assertEqual(cbor2.dumps(expected, default=default_encoder), message.WS_CBOR_DESCRIPTOR)
+
+    def test_frame_cache_ignores_ids(self):
+        params = [RecordID("person", "tobie")]
+        RequestMessage("1", RequestMethod.SELECT, params=params).WS_CBOR_DESCRIPTOR
+        cached = len(_FRAME_PARTS)
+        for request_id in range(2, 100):
+            RequestMessage(str(request_id), RequestMethod.SELECT, params=params).WS_CBOR_DESCRIPTOR
+        self.assertEqual(cached, len(_FRAME_PARTS))
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file